@@ -2,16 +2,31 @@
 CVAlign Lens — Flask Application Entry Point
 """
 from dotenv import load_dotenv
+import contextlib
+import contextvars
 import os
 import json
-from flask import Flask, request, jsonify, render_template
+import logging
+import queue
+import threading
+import time
+from flask import Flask, Response, g, request, jsonify, render_template, stream_with_context
 from werkzeug.exceptions import RequestEntityTooLarge
 
 from services.jd_parser import JDParser
 from services.resume_parser import ResumeParser
 from services.analyzer import Analyzer
-from services.scorer import Scorer
+from services.scorer import Scorer, SCORING_MODES
+from services.pipeline import AnalysisPipeline, PIPELINE_MODES
+from services.job_queue import JobQueue
+from services.skill_matrix import SkillMatrix
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.cache import TieredCache, fingerprint
 from utils.file_handlers import FileHandler
+from utils.job_store import IdempotencyConflict
+from utils.llm_client import LLMRateLimitError, LLMTimeoutError, get_llm_client
+from utils.metrics import HTTP_REQUEST_SECONDS, REGISTRY, start_trace
+from utils.shortlist_index import ShortlistStore
 
 load_dotenv()
 api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -23,6 +38,89 @@ jd_parser = JDParser()
 resume_parser = ResumeParser()
 analyzer = Analyzer()
 scorer = Scorer()
+pipeline = AnalysisPipeline(jd_parser, resume_parser, analyzer, scorer, file_handler=file_handler)
+job_queue = JobQueue.from_env(pipeline)
+shortlist = ShortlistStore.from_env()
+skill_matrix = SkillMatrix()
+# Complete /api/analyze responses, stored serialized with their ETag
+result_cache = TieredCache.from_env("result", prefix="RESULT_CACHE", max_entries=256, ttl=3600)
+
+BATCH_MAX_RESUMES = int(os.environ.get("BATCH_MAX_RESUMES", 500))
+BATCH_DEFAULT_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", 4))
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", 16))
+BATCH_ITEM_TIMEOUT = float(os.environ.get("BATCH_ITEM_TIMEOUT", 120))
+SHORTLIST_DEFAULT_K = int(os.environ.get("SHORTLIST_TOP_K", 20))
+SHORTLIST_MAX_K = int(os.environ.get("SHORTLIST_MAX_K", 1000))
+REQUEST_TIMING_LOG = os.environ.get("REQUEST_TIMING_LOG", "false").lower() == "true"
+STREAM_PARTIAL_FIELDS = os.environ.get("STREAM_PARTIAL_FIELDS", "true").lower() == "true"
+# End-to-end budget for a single analysis; stages that cannot finish in time return local fallbacks (0 = off)
+REQUEST_DEADLINE = float(os.environ.get("REQUEST_DEADLINE", 0))
+ADMISSION_CONTROL = os.environ.get("ADMISSION_CONTROL", "true").lower() == "true"
+ADMISSION_CLIENT_HEADER = os.environ.get("ADMISSION_CLIENT_HEADER", "X-Client-Id")
+
+# Adaptive concurrency limit for single analyses, driven by LLM call latency and 429s
+admission = AdmissionController.from_env() if ADMISSION_CONTROL else None
+if admission is not None:
+    get_llm_client().add_listener(admission.observe)
+    REGISTRY.gauge_function(
+        "cvalign_admission", "Admission controller state: concurrency limit, in-flight and queued requests.",
+        ("state",), lambda: {(name,): admission.stats()[name] for name in ("limit", "in_flight", "queued")},
+    )
+
+timing_logger = logging.getLogger("cvalign.timing")
+if REQUEST_TIMING_LOG and not timing_logger.handlers:
+    # One JSON object per line on stderr, whatever the root logging setup
+    _timing_handler = logging.StreamHandler()
+    _timing_handler.setFormatter(logging.Formatter("%(message)s"))
+    timing_logger.addHandler(_timing_handler)
+    timing_logger.setLevel(logging.INFO)
+    timing_logger.propagate = False
+
+
+@app.before_request
+def begin_request_trace():
+    g.request_started = time.perf_counter()
+    g.trace = start_trace()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get("request_started")
+    if started is not None:
+        g.response_status = response.status_code
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint, method=request.method, status=response.status_code
+        )
+    return response
+
+
+@app.teardown_request
+def log_request_timing(error=None):
+    # Runs after a streamed body finishes, so the trace covers the whole request
+    if not REQUEST_TIMING_LOG or g.get("request_started") is None or request.path == "/metrics":
+        return
+    _write_timing_log(
+        request.method, request.url_rule.rule if request.url_rule else request.path,
+        g.get("response_status", 500), g.request_started, g.trace,
+    )
+
+
+def _write_timing_log(method: str, endpoint: str, status: int, started: float, trace) -> None:
+    """Write one request_timing JSON line (REQUEST_TIMING_LOG) for a finished request."""
+    timing_logger.info(json.dumps({
+        "event": "request_timing",
+        "method": method,
+        "endpoint": endpoint,
+        "status": status,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        **trace.as_dict(),
+    }))
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.errorhandler(RequestEntityTooLarge)
@@ -35,51 +133,725 @@ def index():
     return render_template("index.html")
 
 
+@app.route("/api/cache/stats")
+def cache_stats():
+    return jsonify({
+        "jd_parse": jd_parser.cache.stats(),
+        "file_text": file_handler.cache.stats(),
+        "resume_sections": resume_parser.section_cache.stats(),
+        "analysis": pipeline.results.stats(),
+        "result": result_cache.stats(),
+    })
+
+
+def _read_analysis_inputs():
+    """
+    Resolve the job description and resume text from the submitted form.
+
+    Returns:
+        tuple: (job_description_text, resume_text, error_response). When
+        error_response is not None it should be returned to the client as-is.
+    """
+    job_description_text = request.form.get("job_description", "").strip()
+    resume_text = request.form.get("resume_text", "").strip()
+    resume_file = request.files.get("resume_file")
+
+    # job description
+    if not job_description_text:
+        return None, None, (jsonify({"error": "Job description is required."}), 400)
+
+    # Resolve resume text
+    if resume_file and resume_file.filename:
+        extracted = file_handler.extract_text(resume_file)
+        if extracted.get("error"):
+            return None, None, (jsonify({"error": extracted["error"]}), 400)
+        resume_text = extracted["text"]
+
+    if not resume_text:
+        return None, None, (
+            jsonify({"error": "Resume content is required (paste text or upload a file)."}), 400
+        )
+
+    return job_description_text, resume_text, None
+
+
+def _read_modes(source) -> dict:
+    """
+    Validate the optional per-request scoring_mode and pipeline_mode fields
+    of a form or JSON payload.
+
+    Returns:
+        dict: scoring_mode and pipeline_mode (None when not given).
+
+    Raises:
+        ValueError: If a mode is not one of SCORING_MODES / PIPELINE_MODES.
+    """
+    scoring_mode = str(source.get("scoring_mode") or "").strip().lower() or None
+    if scoring_mode and scoring_mode not in SCORING_MODES:
+        raise ValueError(
+            f"Unknown scoring mode '{scoring_mode}'. Choose one of: {', '.join(SCORING_MODES)}."
+        )
+    pipeline_mode = str(source.get("pipeline_mode") or "").strip().lower() or None
+    if pipeline_mode and pipeline_mode not in PIPELINE_MODES:
+        raise ValueError(
+            f"Unknown pipeline mode '{pipeline_mode}'. Choose one of: {', '.join(PIPELINE_MODES)}."
+        )
+    return {"scoring_mode": scoring_mode, "pipeline_mode": pipeline_mode}
+
+
+def _rate_limited_response(error: LLMRateLimitError):
+    response = jsonify({"error": "The analysis service is busy. Please try again shortly."})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(int(error.retry_after or 30) + 1)
+    return response
+
+
+def _timeout_response():
+    return jsonify({"error": "The analysis took too long to complete. Please try again."}), 504
+
+
+def _rejected_response(error: AdmissionRejected):
+    response = jsonify({"error": str(error)})
+    response.status_code = error.status
+    response.headers["Retry-After"] = str(int(error.retry_after) + 1)
+    return response
+
+
+def _client_key() -> str:
+    """Fair-queuing key for this request: the ADMISSION_CLIENT_HEADER value, else the remote address."""
+    return request.headers.get(ADMISSION_CLIENT_HEADER) or request.remote_addr
+
+
+def _request_deadline() -> float:
+    """time.monotonic() by which a single analysis started now must answer, or None without REQUEST_DEADLINE."""
+    return time.monotonic() + REQUEST_DEADLINE if REQUEST_DEADLINE > 0 else None
+
+
+def _admission_wait(deadline_at: float) -> float:
+    """Seconds a request may wait for admission: what is left of its deadline, within ADMISSION_MAX_WAIT."""
+    if deadline_at is None:
+        return None
+    return min(admission.max_wait, max(0.0, deadline_at - time.monotonic()))
+
+
+def _admission_slot(client: str, deadline_at: float = None):
+    """
+    A concurrency slot from the admission controller, or a no-op context
+    when admission control is off. Waiting for it counts against deadline_at.
+
+    Raises:
+        AdmissionRejected: On entering, if the request is shed.
+    """
+    if admission is None:
+        return contextlib.nullcontext()
+    return admission.admit(client, _admission_wait(deadline_at))
+
+
+def _result_entry(result: dict) -> dict:
+    """
+    Serialize a pipeline result as the cached /api/analyze body with its
+    ETag. Degraded results (local fallbacks) are marked so they are not cached.
+    """
+    app.logger.info(f"Analysis timings (ms): {result['timings']}")
+    body = app.json.dumps({"success": True, **result}) + "\n"
+    return {"body": body, "etag": fingerprint(body)[:32], "degraded": bool(result.get("degraded"))}
+
+
+def _cacheable(entry: dict) -> bool:
+    return not entry.get("degraded")
+
+
+def _etag_response(entry: dict, cache_status: str) -> Response:
+    """
+    Serve a stored response body with its ETag, or an empty 304 when the
+    client already holds that version (If-None-Match).
+    """
+    if request.if_none_match.contains(entry["etag"]):
+        response = Response(status=304)
+    else:
+        response = Response(entry["body"], mimetype="application/json")
+    response.set_etag(entry["etag"])
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_batch(jd_data: dict, resumes: list, concurrency: int, modes: dict, header: dict = None) -> Response:
+    """Stream run_batch results as NDJSON: a jd_summary line, one line per resume, then a summary."""
+    def generate():
+        started = time.perf_counter()
+        succeeded = failed = 0
+        yield json.dumps({"type": "jd_summary", "jd_summary": jd_data, "total": len(resumes), **(header or {})}) + "\n"
+        for record in pipeline.run_batch(jd_data, resumes, concurrency, BATCH_ITEM_TIMEOUT, **modes):
+            if record["success"]:
+                succeeded += 1
+            else:
+                failed += 1
+            yield json.dumps(record) + "\n"
+        yield json.dumps({
+            "type": "summary",
+            "total": len(resumes),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def _read_concurrency(value) -> int:
+    """Clamp a requested batch concurrency. Raises TypeError/ValueError if it is not an integer."""
+    return max(1, min(int(value or BATCH_DEFAULT_CONCURRENCY), BATCH_MAX_CONCURRENCY))
+
+
 @app.route("/api/analyze", methods=["POST"])
 def analyze():
     try:
+        job_description_text, resume_text, error_response = _read_analysis_inputs()
+        if error_response:
+            return error_response
+
+        modes = _read_modes(request.form)
+        key = pipeline.result_key(job_description_text, resume_text, **modes)
+        client = _client_key()
+        deadline_at = _request_deadline()
+        computed = []
+
+        def compute():
+            # Parse both inputs concurrently, then analyze and score; cache hits skip admission
+            with _admission_slot(client, deadline_at):
+                result = pipeline.run(job_description_text, resume_text, deadline_at=deadline_at, **modes)
+            computed.append(True)
+            return _result_entry(result)
+
+        if "no-cache" in request.headers.get("Cache-Control", ""):
+            entry = compute()
+            if _cacheable(entry):
+                result_cache.set(key, entry)
+        else:
+            entry = result_cache.get_or_compute(key, compute, cacheable=_cacheable)
+        return _etag_response(entry, "MISS" if computed else "HIT")
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 422
+    except AdmissionRejected as ar:
+        return _rejected_response(ar)
+    except LLMRateLimitError as rl:
+        return _rate_limited_response(rl)
+    except LLMTimeoutError:
+        return _timeout_response()
+    except Exception as e:
+        app.logger.error(f"Analysis failed: {e}", exc_info=True)
+        return jsonify({"error": "Analysis failed. Please verify your API key and inputs, then try again."}), 500
+
+
+@app.route("/api/analyze/stream", methods=["POST"])
+def analyze_stream():
+    """
+    Streaming variant of /api/analyze. Accepts the same form fields and pushes
+    each stage's validated output as a Server-Sent Event as soon as it is
+    ready: jd_summary, resume_summary, analysis, score, then done (with
+    timings). With STREAM_PARTIAL_FIELDS, partial events ({stage, field,
+    value}) carry each analysis and score field, unvalidated, as soon as the
+    LLM has written it. With REQUEST_DEADLINE, stages that run out of time
+    arrive as flagged local fallbacks and done lists them under degraded.
+    Failures are reported as an error event carrying a status code.
+    """
+    try:
+        job_description_text, resume_text, error_response = _read_analysis_inputs()
+        if error_response:
+            return error_response
+        modes = _read_modes(request.form)
+        deadline_at = _request_deadline()
+        # Held by the worker thread until the analysis finishes
+        slot = contextlib.ExitStack()
+        slot.enter_context(_admission_slot(_client_key(), deadline_at))
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 422
+    except AdmissionRejected as ar:
+        return _rejected_response(ar)
+    except Exception as e:
+        app.logger.error(f"Analysis failed: {e}", exc_info=True)
+        return jsonify({"error": "Analysis failed. Please verify your API key and inputs, then try again."}), 500
+
+    events = queue.Queue()
+    on_field = None
+    if STREAM_PARTIAL_FIELDS:
+        def on_field(stage, field, value):
+            events.put(("partial", {"stage": stage, "field": field, "value": value}))
+
+    def worker():
+        try:
+            with slot:
+                result = pipeline.run(
+                    job_description_text, resume_text,
+                    on_stage=lambda stage, payload: events.put((stage, payload)),
+                    on_field=on_field,
+                    deadline_at=deadline_at,
+                    **modes,
+                )
+            done = {"success": True, "timings": result["timings"]}
+            if result.get("degraded"):
+                done["degraded"] = result["degraded"]
+            events.put(("done", done))
+        except ValueError as ve:
+            events.put(("error", {"error": str(ve), "status": 422}))
+        except LLMRateLimitError:
+            events.put(("error", {
+                "error": "The analysis service is busy. Please try again shortly.",
+                "status": 503,
+            }))
+        except LLMTimeoutError:
+            events.put(("error", {
+                "error": "The analysis took too long to complete. Please try again.",
+                "status": 504,
+            }))
+        except Exception as e:
+            app.logger.error(f"Analysis failed: {e}", exc_info=True)
+            events.put(("error", {
+                "error": "Analysis failed. Please verify your API key and inputs, then try again.",
+                "status": 500,
+            }))
+
+    # The worker carries this request's trace so its stages and LLM calls are logged with it
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(worker,), name="analysis-stream", daemon=True).start()
+
+    def generate():
+        while True:
+            try:
+                stage, payload = events.get(timeout=15)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(stage, payload)
+            if stage in ("done", "error"):
+                return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    """
+    Queue an analysis and return its job id immediately. Accepts the same form
+    fields as /api/analyze, mode overrides included. An Idempotency-Key header (or idempotency_key form
+    field) makes resubmissions return the existing job instead of a new one.
+    """
+    try:
+        job_description_text, resume_text, error_response = _read_analysis_inputs()
+        if error_response:
+            return error_response
+
+        modes = _read_modes(request.form)
+        idempotency_key = (
+            request.headers.get("Idempotency-Key") or request.form.get("idempotency_key") or ""
+        ).strip() or None
+        job, created = job_queue.submit(job_description_text, resume_text, idempotency_key, **modes)
+
+    except (IdempotencyConflict, ValueError) as e:
+        return jsonify({"error": str(e)}), 422
+    except Exception as e:
+        app.logger.error(f"Job submission failed: {e}", exc_info=True)
+        return jsonify({"error": "Could not queue the analysis. Please try again."}), 500
+
+    return jsonify({
+        "success": True,
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/api/jobs/{job['job_id']}",
+    }), 202 if created else 200
+
+
+@app.route("/api/jobs/<job_id>")
+def get_job(job_id):
+    job_queue.ensure_started()
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(job)
+
+
+def _read_batch_request():
+    """
+    Resolve the job description, resumes, concurrency, and modes of a batch
+    request from multipart form data or JSON.
+
+    Returns:
+        tuple: (job_description_text, resumes, concurrency, modes, error_response).
+        When error_response is not None it should be returned to the client as-is.
+
+    Raises:
+        ValueError: If a mode override is invalid.
+    """
+    payload = request.get_json(silent=True) if request.is_json else None
+    if payload is not None:
+        job_description_text = str(payload.get("job_description", "")).strip()
+        resumes = [
+            {"name": item.get("name") or f"resume-{i + 1}", "text": str(item.get("text", ""))}
+            for i, item in enumerate(payload.get("resumes") or [])
+            if isinstance(item, dict)
+        ]
+        requested_concurrency = payload.get("concurrency")
+        modes = _read_modes(payload)
+    else:
         job_description_text = request.form.get("job_description", "").strip()
-        resume_text = request.form.get("resume_text", "").strip()
-        resume_file = request.files.get("resume_file")
+        resumes = [
+            {"name": f.filename, "file": f}
+            for f in request.files.getlist("resume_files") if f and f.filename
+        ]
+        resumes += [
+            {"name": f"resume-text-{i + 1}", "text": text}
+            for i, text in enumerate(request.form.getlist("resume_texts")) if text.strip()
+        ]
+        requested_concurrency = request.form.get("concurrency")
+        modes = _read_modes(request.form)
 
-        # job description
-        if not job_description_text:
-            return jsonify({"error": "Job description is required."}), 400
+    if not job_description_text:
+        return None, None, None, None, (jsonify({"error": "Job description is required."}), 400)
+    if not resumes:
+        return None, None, None, None, (jsonify({"error": "At least one resume is required."}), 400)
+    if len(resumes) > BATCH_MAX_RESUMES:
+        return None, None, None, None, (
+            jsonify({"error": f"A batch may contain at most {BATCH_MAX_RESUMES} resumes."}), 400
+        )
+
+    try:
+        concurrency = _read_concurrency(requested_concurrency)
+    except (TypeError, ValueError):
+        return None, None, None, None, (jsonify({"error": "Concurrency must be an integer."}), 400)
+    return job_description_text, resumes, concurrency, modes, None
 
-        # Resolve resume text
+
+@app.route("/api/analyze/batch", methods=["POST"])
+def analyze_batch():
+    """
+    Analyze many resumes against one job description, streaming one NDJSON
+    line per resume as each finishes. Accepts multipart form data
+    (job_description, resume_files[], resume_texts[], concurrency) or JSON
+    ({"job_description", "resumes": [{"name", "text"}], "concurrency"}).
+    """
+    try:
+        job_description_text, resumes, concurrency, modes, error_response = _read_batch_request()
+        if error_response:
+            return error_response
+
+        # The JD is parsed once for the whole batch
+        jd_data = jd_parser.parse(job_description_text)
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 422
+    except LLMRateLimitError as rl:
+        return _rate_limited_response(rl)
+    except LLMTimeoutError:
+        return _timeout_response()
+    except Exception as e:
+        app.logger.error(f"Batch analysis failed: {e}", exc_info=True)
+        return jsonify({"error": "Analysis failed. Please verify your API key and inputs, then try again."}), 500
+
+    return _stream_batch(jd_data, resumes, concurrency, modes)
+
+
+def _read_jobs_request():
+    """
+    Resolve the resume text, job descriptions, concurrency, and modes of a
+    one-resume-many-jobs request from multipart form data or JSON.
+
+    Returns:
+        tuple: (resume_text, jobs, concurrency, modes, error_response), as _read_batch_request.
+
+    Raises:
+        ValueError: If a mode override is invalid.
+    """
+    payload = request.get_json(silent=True) if request.is_json else None
+    if payload is not None:
+        resume_text = str(payload.get("resume_text", "")).strip()
+        jobs = []
+        for i, item in enumerate(payload.get("job_descriptions") or []):
+            if isinstance(item, str):
+                item = {"text": item}
+            if not isinstance(item, dict):
+                continue
+            job = {"name": item.get("name") or f"job-{i + 1}"}
+            if isinstance(item.get("jd_summary"), dict):
+                job["jd_summary"] = item["jd_summary"]
+            else:
+                job["text"] = str(item.get("text", ""))
+            jobs.append(job)
+        requested_concurrency = payload.get("concurrency")
+        modes = _read_modes(payload)
+    else:
+        resume_text = request.form.get("resume_text", "").strip()
+        resume_file = request.files.get("resume_file")
         if resume_file and resume_file.filename:
             extracted = file_handler.extract_text(resume_file)
             if extracted.get("error"):
-                return jsonify({"error": extracted["error"]}), 400
+                return None, None, None, None, (jsonify({"error": extracted["error"]}), 400)
             resume_text = extracted["text"]
+        jobs = [
+            {"name": f"job-{i + 1}", "text": text}
+            for i, text in enumerate(request.form.getlist("job_descriptions")) if text.strip()
+        ]
+        requested_concurrency = request.form.get("concurrency")
+        modes = _read_modes(request.form)
 
-        if not resume_text:
-            return jsonify({"error": "Resume content is required (paste text or upload a file)."}), 400
+    if not resume_text:
+        return None, None, None, None, (
+            jsonify({"error": "Resume content is required (paste text or upload a file)."}), 400
+        )
+    if not jobs:
+        return None, None, None, None, (jsonify({"error": "At least one job description is required."}), 400)
+    if len(jobs) > BATCH_MAX_RESUMES:
+        return None, None, None, None, (
+            jsonify({"error": f"A batch may contain at most {BATCH_MAX_RESUMES} job descriptions."}), 400
+        )
 
-        # Parse the inputs
-        jd_data = jd_parser.parse(job_description_text)
+    try:
+        concurrency = _read_concurrency(requested_concurrency)
+    except (TypeError, ValueError):
+        return None, None, None, None, (jsonify({"error": "Concurrency must be an integer."}), 400)
+    return resume_text, jobs, concurrency, modes, None
+
+
+def _rank_job_record(ranking: list, record: dict) -> None:
+    """Add a successful job-match record to the running ranking and set its current rank."""
+    ranking.append({
+        "index": record["index"],
+        "name": record["name"],
+        "role_title": record["jd_summary"].get("role_title"),
+        "overall_score": record["score"]["overall_score"],
+        "score_label": record["score"].get("score_label"),
+    })
+    ranking.sort(key=lambda entry: entry["overall_score"], reverse=True)
+    record["rank"] = next(pos for pos, entry in enumerate(ranking, 1) if entry["index"] == record["index"])
+
+
+@app.route("/api/analyze/jobs", methods=["POST"])
+def analyze_jobs():
+    """
+    Compare one resume against many job descriptions. The resume is parsed
+    once; each JD comes from the JD cache or a previously returned jd_summary.
+    Results stream as NDJSON as they finish, followed by a ranking by
+    overall_score. Accepts multipart form data (resume_text or resume_file,
+    job_descriptions[], concurrency) or JSON ({"resume_text", "job_descriptions":
+    [{"name", "text"} | {"name", "jd_summary"}], "concurrency"}).
+    """
+    try:
+        resume_text, jobs, concurrency, modes, error_response = _read_jobs_request()
+        if error_response:
+            return error_response
+
+        # The resume is parsed once for every job description
         resume_data = resume_parser.parse(resume_text)
 
-        # Run the analysis
-        analysis = analyzer.analyze(jd_data, resume_data)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 422
+    except LLMRateLimitError as rl:
+        return _rate_limited_response(rl)
+    except LLMTimeoutError:
+        return _timeout_response()
+    except Exception as e:
+        app.logger.error(f"Job matching failed: {e}", exc_info=True)
+        return jsonify({"error": "Analysis failed. Please verify your API key and inputs, then try again."}), 500
 
-        # Score the analysis
-        score_data = scorer.score(analysis)
+    def generate():
+        started = time.perf_counter()
+        ranking = []
+        failed = 0
+        yield json.dumps({"type": "resume_summary", "resume_summary": resume_data, "total": len(jobs)}) + "\n"
+        for record in pipeline.run_job_batch(resume_data, jobs, concurrency, BATCH_ITEM_TIMEOUT, **modes):
+            if record["success"]:
+                _rank_job_record(ranking, record)
+            else:
+                failed += 1
+            yield json.dumps(record) + "\n"
+        yield json.dumps({
+            "type": "ranking",
+            "ranking": ranking,
+            "total": len(jobs),
+            "succeeded": len(ranking),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }) + "\n"
 
-        return jsonify({
-            "success": True,
-            "jd_summary": jd_data,
-            "resume_summary": resume_data,
-            "analysis": analysis,
-            "score": score_data,
-        })
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
+
+@app.route("/api/shortlist/resumes", methods=["POST"])
+def shortlist_add():
+    """
+    Add resumes to a shortlist pool, replacing any with the same id. Accepts
+    multipart form data (pool, resume_files[], resume_texts[]) or JSON
+    ({"pool", "resumes": [{"id", "name", "text"}]}). Uploaded files use
+    their filename as id.
+    """
+    payload = request.get_json(silent=True) if request.is_json else None
+    source = payload if payload is not None else request.form
+    pool = _read_pool(source)
+    errors = []
+    if payload is not None:
+        resumes = []
+        for i, item in enumerate(payload.get("resumes") or []):
+            if not isinstance(item, dict) or not str(item.get("text", "")).strip():
+                errors.append({"index": i, "error": "Resume text is required."})
+                continue
+            resume_id = str(item.get("id") or item.get("name") or f"resume-{i + 1}")
+            resumes.append({"id": resume_id, "name": str(item.get("name") or resume_id), "text": str(item["text"])})
+    else:
+        resumes = []
+        for f in request.files.getlist("resume_files"):
+            if not f or not f.filename:
+                continue
+            extracted = file_handler.extract_text(f)
+            if extracted.get("error"):
+                errors.append({"name": f.filename, "error": extracted["error"]})
+            else:
+                resumes.append({"id": f.filename, "name": f.filename, "text": extracted["text"]})
+        resumes += [
+            {"id": f"resume-text-{i + 1}", "name": f"resume-text-{i + 1}", "text": text}
+            for i, text in enumerate(request.form.getlist("resume_texts")) if text.strip()
+        ]
+
+    if not resumes:
+        return jsonify({"error": "At least one resume is required.", "errors": errors}), 400
+    size = shortlist.add(pool, resumes)
+    return jsonify({"pool": pool, "added": len(resumes), "size": size, "errors": errors})
+
+
+def _read_pool(source) -> str:
+    return str(source.get("pool") or "default").strip()[:64] or "default"
+
+
+def _read_shortlist_query(source, max_k: int) -> tuple:
+    """
+    Resolve the pool, parsed JD, and top_k of a shortlist request. The JD
+    may be given as job_description text or a previously returned jd_summary.
+
+    Raises:
+        ValueError: On missing or malformed fields.
+    """
+    pool = _read_pool(source)
+    jd_data = source.get("jd_summary")
+    if not isinstance(jd_data, dict):
+        job_description_text = str(source.get("job_description", "")).strip()
+        if not job_description_text:
+            raise ValueError("Job description is required.")
+        jd_data = jd_parser.parse(job_description_text)
+    try:
+        top_k = int(source.get("top_k") or SHORTLIST_DEFAULT_K)
+    except (TypeError, ValueError):
+        raise ValueError("top_k must be an integer.")
+    return pool, jd_data, max(1, min(top_k, max_k))
+
+
+@app.route("/api/shortlist/search", methods=["POST"])
+def shortlist_search():
+    """
+    Rank a shortlist pool against a job description with the local BM25
+    index, without analyzing any resume. Accepts form data or JSON with
+    pool, job_description (or jd_summary), and top_k.
+    """
+    source = request.get_json(silent=True) if request.is_json else request.form
+    try:
+        pool, jd_data, top_k = _read_shortlist_query(source or {}, SHORTLIST_MAX_K)
+        started = time.perf_counter()
+        ranking = shortlist.search(pool, jd_data, top_k)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    except LLMRateLimitError as rl:
+        return _rate_limited_response(rl)
+    except LLMTimeoutError:
+        return _timeout_response()
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 422
     except Exception as e:
-        app.logger.error(f"Analysis failed: {e}", exc_info=True)
+        app.logger.error(f"Shortlist search failed: {e}", exc_info=True)
+        return jsonify({"error": "Search failed. Please verify your inputs, then try again."}), 500
+    return jsonify({
+        "pool": pool,
+        "pool_size": shortlist.size(pool),
+        "jd_summary": jd_data,
+        "ranking": ranking,
+        "elapsed_ms": elapsed_ms,
+    })
+
+
+@app.route("/api/shortlist/analyze", methods=["POST"])
+def shortlist_analyze():
+    """
+    Rank a shortlist pool with the BM25 index and run only the top_k resumes
+    through the full analysis pipeline, streaming NDJSON as /api/analyze/batch
+    does. The first line also carries the shortlist ranking.
+    """
+    source = request.get_json(silent=True) if request.is_json else request.form
+    source = source or {}
+    try:
+        modes = _read_modes(source)
+        pool, jd_data, top_k = _read_shortlist_query(source, BATCH_MAX_RESUMES)
+        try:
+            concurrency = _read_concurrency(source.get("concurrency"))
+        except (TypeError, ValueError):
+            return jsonify({"error": "Concurrency must be an integer."}), 400
+        ranking = shortlist.search(pool, jd_data, top_k)
+    except LLMRateLimitError as rl:
+        return _rate_limited_response(rl)
+    except LLMTimeoutError:
+        return _timeout_response()
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 422
+    except Exception as e:
+        app.logger.error(f"Shortlist analysis failed: {e}", exc_info=True)
         return jsonify({"error": "Analysis failed. Please verify your API key and inputs, then try again."}), 500
 
+    if not ranking:
+        return jsonify({"error": "No resumes in this pool match the job description."}), 404
+    texts = shortlist.texts(pool, [entry["id"] for entry in ranking])
+    resumes = [{"name": entry["name"], "text": texts[entry["id"]]} for entry in ranking if entry["id"] in texts]
+    return _stream_batch(jd_data, resumes, concurrency, modes, header={"pool": pool, "shortlist": ranking})
+
+
+@app.route("/api/match/matrix", methods=["POST"])
+def match_matrix():
+    """
+    Score many parsed resumes against many parsed job descriptions by skill
+    similarity, with no LLM calls. Accepts JSON {"resumes": [resume_summary],
+    "jobs": [jd_summary], "top_k"} using the summaries returned by the other
+    endpoints, and returns the best top_k resumes for each job.
+    """
+    payload = request.get_json(silent=True) if request.is_json else None
+    if payload is None:
+        return jsonify({"error": "A JSON body with resumes and jobs is required."}), 400
+    resumes = [resume_parser._validate_and_normalize(dict(item)) for item in payload.get("resumes") or []
+               if isinstance(item, dict)]
+    jobs = [jd_parser._validate_and_normalize(dict(item)) for item in payload.get("jobs") or []
+            if isinstance(item, dict)]
+    if not resumes or not jobs:
+        return jsonify({"error": "At least one resume summary and one job summary are required."}), 400
+    try:
+        top_k = int(payload.get("top_k") or SHORTLIST_DEFAULT_K)
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_k must be an integer."}), 400
+
+    started = time.perf_counter()
+    try:
+        matches = skill_matrix.top_matches(resumes, jobs, max(1, top_k))
+    except RuntimeError as e:
+        app.logger.error(f"Skill matrix unavailable: {e}")
+        return jsonify({"error": "Bulk matching is not available on this server."}), 501
+    return jsonify({
+        "matches": [
+            {"job_index": j, "resumes": [{"index": i, "similarity": score} for i, score in ranked]}
+            for j, ranked in enumerate(matches)
+        ],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
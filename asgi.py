@@ -0,0 +1,280 @@
+"""
+CVAlign Lens — ASGI Application Entry Point
+Async serving mode. /api/analyze and the batch endpoints run their pipeline
+stages as coroutines with non-blocking LLM I/O, so one worker process holds
+hundreds of in-flight analyses while they wait on the provider instead of
+one per thread. Every other route is the Flask app from app.py, mounted
+underneath and run on a thread pool.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 2
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+import os
+import time
+from io import BytesIO
+
+from a2wsgi import WSGIMiddleware
+from flask import request as flask_request
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_etags, quote_etag
+from werkzeug.test import EnvironBuilder
+
+from app import (
+    ADMISSION_CLIENT_HEADER, BATCH_ITEM_TIMEOUT, REQUEST_TIMING_LOG, admission, app as flask_app, jd_parser, pipeline,
+    result_cache, resume_parser, _admission_wait, _cacheable, _rank_job_record, _read_analysis_inputs,
+    _read_batch_request, _read_jobs_request, _read_modes, _request_deadline, _result_entry, _write_timing_log,
+)
+from utils.admission import AdmissionRejected
+from utils.llm_client import LLMRateLimitError, LLMTimeoutError
+from utils.metrics import HTTP_REQUEST_SECONDS, start_trace
+
+
+logger = logging.getLogger(__name__)
+
+GENERIC_ERROR = "Analysis failed. Please verify your API key and inputs, then try again."
+WSGI_THREADS = int(os.environ.get("ASGI_WSGI_THREADS", 16))
+
+
+def _instrumented(rule: str):
+    """
+    Give an async route the request trace, HTTP latency metric, and timing
+    log line that app.py's request hooks give Flask routes.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def endpoint(request):
+            started = time.perf_counter()
+            trace = start_trace()
+            response = await handler(request)
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, endpoint=rule, method=request.method, status=response.status_code
+            )
+            if REQUEST_TIMING_LOG:
+                if isinstance(response, StreamingResponse):
+                    response.body_iterator = _log_when_streamed(
+                        response.body_iterator, request.method, rule, response.status_code, started, trace
+                    )
+                else:
+                    _write_timing_log(request.method, rule, response.status_code, started, trace)
+            return response
+        return endpoint
+    return decorator
+
+
+async def _log_when_streamed(body, method: str, rule: str, status: int, started: float, trace):
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        _write_timing_log(method, rule, status, started, trace)
+
+
+async def _read_with_flask(request, reader) -> tuple:
+    """
+    Run one of app.py's request readers on a worker thread, inside a Flask
+    request context built from this request, so form parsing, validation,
+    and file extraction behave exactly as on the WSGI path.
+
+    Returns:
+        tuple: (values, error_response). values is the reader's result without
+        its trailing error_response; error_response is a Starlette response
+        to return as-is, or None.
+    """
+    max_length = flask_app.config["MAX_CONTENT_LENGTH"]
+    if int(request.headers.get("content-length") or 0) > max_length:
+        return None, JSONResponse({"error": "File too large. Maximum size is 5MB."}, status_code=413)
+    body = await request.body()
+
+    def run():
+        environ = EnvironBuilder(
+            path=request.url.path, method=request.method, query_string=request.url.query,
+            headers=[(k, v) for k, v in request.headers.items() if k.lower() != "content-length"], data=body,
+        ).get_environ()
+        with flask_app.request_context(environ):
+            try:
+                *values, error_response = reader()
+            except RequestEntityTooLarge:
+                return None, JSONResponse({"error": "File too large. Maximum size is 5MB."}, status_code=413)
+            if error_response is not None:
+                converted = flask_app.make_response(error_response)
+                return None, Response(
+                    converted.get_data(), status_code=converted.status_code, media_type=converted.mimetype
+                )
+            return values, None
+
+    return await asyncio.to_thread(run)
+
+
+def _read_analyze_form() -> tuple:
+    job_description_text, resume_text, error_response = _read_analysis_inputs()
+    if error_response:
+        return None, None, None, error_response
+    return job_description_text, resume_text, _read_modes(flask_request.form), None
+
+
+def _read_batch_form() -> tuple:
+    # Uploads are closed with the Flask request context, so keep their bytes
+    job_description_text, resumes, concurrency, modes, error_response = _read_batch_request()
+    for resume in resumes or []:
+        upload = resume.get("file")
+        if upload is not None:
+            resume["file"] = FileStorage(
+                BytesIO(upload.read()), filename=upload.filename, name=upload.name, content_type=upload.content_type
+            )
+    return job_description_text, resumes, concurrency, modes, error_response
+
+
+def _error_response(error: Exception, failure: str) -> JSONResponse:
+    # The same status mapping as the Flask routes
+    if isinstance(error, ValueError):
+        return JSONResponse({"error": str(error)}, status_code=422)
+    if isinstance(error, AdmissionRejected):
+        return JSONResponse(
+            {"error": str(error)}, status_code=error.status, headers={"Retry-After": str(int(error.retry_after) + 1)}
+        )
+    if isinstance(error, LLMRateLimitError):
+        return JSONResponse(
+            {"error": "The analysis service is busy. Please try again shortly."},
+            status_code=503, headers={"Retry-After": str(int(error.retry_after or 30) + 1)},
+        )
+    if isinstance(error, LLMTimeoutError):
+        return JSONResponse({"error": "The analysis took too long to complete. Please try again."}, status_code=504)
+    logger.error(f"{failure}: {error}", exc_info=error)
+    return JSONResponse({"error": GENERIC_ERROR}, status_code=500)
+
+
+def _admission_slot(request, deadline_at: float = None):
+    # Same controller, client key, and wait budget as the Flask routes; waiting happens in the event loop
+    if admission is None:
+        return contextlib.nullcontext()
+    client = request.headers.get(ADMISSION_CLIENT_HEADER) or (request.client.host if request.client else None)
+    return admission.aadmit(client, _admission_wait(deadline_at))
+
+
+def _etag_response(request, entry: dict, cache_status: str) -> Response:
+    headers = {"ETag": quote_etag(entry["etag"]), "X-Cache": cache_status}
+    if parse_etags(request.headers.get("if-none-match")).contains(entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(entry["body"], media_type="application/json", headers=headers)
+
+
+@_instrumented("/api/analyze")
+async def analyze(request):
+    """Async form of app.analyze: same fields, deadline, response cache, ETag, and errors."""
+    deadline_at = _request_deadline()
+    try:
+        values, error_response = await _read_with_flask(request, _read_analyze_form)
+        if error_response:
+            return error_response
+        job_description_text, resume_text, modes = values
+
+        key = pipeline.result_key(job_description_text, resume_text, **modes)
+        computed = []
+
+        async def compute():
+            async with _admission_slot(request, deadline_at):
+                result = await pipeline.arun(job_description_text, resume_text, deadline_at=deadline_at, **modes)
+            computed.append(True)
+            return _result_entry(result)
+
+        if "no-cache" in request.headers.get("cache-control", ""):
+            entry = await compute()
+            if _cacheable(entry):
+                result_cache.set(key, entry)
+        else:
+            entry = await result_cache.aget_or_compute(key, compute, cacheable=_cacheable)
+        return _etag_response(request, entry, "MISS" if computed else "HIT")
+
+    except Exception as e:
+        return _error_response(e, "Analysis failed")
+
+
+@_instrumented("/api/analyze/batch")
+async def analyze_batch(request):
+    """Async form of app.analyze_batch, streaming the same NDJSON lines."""
+    try:
+        values, error_response = await _read_with_flask(request, _read_batch_form)
+        if error_response:
+            return error_response
+        job_description_text, resumes, concurrency, modes = values
+        jd_data = await jd_parser.aparse(job_description_text)
+    except Exception as e:
+        return _error_response(e, "Batch analysis failed")
+
+    async def generate():
+        started = time.perf_counter()
+        succeeded = failed = 0
+        yield json.dumps({"type": "jd_summary", "jd_summary": jd_data, "total": len(resumes)}) + "\n"
+        async for record in pipeline.arun_batch(jd_data, resumes, concurrency, BATCH_ITEM_TIMEOUT, **modes):
+            if record["success"]:
+                succeeded += 1
+            else:
+                failed += 1
+            yield json.dumps(record) + "\n"
+        yield json.dumps({
+            "type": "summary",
+            "total": len(resumes),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@_instrumented("/api/analyze/jobs")
+async def analyze_jobs(request):
+    """Async form of app.analyze_jobs, streaming results and then the ranking."""
+    try:
+        values, error_response = await _read_with_flask(request, _read_jobs_request)
+        if error_response:
+            return error_response
+        resume_text, jobs, concurrency, modes = values
+        resume_data = await resume_parser.aparse(resume_text)
+    except Exception as e:
+        return _error_response(e, "Job matching failed")
+
+    async def generate():
+        started = time.perf_counter()
+        ranking = []
+        failed = 0
+        yield json.dumps({"type": "resume_summary", "resume_summary": resume_data, "total": len(jobs)}) + "\n"
+        async for record in pipeline.arun_job_batch(resume_data, jobs, concurrency, BATCH_ITEM_TIMEOUT, **modes):
+            if record["success"]:
+                _rank_job_record(ranking, record)
+            else:
+                failed += 1
+            yield json.dumps(record) + "\n"
+        yield json.dumps({
+            "type": "ranking",
+            "ranking": ranking,
+            "total": len(jobs),
+            "succeeded": len(ranking),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+app = Starlette(routes=[
+    Route("/api/analyze", analyze, methods=["POST"]),
+    Route("/api/analyze/batch", analyze_batch, methods=["POST"]),
+    Route("/api/analyze/jobs", analyze_jobs, methods=["POST"]),
+    Mount("/", WSGIMiddleware(flask_app, workers=WSGI_THREADS)),
+])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
@@ -0,0 +1,130 @@
+"""
+CVAlign Lens — Admission Control Benchmark
+Sends an open-loop stream of /api/analyze requests (fixed arrival rate) to
+the Flask app in-process, served by a bounded pool of worker threads like
+gunicorn's, while the stub LLM runs at normal speed, slows down, and then
+recovers. Reports, per phase, how many requests succeeded or were shed and
+their time in the system (including waiting for a worker), with admission
+control off and on.
+
+    python -m benchmarks.admission [--rate 20] [--workers 32] [--phase-seconds 10] [--slow-latency fixed:2]
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import make_job_description, make_resume
+
+
+PHASES = ("normal", "slowdown", "recovery")
+
+
+def run(app_module, controller, args) -> dict:
+    from utils.llm_client import get_llm_client
+    from utils.llm_stub import LatencyModel
+
+    app_module.admission = controller
+    backend = get_llm_client().backend
+    client = app_module.app.test_client()
+    records = []
+    lock = threading.Lock()
+    limits = []
+
+    def one(seq: int, phase: str, submitted: float) -> None:
+        response = client.post(
+            "/api/analyze",
+            data={"job_description": make_job_description(seq % 20), "resume_text": make_resume(10_000 + seq)},
+            headers={"Cache-Control": "no-cache", "X-Client-Id": f"client-{seq % args.clients}"},
+        )
+        with lock:
+            records.append((phase, response.status_code, time.perf_counter() - submitted))
+
+    seq = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for phase, latency in zip(PHASES, (args.latency, args.slow_latency, args.latency)):
+            backend.latency = LatencyModel(latency, seed=args.seed)
+            phase_end = time.perf_counter() + args.phase_seconds
+            next_arrival = time.perf_counter()
+            while next_arrival < phase_end:
+                time.sleep(max(0.0, next_arrival - time.perf_counter()))
+                pool.submit(one, seq, phase, time.perf_counter())
+                seq += 1
+                next_arrival += 1 / args.rate
+                if controller is not None and seq % args.rate == 0:
+                    limits.append(controller.stats()["limit"])
+
+    results = {}
+    for phase in PHASES:
+        ok = [elapsed for p, status, elapsed in records if p == phase and status == 200]
+        shed = [elapsed for p, status, elapsed in records if p == phase and status in (429, 503)]
+        results[phase] = {
+            "sent": sum(1 for p, _, _ in records if p == phase),
+            "ok": len(ok),
+            "shed": len(shed),
+            "other": sum(1 for p, status, _ in records if p == phase and status not in (200, 429, 503)),
+            "ok_latency": summarize(ok, unit="ms"),
+            "shed_latency": summarize(shed, unit="ms"),
+        }
+    if limits:
+        results["limit_per_second"] = limits
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare /api/analyze under an LLM slowdown with and without admission control."
+    )
+    parser.add_argument("--rate", type=int, default=20, help="Requests per second, open loop")
+    parser.add_argument("--workers", type=int, default=32, help="Worker threads serving requests")
+    parser.add_argument("--clients", type=int, default=4, help="Distinct X-Client-Id values")
+    parser.add_argument("--phase-seconds", type=float, default=10)
+    parser.add_argument("--latency", default="lognormal:0.2:0.2", help="Stub LLM latency while healthy")
+    parser.add_argument("--slow-latency", default="lognormal:2:0.2", help="Stub LLM latency during the slowdown")
+    parser.add_argument("--max-wait", default="5", help="ADMISSION_MAX_WAIT")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/admission-<time>.json)")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_BACKEND": "stub",
+        "LLM_REQUESTS_PER_MINUTE": "0",
+        "LLM_TOKENS_PER_MINUTE": "0",
+        "ADMISSION_CONTROL": "true",
+        "ADMISSION_MAX_WAIT": args.max_wait,
+    })
+    import app as app_module
+    from utils.admission import AdmissionController
+    from utils.llm_client import get_llm_client
+    from utils.metrics import ADMISSION_DECISIONS
+
+    off = run(app_module, None, args)
+    # A fresh controller, so the limit does not start where the first run's slowdown left it
+    controller = AdmissionController.from_env()
+    get_llm_client().add_listener(controller.observe)
+    results = {"admission_off": off, "admission_on": run(app_module, controller, args)}
+    results["admission_on"]["decisions"] = {outcome: value for (outcome,), value in ADMISSION_DECISIONS.values().items()}
+
+    print(f"{'config':<15}{'phase':<10}{'sent':>6}{'ok':>6}{'shed':>6}{'other':>7}"
+          f"{'ok p50 ms':>11}{'ok p99 ms':>11}{'shed p50 ms':>13}{'shed p99 ms':>13}")
+    for name, entry in results.items():
+        for phase in PHASES:
+            row = entry[phase]
+            ok, shed = row["ok_latency"], row["shed_latency"]
+            print(
+                f"{name:<15}{phase:<10}{row['sent']:>6}{row['ok']:>6}{row['shed']:>6}{row['other']:>7}"
+                f"{ok['p50']:>11.0f}{ok['p99']:>11.0f}{shed['p50']:>13.1f}{shed['p99']:>13.1f}"
+            )
+    if "limit_per_second" in results["admission_on"]:
+        print(f"\nadmission limit, sampled each second: {results['admission_on']['limit_per_second']}")
+    print(f"admission decisions: {results['admission_on']['decisions']}")
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    path = write_results("admission", {"config": config, "benchmarks": results}, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+CVAlign Lens — Benchmark Helpers
+Latency statistics and JSON result files shared by the micro and macro suites.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+RESULTS_DIR = "bench_results"
+
+
+def percentile(sorted_samples: list, q: float) -> float:
+    """Linear-interpolated percentile (q in [0, 100]) of an already-sorted list."""
+    if not sorted_samples:
+        return 0.0
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    position = (len(sorted_samples) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    weight = position - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def summarize(samples_seconds: list, unit: str = "ms") -> dict:
+    """Summarize raw durations (seconds) as count, mean, p50/p95/p99, min, and max."""
+    scale = {"ms": 1e3, "us": 1e6}[unit]
+    ordered = sorted(s * scale for s in samples_seconds)
+    count = len(ordered)
+    return {
+        "unit": unit,
+        "count": count,
+        "mean": round(sum(ordered) / count, 3) if count else 0.0,
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "min": round(ordered[0], 3) if count else 0.0,
+        "max": round(ordered[-1], 3) if count else 0.0,
+    }
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(suite: str, results: dict, out_path: str = None) -> str:
+    """Write a results document to out_path (default bench_results/<suite>-<time>.json)."""
+    if not out_path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out_path = os.path.join(RESULTS_DIR, f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    document = {"suite": suite, "environment": environment_info(), "results": results}
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    return out_path
+
+
+def print_table(rows: dict, unit: str) -> None:
+    print(f"{'benchmark':<42}{'p50':>12}{'p95':>12}{'p99':>12}{'mean':>12}  ({unit})")
+    for name, stats in rows.items():
+        print(f"{name:<42}{stats['p50']:>12.3f}{stats['p95']:>12.3f}{stats['p99']:>12.3f}{stats['mean']:>12.3f}")
@@ -0,0 +1,65 @@
+"""
+CVAlign Lens — Benchmark Comparison
+Diffs two benchmark result files and flags regressions.
+
+    python -m benchmarks.compare bench_results/micro-old.json bench_results/micro-new.json
+"""
+
+import argparse
+import json
+import sys
+
+
+def flatten(document: dict) -> dict:
+    """Map "<benchmark>.<metric>" to a number for every latency/throughput/token figure in a result file."""
+    flat = {}
+    for name, entry in document["results"].get("benchmarks", {}).items():
+        stats = entry.get("latency", entry)
+        for metric in ("p50", "p95", "p99", "mean"):
+            if metric in stats:
+                flat[f"{name}.{metric}"] = stats[metric]
+        for metric in ("throughput_rps", "tokens_per_request", "llm_calls_per_request"):
+            if metric in entry:
+                flat[f"{name}.{metric}"] = entry[metric]
+    return flat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two CVAlign Lens benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change treated as a regression (default 10)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    old, new = flatten(baseline), flatten(candidate)
+    regressions = 0
+    print(f"{'metric':<52}{'baseline':>14}{'candidate':>14}{'change':>10}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        change = ((after - before) / before * 100) if before else 0.0
+        # Throughput regresses when it drops; latencies regress when they rise
+        worse = -change if key.endswith("throughput_rps") else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "  improved"
+        print(f"{key:<52}{before:>14.3f}{after:>14.3f}{change:>+9.1f}%{flag}")
+
+    for key in sorted(old.keys() - new.keys()):
+        print(f"{key:<52}  only in baseline")
+    for key in sorted(new.keys() - old.keys()):
+        print(f"{key:<52}  only in candidate")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
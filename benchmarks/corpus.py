@@ -0,0 +1,166 @@
+"""
+CVAlign Lens — Benchmark Corpus
+Deterministic, realistic-looking resumes and job descriptions, and the same
+resumes rendered as PDF, DOCX, and TXT uploads.
+"""
+
+import io
+import random
+
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "SQL", "PostgreSQL", "MongoDB",
+    "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "GCP", "Terraform", "React",
+    "Node.js", "Django", "Flask", "FastAPI", "Spark", "Airflow", "PyTorch", "CI/CD",
+    "Git", "Linux", "REST", "GraphQL", "Microservices", "Machine Learning",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Analytics", "Hooli", "Vandelay Logistics"]
+VERBS = ["Built", "Led", "Designed", "Migrated", "Optimized", "Automated", "Launched", "Scaled"]
+OBJECTS = [
+    "a real-time event pipeline", "the customer billing API", "an internal feature store",
+    "the CI/CD platform", "a multi-region deployment", "the search ranking service",
+    "a data warehouse ingestion layer", "the mobile checkout backend",
+]
+OUTCOMES = [
+    "cutting p95 latency by {n}%", "saving ${n}K per year in infrastructure costs",
+    "serving {n}M requests per day", "reducing incident volume by {n}%",
+    "improving conversion by {n}%", "shrinking build times by {n}%",
+]
+ROLES = ["Backend Engineer", "Data Engineer", "Platform Engineer", "ML Engineer", "Full-Stack Engineer"]
+
+
+def make_resume(seed: int, experience_entries: int = 4) -> str:
+    """Build a plausible plain-text resume; larger experience_entries gives longer documents."""
+    rng = random.Random(seed)
+    skills = rng.sample(SKILLS, 12)
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com  |  +1 555 {seed % 1000:03d} 0199  |  github.com/candidate{seed}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(ROLES)} with {rng.randint(2, 12)} years of experience shipping production systems "
+        f"in {skills[0]}, {skills[1]} and {skills[2]}. Comfortable owning services end to end.",
+        "",
+        "EXPERIENCE",
+    ]
+    for i in range(experience_entries):
+        start = 2024 - 2 * (i + 1)
+        lines.append(f"{rng.choice(ROLES)} — {rng.choice(COMPANIES)}   {start}–{start + 2}")
+        for _ in range(4):
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 80))
+            lines.append(
+                f"  • {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} "
+                f"and {rng.choice(skills)}, {outcome}."
+            )
+        lines.append("")
+    lines += [
+        "EDUCATION",
+        f"B.S. Computer Science — State University, {2024 - 2 * experience_entries - 4}",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "PROJECTS",
+        f"  • Open-source {rng.choice(skills)} library with {rng.randint(50, 900)} GitHub stars.",
+    ]
+    return "\n".join(lines)
+
+
+def make_job_description(seed: int) -> str:
+    """Build a plausible job description with explicit requirements and ATS keywords."""
+    rng = random.Random(10_000 + seed)
+    role = rng.choice(ROLES)
+    required = rng.sample(SKILLS, 6)
+    preferred = rng.sample([s for s in SKILLS if s not in required], 3)
+    lines = [
+        f"Senior {role}",
+        f"{rng.choice(COMPANIES)} is hiring a Senior {role} to join our platform team.",
+        "",
+        "What you'll do:",
+        f"- Design, build and operate services in {required[0]} and {required[1]}.",
+        f"- Own data flows across {required[2]} and {required[3]} at scale.",
+        "- Partner with product and data science to ship customer-facing features.",
+        "- Mentor engineers and raise the bar on code review and reliability.",
+        "",
+        "Requirements:",
+        f"- 5+ years of professional experience with {required[0]}.",
+        f"- Hands-on production experience with {', '.join(required[1:5])}.",
+        f"- Solid understanding of {required[5]}, distributed systems and observability.",
+        "- Excellent written communication and collaboration skills.",
+        "",
+        "Nice to have:",
+        f"- Experience with {', '.join(preferred)}.",
+        "",
+        "We offer competitive salary, equity, remote-friendly hours, and a learning budget.",
+    ]
+    return "\n".join(lines)
+
+
+def make_pdf(text: str, lines_per_page: int = 60) -> bytes:
+    """Render text into a minimal multi-page PDF with a standard Helvetica font."""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+        for line in page_lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("cp1252", errors="replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_at = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_at
+    ))
+    return out.getvalue()
+
+
+def make_docx(text: str) -> bytes:
+    """Render text into a DOCX document, one paragraph per line (requires python-docx)."""
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def build_corpus(size: int = 20) -> dict:
+    """
+    Return {"resumes": [...], "long_resumes": [...], "job_descriptions": [...]}.
+    long_resumes have enough experience entries to span several PDF pages.
+    """
+    return {
+        "resumes": [make_resume(i) for i in range(size)],
+        "long_resumes": [make_resume(1_000 + i, experience_entries=30) for i in range(max(1, size // 5))],
+        "job_descriptions": [make_job_description(i) for i in range(size)],
+    }
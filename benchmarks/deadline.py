@@ -0,0 +1,101 @@
+"""
+CVAlign Lens — Request Deadline Benchmark
+Sends /api/analyze requests to the Flask app in-process while the stub LLM
+has a slow tail (a fraction of calls stall for --slow-seconds), with
+REQUEST_DEADLINE off and on. Reports end-to-end latency percentiles and how
+many responses, and which stages, fell back to local degraded results.
+
+    python -m benchmarks.deadline [--requests 200] [--concurrency 8] [--deadline 4] [--slow-rate 0.03]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import make_job_description, make_resume
+
+
+def run(app_module, deadline: float, args, offset: int) -> dict:
+    from utils.metrics import DEGRADED_RESULTS
+
+    app_module.REQUEST_DEADLINE = deadline
+    client = app_module.app.test_client()
+    before = DEGRADED_RESULTS.values()
+
+    def one(seq: int) -> tuple:
+        start = time.perf_counter()
+        response = client.post(
+            "/api/analyze",
+            data={"job_description": make_job_description(offset + seq), "resume_text": make_resume(offset + seq)},
+            headers={"Cache-Control": "no-cache"},
+        )
+        body = response.get_json() or {}
+        return time.perf_counter() - start, response.status_code, bool(body.get("degraded"))
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        records = list(pool.map(one, range(args.requests)))
+
+    return {
+        "latency": summarize([elapsed for elapsed, _, _ in records], unit="ms"),
+        "ok": sum(1 for _, status, _ in records if status == 200),
+        "errors": sum(1 for _, status, _ in records if status != 200),
+        "degraded": sum(1 for _, _, degraded in records if degraded),
+        "degraded_stages": {
+            stage: value - before.get((stage,), 0) for (stage,), value in DEGRADED_RESULTS.values().items()
+            if value > before.get((stage,), 0)
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare /api/analyze tail latency with and without a request deadline."
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--deadline", type=float, default=4, help="REQUEST_DEADLINE for the second run (seconds)")
+    parser.add_argument("--latency", default="lognormal:0.5:0.3", help="Stub LLM latency per call")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="Fraction of LLM calls that stall")
+    parser.add_argument("--slow-seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/deadline-<time>.json)")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_BACKEND": "stub",
+        "LLM_REQUESTS_PER_MINUTE": "0",
+        "LLM_TOKENS_PER_MINUTE": "0",
+        "ADMISSION_CONTROL": "false",
+    })
+    import app as app_module
+    from utils.llm_client import get_llm_client
+    from utils.llm_stub import LatencyModel
+
+    backend = get_llm_client().backend
+    results = {}
+    # Distinct inputs per run, so neither run is served by the other's cached parses or analyses
+    for offset, (name, deadline) in enumerate((("no_deadline", 0), (f"deadline_{args.deadline:g}s", args.deadline))):
+        backend.latency = LatencyModel(args.latency, slow_rate=args.slow_rate, slow_seconds=args.slow_seconds,
+                                       seed=args.seed)
+        results[name] = run(app_module, deadline, args, offset * args.requests)
+
+    print(f"{'config':<16}{'ok':>6}{'errors':>8}{'degraded':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, entry in results.items():
+        latency = entry["latency"]
+        print(
+            f"{name:<16}{entry['ok']:>6}{entry['errors']:>8}{entry['degraded']:>10}"
+            f"{latency['p50']:>10.0f}{latency['p95']:>10.0f}{latency['p99']:>10.0f}{latency['max']:>10.0f}"
+        )
+    for name, entry in results.items():
+        if entry["degraded_stages"]:
+            print(f"{name} fallbacks by stage: {entry['degraded_stages']}")
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    path = write_results("deadline", {"config": config, "benchmarks": results}, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+CVAlign Lens — Hedged Request Benchmark
+Sends the same stream of JD-extraction calls through LLMClient with hedging
+off and on, against an LLM with an injected slow tail, and reports latency
+percentiles, hedges sent, and the extra provider requests they cost.
+
+    python -m benchmarks.hedging [--calls 300] [--slow-rate 0.03] [--llm stub|server]
+
+--llm stub uses the in-process stub backend; --llm server runs the Groq
+client against the local fake chat-completions server, so cancellation and
+per-request timeouts go through a real HTTP stack.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import make_job_description
+from prompts.prompt_templates import JD_EXTRACTION_PROMPT, SYSTEM_PROMPT
+
+
+CONFIGURATIONS = {
+    "no_hedge": {"LLM_HEDGE": "false"},
+    "hedge": {"LLM_HEDGE": "true"},
+}
+
+
+def run(config: dict, prompts: list, concurrency: int) -> dict:
+    os.environ.update(config)
+    from utils.llm_client import LLMClient
+    from utils.metrics import LLM_HEDGES
+
+    client = LLMClient()
+    hedges_before = LLM_HEDGES.values()
+
+    def one(prompt: str) -> float:
+        start = time.perf_counter()
+        client.call(SYSTEM_PROMPT, prompt, stage="jd_extraction")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, prompts))
+
+    hedges = {
+        event: value - hedges_before.get((stage, event), 0)
+        for (stage, event), value in LLM_HEDGES.values().items()
+        if stage == "jd_extraction"
+    }
+    usage = client.usage()
+    return {
+        "latency": summarize(samples, unit="ms"),
+        "provider_requests": usage["calls"],
+        "extra_request_ratio": round(usage["calls"] / len(prompts) - 1, 4),
+        "hedges": hedges,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LLM call latency with and without hedged requests.")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal:0.3:0.3", help="Stub LLM latency spec (see utils/llm_stub.py)")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="Share of calls sent to the slow tail")
+    parser.add_argument("--slow-seconds", type=float, default=5.0)
+    parser.add_argument("--hedge-delay", default="p90", help="LLM_HEDGE_DELAY: seconds or a percentile like p90")
+    parser.add_argument("--hedge-fallback", default="1", help="LLM_HEDGE_FALLBACK_DELAY before enough samples exist")
+    parser.add_argument("--hedge-budget", default="0.1", help="LLM_HEDGE_BUDGET: hedges per primary call")
+    parser.add_argument("--llm", choices=("stub", "server"), default="stub")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/hedging-<time>.json)")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_REQUESTS_PER_MINUTE": "0",
+        "LLM_TOKENS_PER_MINUTE": "0",
+        "LLM_HEDGE_DELAY": args.hedge_delay,
+        "LLM_HEDGE_BUDGET": args.hedge_budget,
+        "LLM_HEDGE_FALLBACK_DELAY": args.hedge_fallback,
+        "LLM_HEDGE_MIN_SAMPLES": "20",
+    })
+    if args.llm == "stub":
+        os.environ.update({
+            "LLM_BACKEND": "stub",
+            "LLM_STUB_LATENCY": args.latency,
+            "LLM_STUB_SLOW_RATE": str(args.slow_rate),
+            "LLM_STUB_SLOW_SECONDS": str(args.slow_seconds),
+            "LLM_STUB_SEED": str(args.seed),
+        })
+    else:
+        from benchmarks.macro import start_fake_llm_server
+
+        llm_server = start_fake_llm_server(args.latency, args.slow_rate, args.slow_seconds, args.seed)
+        os.environ.update({
+            "LLM_BACKEND": "groq",
+            "GROQ_API_KEY": "fake",
+            "GROQ_BASE_URL": f"http://127.0.0.1:{llm_server.server_address[1]}",
+        })
+
+    prompts = [
+        JD_EXTRACTION_PROMPT.format(job_description=make_job_description(i % 50)) for i in range(args.calls)
+    ]
+    results = {name: run(config, prompts, args.concurrency) for name, config in CONFIGURATIONS.items()}
+
+    print(f"{'config':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'extra req':>11}  hedges")
+    for name, entry in results.items():
+        lat = entry["latency"]
+        print(
+            f"{name:<12}{lat['p50']:>10.1f}{lat['p95']:>10.1f}{lat['p99']:>10.1f}{lat['max']:>10.1f}"
+            f"{entry['extra_request_ratio']:>10.1%}  {entry['hedges']}"
+        )
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    path = write_results("hedging", {"config": config, "benchmarks": results}, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+CVAlign Lens — ATS Keyword Scanner Check and Benchmark
+Verifies that KeywordScanner finds exactly the hits (terms, counts, and
+offsets) of a per-spelling regex scan, and that a JD's scanner finds none of
+its terms in ordinary English that merely contains their ambiguous spellings
+("go further", "the rest of the team"), then times both on synthetic resumes
+of increasing length for term lists of increasing size: a JD's keywords, every
+known skill, and a long list. Also reports how many of the keywords found
+in long resumes lie only past the text the resume parse actually sends to
+the LLM.
+
+    python -m benchmarks.keyword_scan [--resumes 200] [--repeat 20] [--long-terms 300]
+
+Exits non-zero if any scan disagrees with the regex reference or a JD scanner
+reports a false positive.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from benchmarks.common import print_table, summarize, write_results
+from benchmarks.corpus import SKILLS, VERBS, OBJECTS, make_resume
+from prompts.prompt_templates import RESUME_EXTRACTION_PROMPT
+from utils.keyword_scanner import KeywordScanner, _longest_spans
+from utils.prompt_builder import PromptBuilder
+from utils.skills import SKILL_ALIASES, canonical_skill, skill_variants
+from utils.text_processing import clean_text
+
+
+# Resume lengths, as experience entries per resume (see make_resume)
+LENGTHS = (4, 20, 100)
+
+# JD terms whose short or everyday spellings (cv, go, rest, containers, github, ts, ai) used to match plain English
+AMBIGUOUS_JD = {
+    "keywords_for_ats": ["Computer Vision", "REST APIs", "AI"],
+    "core_technical_skills": ["Go", "Docker", "Git", "TypeScript"],
+}
+# (text, keywords the JD scanner must find in it)
+AMBIGUOUS_TEXTS = (
+    ("CV - Jane Smith\nI want to go further. Responsible for the rest of the team. Worked with containers on GitHub; "
+     "managed TS reports; used ai tools.", []),
+    ("Built Go services behind REST APIs, shipped with Docker and Git, a TypeScript UI, and AI search.",
+     ["REST APIs", "AI", "Go", "Docker", "Git", "TypeScript"]),
+)
+
+
+def regex_scan(text: str, terms: list) -> dict:
+    """The per-term approach KeywordScanner replaces: one whole-word regex per spelling, extended to offsets."""
+    lowered = text.lower().replace("\n", " ").replace("\t", " ")
+    found = {}
+    seen = set()
+    for term in terms:
+        canonical = canonical_skill(term)
+        if not canonical or canonical in seen:
+            continue
+        seen.add(canonical)
+        spans = []
+        for variant in dict.fromkeys(skill_variants(term) + [term.strip().lower()]):
+            variant = " ".join(variant.split())
+            if variant and variant in lowered:
+                pattern = rf"(?<![\w+#]){re.escape(variant)}(?![\w+#])"
+                spans += [match.span() for match in re.finditer(pattern, lowered)]
+        if spans:
+            found[term] = _longest_spans(spans)
+    return found
+
+
+def term_lists(rng: random.Random, long_terms: int) -> dict:
+    words = sorted({word.lower() for phrase in OBJECTS for word in phrase.split() if len(word) > 3})
+    long_tail = [f"{rng.choice(VERBS)} {rng.choice(words)}" for _ in range(long_terms)]
+    lists = {"jd": rng.sample(SKILLS, 12), "known": list(SKILL_ALIASES) + SKILLS}
+    lists["long"] = lists["known"] + long_tail
+    return {f"{name} ({len(term_list)} terms)": term_list for name, term_list in lists.items()}
+
+
+def check_equivalence(terms: dict, resumes: int) -> list:
+    """Return (term list, seed) pairs where the scanner and the regex reference disagree."""
+    failures = []
+    for name, term_list in terms.items():
+        scanner = KeywordScanner(term_list)
+        for seed in range(resumes):
+            text = clean_text(make_resume(seed, LENGTHS[seed % len(LENGTHS)]))
+            if scanner.scan(text) != regex_scan(text, term_list):
+                failures.append((name, seed))
+    return failures
+
+
+def check_false_positives() -> list:
+    """Return (text, expected, found) for each AMBIGUOUS_TEXTS entry the JD scanner gets wrong."""
+    scanner = KeywordScanner.for_jd(AMBIGUOUS_JD)
+    failures = []
+    for text, expected in AMBIGUOUS_TEXTS:
+        found = list(scanner.scan(text))
+        if sorted(found) != sorted(expected):
+            failures.append((text, expected, found))
+    return failures
+
+
+def time_scans(terms: dict, repeat: int) -> dict:
+    samples = {}
+    for name, term_list in terms.items():
+        scanner = KeywordScanner(term_list)
+        for entries in LENGTHS:
+            texts = [clean_text(make_resume(seed, entries)) for seed in range(repeat)]
+            label = f"{name} {len(texts[0]) // 1000}k chars"
+            for method, run in (
+                ("regex", lambda text: regex_scan(text, term_list)),
+                ("scanner", scanner.scan),
+                ("scanner+build", lambda text: KeywordScanner(term_list).scan(text)),
+            ):
+                timings = []
+                for text in texts:
+                    start = time.perf_counter()
+                    run(text)
+                    timings.append(time.perf_counter() - start)
+                samples[f"{label}/{method}"] = summarize(timings, unit="ms")
+    return samples
+
+
+def truncation_coverage(resumes: int, entries: int) -> dict:
+    """Keyword hits in long resumes that only the full-text scan sees, past the resume parse's truncation."""
+    prompts = PromptBuilder()
+    scanner = KeywordScanner(SKILLS)
+    found = past_cutoff = 0
+    lengths = []
+    for seed in range(resumes):
+        # A skill mentioned only near the end of the document, as in a trailing certifications section
+        text = clean_text(make_resume(seed, entries) + f"\n\nCERTIFICATIONS\n{SKILLS[seed % len(SKILLS)]} certified")
+        sent = prompts.build("resume_extraction", RESUME_EXTRACTION_PROMPT, texts={"resume_text": text})
+        cutoff = len(sent.values["resume_text"])
+        lengths.append(cutoff)
+        for spans in scanner.scan(text).values():
+            found += 1
+            past_cutoff += spans[0][0] >= cutoff
+    return {
+        "resumes": resumes,
+        "resume_chars": len(text),
+        "chars_sent_to_llm_p50": sorted(lengths)[len(lengths) // 2],
+        "keywords_found": found,
+        "keywords_only_past_truncation": past_cutoff,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KeywordScanner equivalence check and benchmark.")
+    parser.add_argument("--resumes", type=int, default=200, help="Resumes per term list to check")
+    parser.add_argument("--repeat", type=int, default=20, help="Resumes timed per length and term list")
+    parser.add_argument("--long-terms", type=int, default=300, help="Extra terms in the long list")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--out", default=None, help="Result JSON path (default: bench_results/keyword_scan-<time>.json)"
+    )
+    args = parser.parse_args()
+
+    terms = term_lists(random.Random(args.seed), args.long_terms)
+    failures = check_equivalence(terms, args.resumes)
+    checked = args.resumes * len(terms)
+    print(f"equivalence: {checked - len(failures)}/{checked} scans matched the regex reference")
+    for name, seed in failures[:5]:
+        print(f"  mismatch: {name}, resume seed {seed}")
+
+    false_positives = check_false_positives()
+    print(f"ambiguity: {len(AMBIGUOUS_TEXTS) - len(false_positives)}/{len(AMBIGUOUS_TEXTS)} texts scanned as expected")
+    for text, expected, found in false_positives:
+        print(f"  expected {expected}, found {found}: {text[:60]!r}")
+
+    timings = time_scans(terms, args.repeat)
+    print()
+    print_table(timings, "ms")
+
+    coverage = truncation_coverage(args.resumes, LENGTHS[-1])
+    print(
+        f"\ntruncation: {coverage['keywords_only_past_truncation']} of {coverage['keywords_found']} keywords found "
+        f"in {coverage['resume_chars']}-char resumes first appear past the "
+        f"{coverage['chars_sent_to_llm_p50']} chars sent to the LLM"
+    )
+
+    path = write_results("keyword_scan", {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "mismatches": len(failures),
+        "false_positives": len(false_positives),
+        "benchmarks": timings,
+        "truncation": coverage,
+    }, args.out)
+    print(f"\nResults written to {path}")
+    if failures or false_positives:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+CVAlign Lens — Macro-benchmark
+Drives /api/analyze through a real gunicorn (WSGI) or uvicorn (ASGI) server
+with N concurrent clients against a fake LLM, and reports latency
+percentiles and throughput.
+
+    python -m benchmarks.macro --clients 16 --requests 200 --llm stub --latency lognormal:0.5:0.3
+    python -m benchmarks.macro --llm http   # through the Groq SDK and a local chat-completions server
+    python -m benchmarks.macro --server uvicorn --workers 1 --clients 200 --requests 2000 --llm http
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import build_corpus
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become ready within {timeout}s")
+
+
+def start_fake_llm_server(latency: str, slow_rate: float, slow_seconds: float, seed: int):
+    from utils.fake_llm_server import FakeLLMServer
+    from utils.llm_stub import LatencyModel
+
+    server = FakeLLMServer(("127.0.0.1", 0), LatencyModel(latency, slow_rate, slow_seconds, seed))
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server
+
+
+def server_env(args, workdir: str, llm_server=None) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "LLM_REQUESTS_PER_MINUTE": "0",
+        "LLM_TOKENS_PER_MINUTE": "0",
+        "JOB_DB_PATH": os.path.join(workdir, "jobs.db"),
+        "LLM_STUB_LATENCY": args.latency,
+        "LLM_STUB_SLOW_RATE": str(args.slow_rate),
+        "LLM_STUB_SLOW_SECONDS": str(args.slow_seconds),
+    })
+    # The stub answers deterministically, so reused analyses or responses would flatter the numbers
+    env.setdefault("ANALYSIS_CACHE_SIZE", "0")
+    env.setdefault("RESULT_CACHE_SIZE", "0")
+    if args.llm == "stub":
+        env["LLM_BACKEND"] = "stub"
+    else:
+        env.update({
+            "LLM_BACKEND": "groq",
+            "GROQ_API_KEY": "fake",
+            "GROQ_BASE_URL": f"http://127.0.0.1:{llm_server.server_address[1]}",
+        })
+    if args.seed is not None:
+        env["LLM_STUB_SEED"] = str(args.seed)
+    return env
+
+
+def start_server(args, port: int, env: dict) -> subprocess.Popen:
+    if args.server == "uvicorn":
+        command = [
+            sys.executable, "-m", "uvicorn", "asgi:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(args.workers),
+            "--backlog", "4096",
+            "--log-level", "warning",
+        ]
+        return subprocess.Popen(command, env=env)
+    command = [
+        sys.executable, "-m", "gunicorn", "app:app",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(args.workers),
+        "--threads", str(args.threads),
+        "--timeout", "300",
+        "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+def run_load(port: int, path: str, bodies: list, clients: int, total: int, extra_fields: dict) -> dict:
+    """Send total requests from `clients` keep-alive connections; return per-request records."""
+    lock = threading.Lock()
+    issued = [0]
+    records = []
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+        while True:
+            with lock:
+                if issued[0] >= total:
+                    break
+                index = issued[0]
+                issued[0] += 1
+            body = urlencode({**bodies[index % len(bodies)], **extra_fields})
+            start = time.perf_counter()
+            try:
+                conn.request("POST", path, body=body, headers={
+                    "Content-Type": "application/x-www-form-urlencoded",
+                })
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+                status = 0
+            elapsed = time.perf_counter() - start
+            with lock:
+                records.append((status, elapsed))
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    ok = [elapsed for status, elapsed in records if status == 200]
+    statuses = {}
+    for status, _ in records:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(records),
+        "succeeded": len(ok),
+        "status_counts": statuses,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(ok) / wall, 3) if wall else 0.0,
+        "latency": summarize(ok, unit="ms"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end /api/analyze load benchmark against a fake LLM.")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent HTTP clients")
+    parser.add_argument("--requests", type=int, default=200, help="Total measured requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured warm-up requests")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"], default="gunicorn",
+                        help="Threaded WSGI app (app:app) or the async ASGI app (asgi:app)")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker (ignored by uvicorn)")
+    parser.add_argument("--llm", choices=["stub", "http"], default="stub",
+                        help="In-process stub backend, or the Groq SDK against a local fake server")
+    parser.add_argument("--latency", default="fixed:0.2", help="Fake LLM latency spec (see utils/llm_stub.py)")
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-seconds", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--unique-jds", type=int, default=20, help="Distinct JDs to cycle through (JD cache hit rate)")
+    parser.add_argument("--path", default="/api/analyze", help="Endpoint to drive")
+    parser.add_argument("--field", action="append", default=[], metavar="NAME=VALUE",
+                        help="Extra form field sent with every request (repeatable)")
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/macro-<time>.json)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(max(args.unique_jds, 20))
+    jds = corpus["job_descriptions"][:args.unique_jds]
+    bodies = [
+        {"job_description": jds[i % len(jds)], "resume_text": resume}
+        for i, resume in enumerate(corpus["resumes"])
+    ]
+    extra_fields = dict(field.split("=", 1) for field in args.field)
+
+    llm_server = start_fake_llm_server(args.latency, args.slow_rate, args.slow_seconds, args.seed) \
+        if args.llm == "http" else None
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(args, port, server_env(args, workdir, llm_server))
+        try:
+            wait_until_ready(port)
+            if args.warmup:
+                run_load(port, args.path, bodies, min(args.clients, args.warmup), args.warmup, extra_fields)
+            result = run_load(port, args.path, bodies, args.clients, args.requests, extra_fields)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            if llm_server:
+                llm_server.shutdown()
+
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    lat = result["latency"]
+    server_desc = f"{args.workers}x{args.threads} gunicorn" if args.server == "gunicorn" else f"{args.workers} uvicorn"
+    print(f"{args.requests} requests, {args.clients} clients, {server_desc}, llm={args.llm} ({args.latency})")
+    print(f"  succeeded: {result['succeeded']}  statuses: {result['status_counts']}")
+    print(f"  throughput: {result['throughput_rps']} req/s over {result['wall_seconds']}s")
+    print(f"  latency ms: p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} max={lat['max']}")
+    path = write_results("macro", {"config": config, "benchmarks": {args.path: result}}, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
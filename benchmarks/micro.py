@@ -0,0 +1,153 @@
+"""
+CVAlign Lens — Micro-benchmarks
+Times the CPU-bound hot paths under utils/ on a realistic corpus:
+text cleaning, truncation, file extraction, prompt construction (plain
+and token-budgeted), and LLM
+JSON extraction. No network access or API key is needed.
+
+    python -m benchmarks.micro [--repeat 200] [--out bench_results/micro.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+
+from werkzeug.datastructures import FileStorage
+
+from benchmarks.common import summarize, write_results, print_table
+from benchmarks.corpus import build_corpus, make_pdf, make_docx
+from prompts.prompt_templates import (
+    JD_EXTRACTION_PROMPT,
+    RESUME_EXTRACTION_PROMPT,
+    ANALYSIS_PROMPT,
+    SCORING_PROMPT,
+)
+from utils.cache import TieredCache
+from utils.file_handlers import FileHandler
+from utils.llm_stub import StubResponder
+from utils.prompt_builder import PromptBuilder
+from utils.text_processing import clean_text, truncate_text
+
+
+def time_calls(fn, inputs: list, repeat: int) -> list:
+    """Call fn on each input in turn, repeat times over, returning per-call durations."""
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def stub_payloads(corpus: dict) -> dict:
+    responder = StubResponder()
+    jd = corpus["job_descriptions"][0]
+    resume = corpus["resumes"][0]
+    return {
+        "jd": responder.respond("", JD_EXTRACTION_PROMPT.format(job_description=jd)),
+        "resume": responder.respond("", RESUME_EXTRACTION_PROMPT.format(resume_text=resume)),
+        "analysis": responder.respond("", ANALYSIS_PROMPT.format(jd_data="{}", resume_data="{}")),
+        "score": responder.respond("", SCORING_PROMPT.format(analysis_data="{}", jd_data="{}", resume_data="{}")),
+    }
+
+
+def run(repeat: int, corpus_size: int) -> dict:
+    # Importing LLMClient needs no key; only constructing a Groq backend does
+    os.environ.setdefault("LLM_BACKEND", "stub")
+    from utils.llm_client import LLMClient
+
+    corpus = build_corpus(corpus_size)
+    texts = corpus["resumes"] + corpus["job_descriptions"]
+    noisy = [t.replace(" ", "  ").replace("\n", "\r\n\n") + " café – naïve ﬁ\x0c" for t in texts]
+    long_texts = corpus["long_resumes"]
+    cleaned = [clean_text(t) for t in long_texts]
+
+    # Measure raw extraction: in-thread, no result cache
+    os.environ["EXTRACTION_WORKERS"] = "0"
+    os.environ["PDF_TEXT_ENGINE"] = "pdfplumber"
+    handler = FileHandler(cache=TieredCache("bench_file_text", max_entries=0))
+    os.environ["PDF_TEXT_ENGINE"] = "pdfium"
+    pdfium_handler = FileHandler(cache=TieredCache("bench_file_text", max_entries=0))
+    uploads = {
+        "txt": [(f"r{i}.txt", t.encode("utf-8")) for i, t in enumerate(corpus["resumes"][:5])],
+        "pdf": [(f"r{i}.pdf", make_pdf(t)) for i, t in enumerate(corpus["resumes"][:5])],
+        "pdf_long": [(f"l{i}.pdf", make_pdf(t)) for i, t in enumerate(long_texts[:3])],
+        "docx": [(f"r{i}.docx", make_docx(t)) for i, t in enumerate(corpus["resumes"][:5])],
+    }
+
+    def extract(item, handler=handler):
+        name, data = item
+        result = handler.extract_text(FileStorage(stream=io.BytesIO(data), filename=name))
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+
+    payloads = stub_payloads(corpus)
+    parsed = {k: json.loads(v) for k, v in payloads.items()}
+    fenced = [f"```json\n{v}\n```" for v in payloads.values()]
+    prose = [f"Sure! Here is the JSON you asked for:\n{v}\nLet me know if you need more." for v in payloads.values()]
+    llm = LLMClient()
+    builder = PromptBuilder()
+
+    file_repeat = max(1, repeat // 20)
+    samples = {
+        "clean_text/resume_or_jd": time_calls(clean_text, texts, repeat),
+        "clean_text/noisy_unicode": time_calls(clean_text, noisy, repeat),
+        "clean_text/long_resume": time_calls(clean_text, long_texts, repeat),
+        "truncate_text/long_resume_7000": time_calls(lambda t: truncate_text(t, 7000), cleaned, repeat),
+        "extract_text/txt": time_calls(extract, uploads["txt"], file_repeat),
+        "extract_text/pdf": time_calls(extract, uploads["pdf"], file_repeat),
+        "extract_text/pdf_multipage": time_calls(extract, uploads["pdf_long"], file_repeat),
+        "extract_text/pdf_multipage_pdfium": time_calls(
+            lambda item: extract(item, pdfium_handler), uploads["pdf_long"], file_repeat
+        ),
+        "extract_text/docx": time_calls(extract, uploads["docx"], file_repeat),
+        "prompt/jd_extraction": time_calls(
+            lambda t: JD_EXTRACTION_PROMPT.format(job_description=t), corpus["job_descriptions"], repeat
+        ),
+        "prompt/analysis_json_indent2": time_calls(
+            lambda _: ANALYSIS_PROMPT.format(
+                jd_data=json.dumps(parsed["jd"], indent=2),
+                resume_data=json.dumps(parsed["resume"], indent=2),
+            ), [None], repeat * 10
+        ),
+        "prompt/scoring_json_indent2": time_calls(
+            lambda _: SCORING_PROMPT.format(
+                analysis_data=json.dumps(parsed["analysis"], indent=2),
+                jd_data=json.dumps(parsed["jd"], indent=2),
+                resume_data=json.dumps(parsed["resume"], indent=2),
+            ), [None], repeat * 10
+        ),
+        "prompt/analysis_budgeted": time_calls(
+            lambda _: builder.build(
+                "analysis", ANALYSIS_PROMPT, data={"jd_data": parsed["jd"], "resume_data": parsed["resume"]}
+            ), [None], repeat * 10
+        ),
+        "prompt/resume_extraction_budgeted": time_calls(
+            lambda t: builder.build("resume_extraction", RESUME_EXTRACTION_PROMPT, texts={"resume_text": t}),
+            cleaned, repeat
+        ),
+        "extract_json/plain": time_calls(llm._extract_json, list(payloads.values()), repeat),
+        "extract_json/fenced": time_calls(llm._extract_json, fenced, repeat),
+        "extract_json/prose_fallback": time_calls(llm._extract_json, prose, repeat),
+    }
+    return {name: summarize(values, unit="us") for name, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for CVAlign Lens hot paths.")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus per benchmark")
+    parser.add_argument("--corpus-size", type=int, default=20)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/micro-<time>.json)")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.corpus_size)
+    print_table(results, "µs")
+    path = write_results("micro", {"repeat": args.repeat, "benchmarks": results}, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
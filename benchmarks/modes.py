@@ -0,0 +1,104 @@
+"""
+CVAlign Lens — Pipeline Mode Benchmark
+Compares the standard (analyze, then score) and fused (one combined call)
+pipeline modes on latency, LLM calls, and token cost per resume, using the
+offline stub backend. JD and resume extraction run once up front and are
+excluded, since they are identical in every mode.
+
+    python -m benchmarks.modes [--pairs 10] [--repeat 3] [--latency lognormal:0.8:0.3]
+
+Stub token counts are ~4 characters per token estimates; they are good for
+comparing modes, not for predicting a provider bill.
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import build_corpus
+
+
+MODE_COMBINATIONS = [
+    ("standard", "llm"),
+    ("standard", "hybrid"),
+    ("fused", "hybrid"),
+    ("standard", "fast"),
+]
+
+
+def run(pairs: int, repeat: int) -> dict:
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+    os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+    from services.analyzer import Analyzer
+    from services.jd_parser import JDParser
+    from services.pipeline import AnalysisPipeline
+    from services.resume_parser import ResumeParser
+    from services.scorer import Scorer
+    from utils.cache import TieredCache
+    from utils.llm_client import get_llm_client
+
+    corpus = build_corpus(max(pairs, 20))
+    # Every pass must really run the stages, so result reuse is disabled
+    pipeline = AnalysisPipeline(
+        JDParser(), ResumeParser(), Analyzer(), Scorer(), results=TieredCache("bench_analysis", max_entries=0)
+    )
+    inputs = [
+        pipeline.parse_inputs(corpus["job_descriptions"][i % len(corpus["job_descriptions"])], corpus["resumes"][i])
+        for i in range(pairs)
+    ]
+    llm = get_llm_client()
+
+    results = {}
+    for pipeline_mode, scoring_mode in MODE_COMBINATIONS:
+        samples = []
+        llm.reset_usage()
+        for _ in range(repeat):
+            for jd_data, resume_data in inputs:
+                start = time.perf_counter()
+                pipeline.run_for_job(
+                    resume_data, {"jd_summary": jd_data},
+                    scoring_mode=scoring_mode, pipeline_mode=pipeline_mode,
+                )
+                samples.append(time.perf_counter() - start)
+        usage = llm.usage()
+        runs = len(samples)
+        results[f"{pipeline_mode}/{scoring_mode}"] = {
+            "latency": summarize(samples, unit="ms"),
+            "llm_calls_per_request": round(usage["calls"] / runs, 3),
+            "prompt_tokens_per_request": round(usage["prompt_tokens"] / runs, 1),
+            "completion_tokens_per_request": round(usage["completion_tokens"] / runs, 1),
+            "tokens_per_request": round(usage["total_tokens"] / runs, 1),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare standard and fused pipeline modes.")
+    parser.add_argument("--pairs", type=int, default=10, help="Distinct JD/resume pairs")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the pairs per mode")
+    parser.add_argument("--latency", default="lognormal:0.8:0.3", help="Stub LLM latency spec (see utils/llm_stub.py)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/modes-<time>.json)")
+    args = parser.parse_args()
+
+    os.environ["LLM_STUB_LATENCY"] = args.latency
+    os.environ["LLM_STUB_SEED"] = str(args.seed)
+    results = run(args.pairs, args.repeat)
+
+    print(f"{'mode':<20}{'p50 ms':>10}{'p95 ms':>10}{'calls':>8}{'prompt tok':>12}{'compl tok':>11}{'total tok':>11}")
+    for name, entry in results.items():
+        lat = entry["latency"]
+        print(
+            f"{name:<20}{lat['p50']:>10.1f}{lat['p95']:>10.1f}{entry['llm_calls_per_request']:>8.2f}"
+            f"{entry['prompt_tokens_per_request']:>12.1f}{entry['completion_tokens_per_request']:>11.1f}"
+            f"{entry['tokens_per_request']:>11.1f}"
+        )
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    path = write_results("modes", {"config": config, "benchmarks": results}, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+CVAlign Lens — Shortlist Index Benchmark
+Indexes a synthetic pool of resumes, then times BM25 ranking against parsed
+JDs, a cold reload of the pool from SQLite, and incremental inserts. No LLM
+calls are made; JD data comes from the offline stub's JD extraction.
+
+    python -m benchmarks.shortlist [--resumes 10000] [--queries 50] [--top-k 20]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import summarize, write_results, print_table
+from benchmarks.corpus import make_job_description, make_resume
+from prompts.prompt_templates import JD_EXTRACTION_PROMPT, SYSTEM_PROMPT
+from utils.llm_stub import StubResponder
+from utils.shortlist_index import ShortlistStore, build_query
+
+
+def parse_jd(stub: StubResponder, text: str) -> dict:
+    return json.loads(stub.respond(SYSTEM_PROMPT, JD_EXTRACTION_PROMPT.format(job_description=text)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 shortlist index benchmark.")
+    parser.add_argument("--resumes", type=int, default=10000, help="Pool size")
+    parser.add_argument("--queries", type=int, default=50, help="Distinct JDs ranked against the pool")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/shortlist-<time>.json)")
+    args = parser.parse_args()
+
+    resumes = [
+        {"id": f"r{i}", "name": f"Candidate {i}", "text": make_resume(i, experience_entries=2 + i % 5)}
+        for i in range(args.resumes)
+    ]
+    stub = StubResponder()
+    jds = [parse_jd(stub, make_job_description(seed)) for seed in range(args.queries)]
+
+    samples = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shortlist.db")
+        store = ShortlistStore(path)
+        start = time.perf_counter()
+        for offset in range(0, len(resumes), 500):
+            store.add("bench", resumes[offset:offset + 500])
+        index_seconds = time.perf_counter() - start
+
+        samples["search/warm"] = []
+        for jd_data in jds:
+            start = time.perf_counter()
+            store.search("bench", jd_data, args.top_k)
+            samples["search/warm"].append(time.perf_counter() - start)
+
+        index = store._refresh("bench")
+        queries = [build_query(jd_data) for jd_data in jds]
+        samples["rank_only"] = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, args.top_k)
+            samples["rank_only"].append(time.perf_counter() - start)
+
+        # A fresh process (or another worker) loads the pool from disk
+        start = time.perf_counter()
+        cold = ShortlistStore(path)
+        cold.size("bench")
+        load_seconds = time.perf_counter() - start
+
+        samples["insert_one"] = []
+        for i in range(50):
+            item = {"id": f"new{i}", "name": f"New {i}", "text": make_resume(args.resumes + i)}
+            start = time.perf_counter()
+            store.add("bench", [item])
+            samples["insert_one"].append(time.perf_counter() - start)
+
+    results = {name: summarize(values, unit="ms") for name, values in samples.items()}
+    print_table(results, "ms")
+    print()
+    print(f"indexed {args.resumes} resumes in {index_seconds:.2f}s "
+          f"({1000 * index_seconds / args.resumes:.3f} ms/resume)")
+    print(f"cold load from SQLite: {load_seconds * 1000:.1f} ms")
+
+    path = write_results("shortlist", {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "index_seconds": round(index_seconds, 3),
+        "cold_load_ms": round(load_seconds * 1000, 2),
+        "benchmarks": results,
+    }, args.out)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
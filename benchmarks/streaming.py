@@ -0,0 +1,193 @@
+"""
+CVAlign Lens — Streamed JSON Parsing Check and Benchmark
+Verifies that IncrementalJSONParser, fed stub LLM replies in random chunks
+(bare, inside ```json fences, and between prose), produces the same object
+as json.loads and reports every field with its final value. Then times the
+parser against LLMClient._extract_json on whole replies, and measures, per
+LLM stage, time to the first streamed field against the full completion.
+
+    python -m benchmarks.streaming [--cases 2000] [--calls 20] [--latency lognormal:1:0.2]
+
+Exits non-zero if any reply parses differently.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from benchmarks.common import summarize, write_results, print_table
+from benchmarks.corpus import make_job_description, make_resume
+from prompts.prompt_templates import (
+    SYSTEM_PROMPT, JD_EXTRACTION_PROMPT, RESUME_EXTRACTION_PROMPT, ANALYSIS_PROMPT, SCORING_PROMPT,
+    ANALYSIS_AND_SCORING_PROMPT,
+)
+from utils.json_stream import IncrementalJSONParser
+from utils.llm_stub import StubResponder
+
+
+WRAPPERS = ("{}", "```json\n{}\n```", "```\n{}\n```\n", "Here is the analysis:\n\n{}\n\nLet me know if you need more.")
+
+
+def stub_replies(count: int) -> dict:
+    """Stub replies per prompt type, keyed by the LLM stage name."""
+    stub = StubResponder()
+    jd = json.loads(stub.respond(SYSTEM_PROMPT, JD_EXTRACTION_PROMPT.format(job_description=make_job_description(0))))
+    replies = {"jd_extraction": [], "resume_extraction": [], "analysis": [], "scoring": [], "analysis_and_scoring": []}
+    for seed in range(count):
+        resume_text = make_resume(seed)
+        resume = json.loads(stub.respond(SYSTEM_PROMPT, RESUME_EXTRACTION_PROMPT.format(resume_text=resume_text)))
+        data = {"jd_data": json.dumps(jd), "resume_data": json.dumps(resume)}
+        replies["jd_extraction"].append(
+            stub.respond(SYSTEM_PROMPT, JD_EXTRACTION_PROMPT.format(job_description=make_job_description(seed)))
+        )
+        replies["resume_extraction"].append(json.dumps(resume, indent=2))
+        replies["analysis"].append(stub.respond(SYSTEM_PROMPT, ANALYSIS_PROMPT.format(**data)))
+        replies["scoring"].append(stub.respond(SYSTEM_PROMPT, SCORING_PROMPT.format(analysis_data="{}", **data)))
+        replies["analysis_and_scoring"].append(stub.respond(
+            SYSTEM_PROMPT, ANALYSIS_AND_SCORING_PROMPT.format(objective_scores="{}", **data)
+        ))
+    return replies
+
+
+def check_equivalence(replies: dict, cases: int, seed: int) -> list:
+    """Return (stage, wrapped reply) pairs the incremental parser got wrong."""
+    rng = random.Random(seed)
+    failures = []
+    for _ in range(cases):
+        stage = rng.choice(sorted(replies))
+        text = rng.choice(replies[stage])
+        expected = json.loads(text)
+        wrapped = rng.choice(WRAPPERS).replace("{}", text, 1)
+        depth = 2 if stage == "analysis_and_scoring" else 1
+        parser = IncrementalJSONParser(depth)
+        fields = []
+        i = 0
+        while i < len(wrapped):
+            size = rng.choice([1, 2, 5, 16, 64, 4096])
+            fields.extend(parser.feed(wrapped[i:i + size]))
+            i += size
+        try:
+            result = parser.close()
+        except ValueError:
+            result = None
+        reported = {path: value for path, value in fields}
+        final = all(_lookup(expected, path) == value for path, value in reported.items())
+        expected_paths = {(key,) for key in expected}
+        if depth == 2:
+            expected_paths |= {
+                (key, sub) for key, value in expected.items() if isinstance(value, dict) for sub in value
+            }
+        if result != expected or not final or set(reported) != expected_paths:
+            failures.append((stage, wrapped))
+    return failures
+
+
+def _lookup(data: dict, path: tuple):
+    for key in path:
+        data = data[key]
+    return data
+
+
+def time_parsing(replies: dict, repeat: int) -> dict:
+    from utils.llm_client import LLMClient
+
+    client = LLMClient()
+    samples = {}
+    for stage, texts in replies.items():
+        fenced = ["```json\n" + text + "\n```" for text in texts]
+        depth = 2 if stage == "analysis_and_scoring" else 1
+        incremental, whole = [], []
+        for _ in range(repeat):
+            for text in fenced:
+                chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+                start = time.perf_counter()
+                parser = IncrementalJSONParser(depth)
+                for chunk in chunks:
+                    parser.feed(chunk)
+                parser.close()
+                incremental.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                client._extract_json(text, stage)
+                whole.append(time.perf_counter() - start)
+        samples[f"{stage}/incremental (16-char chunks)"] = incremental
+        samples[f"{stage}/_extract_json (whole reply)"] = whole
+    return {name: summarize(values, unit="us") for name, values in samples.items()}
+
+
+def time_first_field(calls: int, latency: str) -> dict:
+    """Time to first field and to the full reply for streamed calls through LLMClient and the stub backend."""
+    from utils.llm_backends import StubBackend
+    from utils.llm_client import LLMClient
+    from utils.llm_stub import LatencyModel
+
+    client = LLMClient(StubBackend("stub", LatencyModel(latency)))
+    stub = StubResponder()
+    jd = stub.respond(SYSTEM_PROMPT, JD_EXTRACTION_PROMPT.format(job_description=make_job_description(0)))
+    prompts = {
+        "jd_extraction": lambda seed: JD_EXTRACTION_PROMPT.format(job_description=make_job_description(seed)),
+        "resume_extraction": lambda seed: RESUME_EXTRACTION_PROMPT.format(resume_text=make_resume(seed)),
+        "analysis": lambda seed: ANALYSIS_PROMPT.format(jd_data=jd, resume_data=make_resume(seed)[:2000]),
+        "analysis_and_scoring": lambda seed: ANALYSIS_AND_SCORING_PROMPT.format(
+            jd_data=jd, resume_data=make_resume(seed)[:2000], objective_scores="{}"
+        ),
+    }
+    results = {}
+    for stage, build in prompts.items():
+        first, full = [], []
+        for seed in range(calls):
+            seen = []
+            start = time.perf_counter()
+            client.call(
+                SYSTEM_PROMPT, build(seed), stage=stage, field_depth=2 if stage == "analysis_and_scoring" else 1,
+                on_field=lambda path, value: seen or seen.append(time.perf_counter() - start),
+            )
+            full.append(time.perf_counter() - start)
+            first.append(seen[0])
+        results[stage] = {"first_field": summarize(first, unit="ms"), "full_reply": summarize(full, unit="ms")}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental JSON parser equivalence check and benchmark.")
+    parser.add_argument("--cases", type=int, default=2000, help="Randomly chunked replies to check")
+    parser.add_argument("--replies", type=int, default=20, help="Distinct stub replies per prompt type")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing passes over the replies")
+    parser.add_argument("--calls", type=int, default=20, help="Streamed LLM calls per stage")
+    parser.add_argument("--latency", default="lognormal:1:0.2", help="Stub LLM latency per call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/streaming-<time>.json)")
+    args = parser.parse_args()
+
+    os.environ.update({"LLM_BACKEND": "stub", "LLM_REQUESTS_PER_MINUTE": "0", "LLM_TOKENS_PER_MINUTE": "0"})
+    replies = stub_replies(args.replies)
+    failures = check_equivalence(replies, args.cases, args.seed)
+    print(f"equivalence: {args.cases - len(failures)}/{args.cases} replies parsed identically")
+    for stage, text in failures[:5]:
+        print(f"  mismatch ({stage}): {text[:120]!r}")
+
+    timings = time_parsing(replies, args.repeat)
+    print()
+    print_table(timings, "us")
+
+    first_field = time_first_field(args.calls, args.latency)
+    print(f"\n{'stage':<24}{'first field p50 ms':>20}{'full reply p50 ms':>20}")
+    for stage, entry in first_field.items():
+        print(f"{stage:<24}{entry['first_field']['p50']:>20.1f}{entry['full_reply']['p50']:>20.1f}")
+
+    path = write_results("streaming", {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "mismatches": len(failures),
+        "benchmarks": timings,
+        "first_field": first_field,
+    }, args.out)
+    print(f"\nResults written to {path}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
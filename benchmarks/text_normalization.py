@@ -0,0 +1,131 @@
+"""
+CVAlign Lens — clean_text Equivalence Check and Benchmark
+Verifies that the single-pass clean_text (and its chunked variant) produce
+output identical to the original multi-pass implementation on randomized
+inputs, then times both on the benchmark corpus.
+
+    python -m benchmarks.text_normalization [--cases 20000] [--repeat 200] [--seed 0]
+
+Exits non-zero if any input produces different output.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+import unicodedata
+
+from benchmarks.common import summarize, write_results, print_table
+from benchmarks.corpus import build_corpus
+from utils.text_processing import clean_text, clean_text_chunked, iter_clean_text
+
+
+def reference_clean_text(text: str) -> str:
+    """The original multi-pass clean_text, kept verbatim as the oracle."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = re.sub(r"[^\x20-\x7E\n\t]", " ", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    lines = [re.sub(r" {2,}", " ", line) for line in text.split("\n")]
+    text = "\n".join(lines)
+    return text.strip()
+
+
+# Characters that exercise every branch: whitespace runs, control characters,
+# CRLF, compatibility decompositions, combining marks, and astral code points
+ALPHABET = (
+    list("abcXYZ019.,-()#+/") + [" "] * 6 + ["\n"] * 5 + ["\t", "\r", "\r\n", "\x0b", "\x0c", "\x00", "\x1f", "\x7f"]
+    + ["é", "ñ", "é", "̨́", "ﬁ", "½", "Ａ", " ", " ", " ", "–", "—", "’", "한", "😀", "\x85"]
+)
+
+
+def random_text(rng: random.Random) -> str:
+    length = rng.choice([0, 1, 2, 5, 20, 200, 2000])
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def random_chunks(rng: random.Random, text: str) -> list:
+    chunks, i = [], 0
+    while i < len(text):
+        size = rng.choice([1, 2, 3, 7, 64, 1000])
+        chunks.append(text[i:i + size])
+        i += size
+    return chunks
+
+
+def check_equivalence(cases: int, seed: int, corpus_texts: list) -> list:
+    """Return a list of (description, input) pairs where outputs differ."""
+    rng = random.Random(seed)
+    failures = []
+    inputs = corpus_texts + [random_text(rng) for _ in range(cases)]
+    for index, text in enumerate(inputs):
+        expected = reference_clean_text(text)
+        if clean_text(text) != expected:
+            failures.append((f"clean_text #{index}", text))
+        if "".join(iter_clean_text(random_chunks(rng, text))) != expected:
+            failures.append((f"iter_clean_text #{index}", text))
+        if clean_text_chunked(text, chunk_size=rng.choice([1, 5, 100])) != expected:
+            failures.append((f"clean_text_chunked #{index}", text))
+    return failures
+
+
+def time_calls(fn, inputs: list, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_text equivalence check and benchmark.")
+    parser.add_argument("--cases", type=int, default=20000, help="Randomized equivalence cases")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing passes over the corpus")
+    parser.add_argument("--corpus-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Result JSON path (default: bench_results/text-<time>.json)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.corpus_size)
+    texts = corpus["resumes"] + corpus["job_descriptions"]
+    noisy = [t.replace(" ", "  ").replace("\n", "\r\n\n") + " café – naïve ﬁ\x0c" for t in texts]
+    long_texts = corpus["long_resumes"]
+    huge = ["\n".join(corpus["resumes"]) * 10]
+
+    failures = check_equivalence(args.cases, args.seed, texts + noisy + long_texts + huge)
+    total = args.cases + len(texts) + len(noisy) + len(long_texts) + len(huge)
+    print(f"equivalence: {total} inputs x 3 variants, {len(failures)} mismatches")
+    for description, text in failures[:10]:
+        print(f"  MISMATCH {description}: {text[:80]!r}")
+
+    samples = {}
+    for label, inputs in (("resume_or_jd", texts), ("noisy_unicode", noisy), ("long_resume", long_texts)):
+        samples[f"reference/{label}"] = time_calls(reference_clean_text, inputs, args.repeat)
+        samples[f"clean_text/{label}"] = time_calls(clean_text, inputs, args.repeat)
+    repeat_huge = max(1, args.repeat // 20)
+    samples["reference/huge"] = time_calls(reference_clean_text, huge, repeat_huge)
+    samples["clean_text/huge"] = time_calls(clean_text, huge, repeat_huge)
+    samples["clean_text_chunked/huge"] = time_calls(clean_text_chunked, huge, repeat_huge)
+
+    results = {name: summarize(values, unit="us") for name, values in samples.items()}
+    print()
+    print_table(results, "µs")
+    print()
+    for label in ("resume_or_jd", "noisy_unicode", "long_resume", "huge"):
+        before, after = results[f"reference/{label}"]["p50"], results[f"clean_text/{label}"]["p50"]
+        print(f"{label:<16} speedup x{before / after:.2f} (p50)")
+
+    path = write_results("text", {
+        "cases": args.cases, "seed": args.seed, "mismatches": len(failures), "benchmarks": results,
+    }, args.out)
+    print(f"\nResults written to {path}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -61,6 +61,29 @@ Return a JSON object with this exact structure:
 Return only the JSON object. No explanation."""
 
 
+RESUME_SECTION_EXTRACTION_PROMPT = """Analyze the following resume section and extract structured intelligence from it alone.
+
+Section: {section_name}
+
+Section Text:
+{section_text}
+
+Return a JSON object with this exact structure. Report only what this section shows; use null or an empty list for anything it does not mention:
+{{
+  "candidate_name": "string or null",
+  "inferred_title": "string or null — best-fit job title, if this section indicates one",
+  "years_of_experience": "string or null — e.g., '3–5 years', if this section indicates it",
+  "technical_skills": ["all technical skills found"],
+  "soft_skills": ["soft skills or behavioral indicators"],
+  "domain_experience": ["industries or domains worked in"],
+  "education": ["degree and field, institution if present"],
+  "notable_achievements": ["quantified or high-impact accomplishments"],
+  "keywords_present": ["strong ATS-relevant keywords found"]
+}}
+
+Return only the JSON object. No explanation."""
+
+
 ANALYSIS_PROMPT = """You are performing a deep diagnostic comparison between a candidate's resume and a job description.
 
 Job Description Intelligence:
@@ -156,3 +179,123 @@ Return a JSON object with this exact structure:
 }}
 
 Return only the JSON object. No explanation."""
+
+
+SUBJECTIVE_SCORING_PROMPT = """Based on the following resume analysis for a job role, generate an alignment score and breakdown.
+
+Skill and keyword coverage have already been measured deterministically; treat these numbers as fixed facts and do not re-score them:
+{objective_scores}
+
+Analysis Data:
+{analysis_data}
+
+Role Profile:
+{role_profile}
+
+Candidate Profile:
+{candidate_profile}
+
+Return a JSON object with this exact structure:
+{{
+  "overall_score": number between 0 and 100, consistent with the fixed coverage numbers above,
+  "score_label": "string — one of: Poor Fit / Below Average / Average / Good Fit / Strong Fit / Excellent Fit",
+  "score_rationale": "string — 1–2 sentence explanation of the score",
+  "dimension_scores": {{
+    "experience_relevance": number between 0 and 100,
+    "achievement_quality": number between 0 and 100,
+    "presentation_quality": number between 0 and 100
+  }},
+  "hiring_recommendation": "string — one of: Not Recommended / Possible with Development / Worth Interviewing / Strong Candidate / Top Priority",
+  "confidence_in_assessment": "High | Medium | Low",
+  "top_3_actions": [
+    "string — most impactful action to improve alignment",
+    "string",
+    "string"
+  ]
+}}
+
+Return only the JSON object. No explanation."""
+
+
+ANALYSIS_AND_SCORING_PROMPT = """You are performing a deep diagnostic comparison between a candidate's resume and a job description, and scoring the candidate's alignment in the same pass.
+
+Job Description Intelligence:
+{jd_data}
+
+Resume Intelligence:
+{resume_data}
+
+Skill and keyword coverage have already been measured deterministically; treat these numbers as fixed facts and do not re-score them:
+{objective_scores}
+
+Perform a rigorous analysis and return a JSON object with this exact structure:
+{{
+  "analysis": {{
+    "strengths": [
+      {{
+        "point": "string — specific strength",
+        "reasoning": "string — why this is a strength relative to the JD",
+        "confidence": "High | Medium | Low"
+      }}
+    ],
+    "weaknesses": [
+      {{
+        "point": "string — specific weakness or gap",
+        "reasoning": "string — why this is a weakness relative to the JD",
+        "confidence": "High | Medium | Low"
+      }}
+    ],
+    "missing_keywords": [
+      {{
+        "keyword": "string",
+        "importance": "Critical | Important | Nice-to-have",
+        "reasoning": "string — why this keyword matters for this role"
+      }}
+    ],
+    "skill_gaps": [
+      {{
+        "skill": "string",
+        "gap_severity": "Critical | Moderate | Minor",
+        "reasoning": "string — explanation of the gap",
+        "suggested_action": "string — concrete step to address this gap"
+      }}
+    ],
+    "section_improvements": [
+      {{
+        "section": "string — resume section name",
+        "issue": "string — what is wrong or missing",
+        "suggestion": "string — specific actionable improvement",
+        "reasoning": "string — why this improvement matters for this role"
+      }}
+    ],
+    "bullet_optimizations": [
+      {{
+        "original_pattern": "string — describes the type of bullet currently present",
+        "improved_pattern": "string — describes how bullets should be rewritten",
+        "example_before": "string — example of a weak bullet (constructed, not copied)",
+        "example_after": "string — improved version",
+        "reasoning": "string — why this makes the resume stronger"
+      }}
+    ],
+    "overall_assessment": "string — 2–3 sentence analytical summary of the candidate's fit"
+  }},
+  "score": {{
+    "overall_score": number between 0 and 100, consistent with your analysis and the fixed coverage numbers above,
+    "score_label": "string — one of: Poor Fit / Below Average / Average / Good Fit / Strong Fit / Excellent Fit",
+    "score_rationale": "string — 1–2 sentence explanation of the score",
+    "dimension_scores": {{
+      "experience_relevance": number between 0 and 100,
+      "achievement_quality": number between 0 and 100,
+      "presentation_quality": number between 0 and 100
+    }},
+    "hiring_recommendation": "string — one of: Not Recommended / Possible with Development / Worth Interviewing / Strong Candidate / Top Priority",
+    "confidence_in_assessment": "High | Medium | Low",
+    "top_3_actions": [
+      "string — most impactful action to improve alignment",
+      "string",
+      "string"
+    ]
+  }}
+}}
+
+Be specific. Be honest. Be analytical. Return only the JSON object."""
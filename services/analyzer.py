@@ -1,24 +1,42 @@
-import json
 from prompts.prompt_templates import SYSTEM_PROMPT, ANALYSIS_PROMPT
-from utils.llm_client import LLMClient
+from utils.llm_client import get_llm_client
+from utils.prompt_builder import PromptBuilder
+from utils.skills import canonical_skill
 
 
 class Analyzer:
   
     def __init__(self):
-        self.llm = LLMClient()
+        self.llm = get_llm_client()
+        self.prompts = PromptBuilder()
 
-    def analyze(self, jd_data: dict, resume_data: dict) -> dict:
+    def analyze(self, jd_data: dict, resume_data: dict, on_field=None, deadline_at: float = None) -> dict:
+        # on_field(path, value), when given, streams the reply and receives each field as it closes;
+        # deadline_at bounds the call (LLMTimeoutError if it cannot finish in time)
 
-        prompt = ANALYSIS_PROMPT.format(
-            jd_data=json.dumps(jd_data, indent=2),
-            resume_data=json.dumps(resume_data, indent=2),
+        prompt = self._prompt(jd_data, resume_data)
+
+        result = self.llm.call(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            on_field=on_field, deadline_at=deadline_at,
         )
+        return self._validate_and_normalize(result, resume_data)
 
-        result = self.llm.call(system_prompt=SYSTEM_PROMPT, user_prompt=prompt)
-        return self._validate_and_normalize(result)
+    async def aanalyze(self, jd_data: dict, resume_data: dict, deadline_at: float = None) -> dict:
+        # Coroutine form of analyze()
+        prompt = self._prompt(jd_data, resume_data)
+        result = await self.llm.acall(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+        return self._validate_and_normalize(result, resume_data)
 
-    def _validate_and_normalize(self, data: dict) -> dict:
+    def _prompt(self, jd_data: dict, resume_data: dict):
+        return self.prompts.build(
+            "analysis", ANALYSIS_PROMPT, data={"jd_data": jd_data, "resume_data": resume_data}
+        )
+
+    def _validate_and_normalize(self, data: dict, resume_data: dict = None) -> dict:
         
         #Ensure all analysis fields are present and properly structured.
         
@@ -44,4 +62,16 @@ class Analyzer:
             if not isinstance(data[field], list):
                 data[field] = []
 
+        # A keyword the resume is known to contain (e.g. found by the keyword scan past the
+        # LLM's truncated view) is not missing
+        if resume_data:
+            present = {
+                canonical_skill(k) for field in ("keywords_present", "technical_skills", "scanned_keywords")
+                for k in (resume_data.get(field) or []) if isinstance(k, str)
+            }
+            data["missing_keywords"] = [
+                item for item in data["missing_keywords"]
+                if not (isinstance(item, dict) and canonical_skill(item.get("keyword")) in present)
+            ]
+
         return data
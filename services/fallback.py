@@ -0,0 +1,171 @@
+"""
+CVAlign Lens — Degraded-Mode Fallbacks
+Locally computed stand-ins for each LLM stage, used when a request's
+deadline leaves no time for the model: skills and keywords found by scanning
+the raw text, an analysis built from the skill and keyword overlap, and the
+LocalScorer's coverage-based score. Every result has the same shape as its
+LLM counterpart and carries "degraded": True.
+"""
+
+import re
+
+from services.local_scorer import EXPECTED_SECTIONS, LocalScorer
+from utils.resume_sections import HEADER_SECTION, SECTION_TITLES, segment_resume
+from utils.keyword_scanner import KeywordScanner
+from utils.skills import SKILL_ALIASES, canonical_skill
+from utils.text_processing import clean_text
+
+
+DEGRADED_NOTICE = "Quick estimate computed locally: the full analysis could not finish in time."
+
+_YEARS = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*(?:[-*]|\d+[.)])\s+")
+_HAS_NUMBER = re.compile(r"\d")
+
+# Every skill with known aliases, for postings and resumes the LLM never read
+_KNOWN_SKILLS = KeywordScanner(list(SKILL_ALIASES), skip_ambiguous=True)
+
+
+class LocalFallback:
+    """
+    Heuristic JD, resume, analysis, and score payloads computed without any
+    LLM call. They are shallow by design: enough to return a useful,
+    clearly flagged answer instead of an error when time runs out.
+    """
+
+    def __init__(self, local: LocalScorer = None):
+        self.local = local or LocalScorer()
+
+    def jd(self, raw_jd: str) -> dict:
+        """JD data with the known skills mentioned in the posting as its skills and ATS keywords."""
+        text = clean_text(raw_jd)
+        skills = list(_KNOWN_SKILLS.scan(text))
+        first_line = text.split("\n", 1)[0].strip()
+        return {
+            "role_title": first_line if 0 < len(first_line.split()) <= 8 else "Unknown Role",
+            "seniority_level": "Unknown",
+            "core_technical_skills": skills,
+            "soft_skills": [],
+            "domain_knowledge": [],
+            "key_responsibilities": [],
+            "must_have_requirements": [],
+            "nice_to_have_requirements": [],
+            "keywords_for_ats": list(skills),
+            "degraded": True,
+        }
+
+    def resume(self, raw_resume: str, jd_data: dict) -> dict:
+        """
+        Resume data from a scan of the raw text for the JD's skills and
+        keywords and for known skills, with sections from the segmenter.
+        """
+        text = clean_text(raw_resume)
+        found = {canonical_skill(term) for term in KeywordScanner.for_jd(jd_data).scan(text)}
+        technical = _found(_as_list(jd_data.get("core_technical_skills")), found)
+        listed = {canonical_skill(skill) for skill in technical}
+        technical += [skill for skill in _KNOWN_SKILLS.scan(text) if canonical_skill(skill) not in listed]
+
+        sections = [section.name for section in segment_resume(text) if section.name != HEADER_SECTION]
+        years = _YEARS.search(text)
+        achievements = [
+            _BULLET.sub("", line).strip() for line in text.split("\n")
+            if _BULLET.match(line) and _HAS_NUMBER.search(line)
+        ]
+        return {
+            "candidate_name": None,
+            "inferred_title": "Unknown",
+            "years_of_experience": f"{years.group(1)} years" if years else "Unknown",
+            "technical_skills": technical,
+            "soft_skills": [],
+            "domain_experience": [],
+            "education": [],
+            "notable_achievements": achievements[:10],
+            "resume_sections_present": [SECTION_TITLES[name] for name in sections],
+            "missing_sections": [SECTION_TITLES[name] for name in EXPECTED_SECTIONS if name not in sections],
+            "keywords_present": _found(_as_list(jd_data.get("keywords_for_ats")), found),
+            "degraded": True,
+        }
+
+    def analysis(self, jd_data: dict, resume_data: dict) -> dict:
+        """An analysis listing matched skills as strengths and missing skills and keywords as gaps."""
+        overlap = self.local.objective_scores(jd_data, resume_data)["skill_match"]
+        technical, keywords = overlap["technical_skills"], overlap["keywords"]
+        missing_keywords = [k for k in keywords["missing"] if k not in technical["missing"]]
+        required = len(technical["matched"]) + len(technical["partial"]) + len(technical["missing"])
+
+        coverage = (
+            f"The resume shows {len(technical['matched'])} of {required} core technical skills"
+            if required else "The job description lists no recognizable technical skills"
+        )
+        return {
+            "strengths": [
+                {
+                    "point": f"Lists {skill}",
+                    "reasoning": "Required by the job description and present in the resume.",
+                    "confidence": "Medium",
+                }
+                for skill in technical["matched"][:5]
+            ],
+            "weaknesses": [
+                {
+                    "point": f"No evidence of {skill}",
+                    "reasoning": "Required by the job description but not found in the resume.",
+                    "confidence": "Medium",
+                }
+                for skill in technical["missing"][:5]
+            ],
+            "missing_keywords": [
+                {
+                    "keyword": keyword,
+                    "importance": "Important",
+                    "reasoning": "An ATS keyword from the job description that the resume does not contain.",
+                }
+                for keyword in missing_keywords[:10]
+            ],
+            "skill_gaps": [
+                {
+                    "skill": skill,
+                    "gap_severity": "Moderate",
+                    "reasoning": "Required by the job description but not found in the resume.",
+                    "suggested_action": f"Add concrete experience with {skill} if you have it.",
+                }
+                for skill in technical["missing"][:5]
+            ],
+            "section_improvements": [
+                {
+                    "section": section,
+                    "issue": "Section not found.",
+                    "suggestion": f"Add a {section} section.",
+                    "reasoning": "Recruiters and ATS parsers expect it.",
+                }
+                for section in _as_list(resume_data.get("missing_sections"))
+            ],
+            "bullet_optimizations": [],
+            "overall_assessment": f"{DEGRADED_NOTICE} {coverage}.",
+            "degraded": True,
+        }
+
+    def score(self, analysis: dict, jd_data: dict, resume_data: dict) -> dict:
+        """The LocalScorer's fast score, marked as a low-confidence estimate."""
+        result = self.local.fast_score(analysis, jd_data, resume_data)
+        result["score_rationale"] = f"{DEGRADED_NOTICE} {result['score_rationale']}"
+        result["confidence_in_assessment"] = "Low"
+        result["scoring_mode"] = "fast"
+        result["degraded"] = True
+        return result
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else []
+
+
+def _found(terms: list, found: set) -> list:
+    # The terms (original spellings, first of each canonical form) whose canonical form the scan found
+    seen = set()
+    kept = []
+    for term in terms:
+        canonical = canonical_skill(term) if isinstance(term, str) else ""
+        if canonical in found and canonical not in seen:
+            seen.add(canonical)
+            kept.append(term)
+    return kept
@@ -0,0 +1,72 @@
+"""
+CVAlign Lens — Fused Analyzer Service
+Produces the analysis and the score in a single LLM round trip, instead of
+feeding the analysis back into a second scoring call.
+"""
+
+from prompts.prompt_templates import SYSTEM_PROMPT, ANALYSIS_AND_SCORING_PROMPT
+from utils.prompt_builder import PromptBuilder
+
+
+class FusedAnalyzer:
+    """
+    Single-pass analyze+score. Output still goes through Analyzer and Scorer
+    validation, so it is interchangeable with the two-call pipeline. Skill and
+    keyword coverage are computed locally, as in the Scorer's hybrid mode.
+    """
+
+    def __init__(self, analyzer, scorer):
+        self.analyzer = analyzer
+        self.scorer = scorer
+        self.llm = analyzer.llm
+        self.prompts = PromptBuilder()
+
+    def analyze_and_score(self, jd_data: dict, resume_data: dict, on_field=None, deadline_at: float = None) -> tuple:
+        """
+        Analyze and score a resume against a JD in one call.
+
+        Args:
+            jd_data: Parsed job description.
+            resume_data: Parsed resume.
+            on_field: Optional callback(path, value); the reply is streamed and
+                each field of its analysis and score objects is reported as
+                it closes, e.g. (("analysis", "strengths"), [...]).
+            deadline_at: Optional time.monotonic() the request must finish by.
+
+        Returns:
+            tuple: (analysis, score_data), each validated like the standalone stages.
+        """
+        objective, prompt = self._prepare(jd_data, resume_data)
+        result = self.llm.call(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            on_field=on_field, field_depth=2, deadline_at=deadline_at,
+        )
+        return self._split(result, objective, resume_data)
+
+    async def aanalyze_and_score(self, jd_data: dict, resume_data: dict, deadline_at: float = None) -> tuple:
+        """Coroutine form of analyze_and_score()."""
+        objective, prompt = self._prepare(jd_data, resume_data)
+        result = await self.llm.acall(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+        return self._split(result, objective, resume_data)
+
+    def _prepare(self, jd_data: dict, resume_data: dict) -> tuple:
+        objective = self.scorer.local.objective_scores(jd_data, resume_data)
+        prompt = self.prompts.build("analysis_and_scoring", ANALYSIS_AND_SCORING_PROMPT, data={
+            "jd_data": jd_data,
+            "resume_data": resume_data,
+            "objective_scores": objective["dimension_scores"],
+        })
+        return objective, prompt
+
+    def _split(self, result: dict, objective: dict, resume_data: dict) -> tuple:
+        # Validate the combined reply as the standalone Analyzer and Scorer would
+        analysis = result.get("analysis")
+        score_data = result.get("score")
+        analysis = self.analyzer._validate_and_normalize(analysis if isinstance(analysis, dict) else {}, resume_data)
+        score_data = self.scorer.merge_objective(score_data if isinstance(score_data, dict) else {}, objective)
+        score_data = self.scorer._validate_and_normalize(score_data)
+        score_data["scoring_mode"] = "hybrid"
+        return analysis, score_data
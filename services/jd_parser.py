@@ -3,10 +3,15 @@ CVAlign Lens — Job Description Parser Service
 Extracts structured intelligence from raw job description text.
 """
 
-import json
 from prompts.prompt_templates import SYSTEM_PROMPT, JD_EXTRACTION_PROMPT
-from utils.text_processing import clean_text, truncate_text, is_meaningful_text
-from utils.llm_client import LLMClient
+from utils.text_processing import clean_text, is_meaningful_text
+from utils.llm_client import get_llm_client
+from utils.prompt_builder import PromptBuilder
+from utils.cache import TieredCache, fingerprint
+
+
+# Changes whenever the extraction prompt changes, invalidating cached parses.
+JD_PROMPT_VERSION = fingerprint(SYSTEM_PROMPT, JD_EXTRACTION_PROMPT)[:12]
 
 
 class JDParser:
@@ -14,24 +19,44 @@ class JDParser:
     Parses a raw job description into structured data for downstream analysis.
     """
 
-    def __init__(self):
-        self.llm = LLMClient()
+    def __init__(self, cache: TieredCache = None):
+        self.llm = get_llm_client()
+        self.prompts = PromptBuilder()
+        self.cache = cache if cache is not None else TieredCache.from_env(
+            "jd_parse", prefix="JD_CACHE", max_entries=512, ttl=24 * 3600
+        )
 
-    def parse(self, raw_jd: str) -> dict:
+    def parse(self, raw_jd: str, deadline_at: float = None) -> dict:
         """
         Parse a job description and return structured JD intelligence.
+        Results are cached by content hash, model, and prompt version, and
+        concurrent requests for the same uncached JD share one LLM call.
 
         Args:
             raw_jd: Raw job description text.
+            deadline_at: Optional time.monotonic() the request must finish by
+                (see LLMClient.call).
 
         Returns:
             dict: Structured JD data.
 
         Raises:
             ValueError: If the input is insufficient for meaningful parsing.
+            LLMTimeoutError: If the extraction cannot finish before deadline_at.
         """
+        prompt, key = self._prepare(raw_jd)
+        return self.cache.get_or_compute(key, lambda: self._extract(prompt, deadline_at))
+
+    async def aparse(self, raw_jd: str, deadline_at: float = None) -> dict:
+        """Coroutine form of parse(), sharing its cache."""
+        prompt, key = self._prepare(raw_jd)
+        return await self.cache.aget_or_compute(key, lambda: self._aextract(prompt, deadline_at))
+
+    def _prepare(self, raw_jd: str) -> tuple:
+        # Build the extraction prompt and its cache key, rejecting unusable input
         cleaned = clean_text(raw_jd)
-        truncated = truncate_text(cleaned, max_chars=6000)
+        prompt = self.prompts.build("jd_extraction", JD_EXTRACTION_PROMPT, texts={"job_description": cleaned})
+        truncated = prompt.values["job_description"]
 
         if not is_meaningful_text(truncated, min_words=20):
             raise ValueError(
@@ -39,9 +64,21 @@ class JDParser:
                 "Please provide a complete job description."
             )
 
-        prompt = JD_EXTRACTION_PROMPT.format(job_description=truncated)
-        result = self.llm.call(system_prompt=SYSTEM_PROMPT, user_prompt=prompt)
+        return prompt, fingerprint(truncated, self.llm.model, JD_PROMPT_VERSION)
+
+    def _extract(self, prompt, deadline_at: float = None) -> dict:
+        result = self.llm.call(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+
+        return self._validate_and_normalize(result)
 
+    async def _aextract(self, prompt, deadline_at: float = None) -> dict:
+        result = await self.llm.acall(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
         return self._validate_and_normalize(result)
 
     def _validate_and_normalize(self, data: dict) -> dict:
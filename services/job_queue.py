@@ -0,0 +1,264 @@
+"""
+CVAlign Lens — Job Queue Service
+Runs analysis pipelines in a local worker pool so clients can submit a job,
+get an id back immediately, and poll for progress and results.
+"""
+
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+
+from utils.cache import fingerprint
+from utils.job_store import JobStore
+from utils.llm_client import LLMRateLimitError, LLMTimeoutError
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between each process's sweeps for orphaned jobs, jobs queued by other processes, and expired jobs
+SWEEP_INTERVAL = 30
+
+# Delay before retrying a job the provider rate-limited or timed out, doubled per attempt up to the cap
+RETRY_DELAY = 30
+RETRY_MAX_DELAY = 600
+
+
+class JobQueue:
+    """
+    Thread-based worker pool in front of AnalysisPipeline, backed by a
+    persistent JobStore. Every process runs its own workers; jobs are claimed
+    atomically in the store so a job never runs twice concurrently, and each
+    claim records the claiming process (worker_id()). The workers periodically
+    requeue running jobs whose process is gone, or, when that cannot be told
+    (another host), that have not been updated for stale_after seconds. An
+    orphaned job is retried at most max_attempts times, as is one the LLM
+    provider rate-limited or timed out (after a growing delay), and finished
+    jobs are deleted once they are older than retention seconds.
+    """
+
+    def __init__(self, pipeline, store: JobStore, workers: int = 2, stale_after: float = 600,
+                 max_attempts: int = 3, retention: float = 7 * 24 * 3600):
+        self.pipeline = pipeline
+        self.store = store
+        self.workers = workers
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._worker = None
+        self._started_pid = None
+        self._start_lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        self._next_prune = 0.0
+
+    @classmethod
+    def from_env(cls, pipeline):
+        """
+        Build a queue configured by JOB_DB_PATH, JOB_WORKERS, JOB_STALE_SECONDS,
+        JOB_MAX_ATTEMPTS and JOB_RETENTION_SECONDS.
+        """
+        store = JobStore(os.getenv("JOB_DB_PATH", "jobs.db"))
+        return cls(
+            pipeline,
+            store,
+            workers=int(os.getenv("JOB_WORKERS", 2)),
+            stale_after=float(os.getenv("JOB_STALE_SECONDS", 600)),
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", 3)),
+            retention=float(os.getenv("JOB_RETENTION_SECONDS", 7 * 24 * 3600)),
+        )
+
+    def ensure_started(self) -> None:
+        """
+        Start the worker threads in this process if they are not running yet,
+        and pick up jobs left queued (or orphaned) by a previous run. Safe to
+        call on every request; a forked child starts its own workers.
+        """
+        if self._started_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._started_pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pending = set()
+            self._worker = worker_id()
+            for i in range(self.workers):
+                threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True).start()
+            self._started_pid = os.getpid()
+        self._sweep(force=True)
+
+    def submit(self, jd_text: str, resume_text: str, idempotency_key: str = None, scoring_mode: str = None,
+               pipeline_mode: str = None) -> tuple:
+        """
+        Queue an analysis job, run with the given scoring and pipeline mode
+        overrides (None for the server defaults).
+
+        Returns:
+            tuple: (job dict, created) where created is False when an existing
+            job was reused for the same idempotency key.
+
+        Raises:
+            IdempotencyConflict: If the key was already used for different inputs.
+        """
+        self.ensure_started()
+        self._prune()
+        # Mode overrides are part of the inputs; without any, the hash stays what it was before modes were accepted
+        modes = (scoring_mode, pipeline_mode) if scoring_mode or pipeline_mode else ()
+        input_hash = fingerprint(jd_text, resume_text, *modes)
+        job, created = self.store.create(
+            jd_text, resume_text, input_hash, idempotency_key, scoring_mode=scoring_mode, pipeline_mode=pipeline_mode
+        )
+        if created:
+            self._enqueue(job["job_id"])
+        return job, created
+
+    def get(self, job_id: str) -> dict:
+        return self.store.get(job_id)
+
+    def _sweep(self, force: bool = False) -> None:
+        # At most every SWEEP_INTERVAL: requeue orphaned jobs, prune, and pick up jobs queued by other processes
+        with self._sweep_lock:
+            if not force and time.monotonic() < self._next_sweep:
+                return
+            self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+        cutoff = time.time() - self.stale_after
+        orphaned = []
+        for job_id, worker, updated_at in self.store.running():
+            alive = _worker_alive(worker)
+            if alive is False or (alive is None and updated_at < cutoff):
+                orphaned.append((job_id, worker))
+        if orphaned:
+            requeued, failed = self.store.requeue(orphaned, self.max_attempts)
+            if requeued:
+                logger.warning(f"Requeued {requeued} orphaned analysis job(s)")
+            if failed:
+                logger.error(f"Failed {failed} orphaned analysis job(s) after {self.max_attempts} attempts")
+        self._prune()
+        for job_id in self.store.queued_ids():
+            self._enqueue(job_id)
+
+    def _enqueue(self, job_id: str) -> None:
+        # Each job at most once in this process's queue; a duplicate across processes loses the claim
+        with self._pending_lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+        self._queue.put(job_id)
+
+    def _prune(self) -> None:
+        # Delete expired finished jobs, at most once a minute per process; retention 0 keeps them forever
+        if self.retention <= 0 or time.monotonic() < self._next_prune:
+            return
+        self._next_prune = time.monotonic() + 60
+        pruned = self.store.prune(self.retention)
+        if pruned:
+            logger.info(f"Pruned {pruned} analysis job(s) older than {self.retention:g}s")
+
+    def _work(self) -> None:
+        while True:
+            try:
+                job_id = self._queue.get(timeout=SWEEP_INTERVAL)
+            except queue.Empty:
+                job_id = None
+            if job_id is not None:
+                with self._pending_lock:
+                    self._pending.discard(job_id)
+                try:
+                    self._run(job_id)
+                except Exception as e:
+                    logger.error(f"Job worker crashed on {job_id}: {e}", exc_info=True)
+                finally:
+                    self._queue.task_done()
+            try:
+                self._sweep()
+            except Exception as e:
+                logger.error(f"Job sweep failed: {e}", exc_info=True)
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.claim(job_id, self._worker)
+        if job is None:
+            return
+
+        try:
+            result = self.pipeline.run(
+                job["jd_text"], job["resume_text"],
+                on_stage=lambda stage, payload: self.store.record_stage(job_id, stage),
+                scoring_mode=job["scoring_mode"], pipeline_mode=job["pipeline_mode"],
+            )
+        except ValueError as ve:
+            self.store.fail(job_id, str(ve), 422)
+        except LLMRateLimitError as rl:
+            self._retry_or_fail(
+                job, rl.retry_after, "The analysis service is busy. Please try again shortly.", 503
+            )
+        except LLMTimeoutError:
+            self._retry_or_fail(job, None, "The analysis took too long to complete. Please try again.", 504)
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {e}", exc_info=True)
+            self.store.fail(
+                job_id, "Analysis failed. Please verify your API key and inputs, then try again.", 500
+            )
+        else:
+            self.store.complete(job_id, result)
+
+    def _retry_or_fail(self, job: dict, retry_after: float, error: str, error_status: int) -> None:
+        # A provider limit or timeout is transient: run the job again later, until it is out of attempts
+        if self.max_attempts and job["attempts"] >= self.max_attempts:
+            logger.error(f"Analysis job {job['job_id']} failed after {job['attempts']} attempts: {error}")
+            self.store.fail(job["job_id"], error, error_status)
+            return
+        delay = max(retry_after or 0, min(RETRY_MAX_DELAY, RETRY_DELAY * 2 ** (job["attempts"] - 1)))
+        logger.warning(f"Analysis job {job['job_id']} will be retried in {delay:g}s: {error}")
+        self.store.defer(job["job_id"], delay)
+
+
+def worker_id() -> str:
+    """
+    Identity of this process, recorded on the jobs it claims: host, boot id,
+    pid, and the process start time, so a reused pid is not mistaken for it.
+    """
+    pid = os.getpid()
+    return f"{socket.gethostname()}/{_boot_id()}/{pid}/{_start_time(pid)}"
+
+
+def _worker_alive(worker: str):
+    # True or False for a worker on this host; None when it cannot be told (another host, no /proc).
+    # A job without a worker was claimed by a version that predates them, i.e. before the last restart.
+    try:
+        host, boot, pid, started = worker.split("/")
+        pid = int(pid)
+    except (AttributeError, ValueError):
+        return False
+    if host != socket.gethostname():
+        return None
+    if boot and started:
+        return boot == _boot_id() and started == _start_time(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return None
+
+
+def _boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _start_time(pid: int) -> str:
+    # Field 22 of /proc/<pid>/stat, in clock ticks since boot; the fields after the command name start at field 3
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return ""
@@ -0,0 +1,151 @@
+"""
+CVAlign Lens — Local Scoring Engine
+Computes the objective score dimensions (technical skills match and keyword
+coverage) deterministically from parsed JD and resume data, and can produce
+a complete heuristic score without any LLM call.
+"""
+
+import re
+
+from utils.skills import skill_overlap
+
+
+DIMENSION_WEIGHTS = {
+    "technical_skills_match": 0.30,
+    "experience_relevance": 0.25,
+    "keyword_coverage": 0.20,
+    "achievement_quality": 0.15,
+    "presentation_quality": 0.10,
+}
+
+# (minimum score, label, hiring recommendation), highest first
+SCORE_BANDS = [
+    (85, "Excellent Fit", "Top Priority"),
+    (72, "Strong Fit", "Strong Candidate"),
+    (60, "Good Fit", "Worth Interviewing"),
+    (45, "Average", "Possible with Development"),
+    (30, "Below Average", "Not Recommended"),
+    (0, "Poor Fit", "Not Recommended"),
+]
+
+EXPECTED_SECTIONS = ("summary", "experience", "education", "skills")
+
+_HAS_NUMBER = re.compile(r"\d")
+
+
+class LocalScorer:
+    """
+    Deterministic scoring from structured JD and resume data. The same inputs
+    always produce the same scores.
+    """
+
+    def objective_scores(self, jd_data: dict, resume_data: dict) -> dict:
+        """
+        Compute the set-overlap dimensions.
+
+        Returns:
+            dict: {"dimension_scores": {technical_skills_match, keyword_coverage},
+                   "skill_match": {"technical_skills": overlap, "keywords": overlap}}
+        """
+        candidate_skills = _as_list(resume_data.get("technical_skills"))
+        candidate_keywords = (
+            _as_list(resume_data.get("keywords_present")) + _as_list(resume_data.get("scanned_keywords"))
+            + candidate_skills
+        )
+
+        technical = skill_overlap(_as_list(jd_data.get("core_technical_skills")), candidate_skills + candidate_keywords)
+        keywords = skill_overlap(_as_list(jd_data.get("keywords_for_ats")), candidate_keywords)
+
+        return {
+            "dimension_scores": {
+                # Nothing required means nothing missing
+                "technical_skills_match": technical["score"] if technical["score"] is not None else 100,
+                "keyword_coverage": keywords["score"] if keywords["score"] is not None else 100,
+            },
+            "skill_match": {"technical_skills": technical, "keywords": keywords},
+        }
+
+    def fast_score(self, analysis: dict, jd_data: dict, resume_data: dict) -> dict:
+        """
+        Produce a complete score without an LLM call, using heuristics for the
+        subjective dimensions. Output matches the Scorer schema.
+        """
+        objective = self.objective_scores(jd_data, resume_data)
+        dims = dict(objective["dimension_scores"])
+        dims["experience_relevance"] = self._experience_relevance(analysis, jd_data, resume_data)
+        dims["achievement_quality"] = self._achievement_quality(resume_data)
+        dims["presentation_quality"] = self._presentation_quality(resume_data)
+
+        overall = self.weighted_overall(dims)
+        label, recommendation = self.band(overall)
+        technical = objective["skill_match"]["technical_skills"]
+        keywords = objective["skill_match"]["keywords"]
+
+        return {
+            "overall_score": overall,
+            "score_label": label,
+            "score_rationale": (
+                f"Matches {len(technical['matched'])} of "
+                f"{len(technical['matched']) + len(technical['partial']) + len(technical['missing'])} core "
+                f"technical skills and covers {dims['keyword_coverage']}% of ATS keywords."
+            ),
+            "dimension_scores": {key: dims[key] for key in DIMENSION_WEIGHTS},
+            "hiring_recommendation": recommendation,
+            "confidence_in_assessment": "Medium" if technical["score"] is not None else "Low",
+            "top_3_actions": self._top_actions(analysis, technical, keywords),
+            "skill_match": objective["skill_match"],
+        }
+
+    def weighted_overall(self, dimension_scores: dict) -> int:
+        total = sum(DIMENSION_WEIGHTS[key] * dimension_scores.get(key, 0) for key in DIMENSION_WEIGHTS)
+        return max(0, min(100, round(total)))
+
+    def band(self, overall: int) -> tuple:
+        for minimum, label, recommendation in SCORE_BANDS:
+            if overall >= minimum:
+                return label, recommendation
+        return SCORE_BANDS[-1][1:]
+
+    def _experience_relevance(self, analysis: dict, jd_data: dict, resume_data: dict) -> int:
+        domain = skill_overlap(_as_list(jd_data.get("domain_knowledge")), _as_list(resume_data.get("domain_experience")))
+        strengths = len(_as_list(analysis.get("strengths")))
+        weaknesses = len(_as_list(analysis.get("weaknesses")))
+        balance = strengths / (strengths + weaknesses) if strengths + weaknesses else 0.5
+        domain_score = domain["score"] / 100 if domain["score"] is not None else 0.5
+        return round(100 * (0.6 * balance + 0.4 * domain_score))
+
+    def _achievement_quality(self, resume_data: dict) -> int:
+        achievements = [a for a in _as_list(resume_data.get("notable_achievements")) if isinstance(a, str)]
+        if not achievements:
+            return 20
+        quantified = sum(1 for a in achievements if _HAS_NUMBER.search(a))
+        return min(100, 40 + 12 * quantified + 4 * (len(achievements) - quantified))
+
+    def _presentation_quality(self, resume_data: dict) -> int:
+        present = " ".join(str(s) for s in _as_list(resume_data.get("resume_sections_present"))).lower()
+        found = sum(1 for section in EXPECTED_SECTIONS if section in present)
+        missing = len(_as_list(resume_data.get("missing_sections")))
+        return max(0, min(100, 40 + 15 * found - 5 * missing))
+
+    def _top_actions(self, analysis: dict, technical: dict, keywords: dict) -> list:
+        actions = []
+        if technical["missing"]:
+            actions.append(
+                f"Demonstrate experience with {', '.join(technical['missing'][:3])} if you have it, "
+                "or close the gap with a focused project."
+            )
+        missing_keywords = [k for k in keywords["missing"] if k not in technical["missing"]]
+        if missing_keywords:
+            actions.append(f"Work the keywords {', '.join(missing_keywords[:3])} into relevant bullets where truthful.")
+        for item in _as_list(analysis.get("section_improvements")):
+            if len(actions) >= 3:
+                break
+            if isinstance(item, dict) and item.get("suggestion"):
+                actions.append(str(item["suggestion"]))
+        if len(actions) < 3:
+            actions.append("Quantify the impact of each experience bullet with concrete metrics.")
+        return actions[:3]
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else []
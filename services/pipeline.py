@@ -0,0 +1,728 @@
+"""
+CVAlign Lens — Analysis Pipeline
+Orchestrates JD parsing, resume parsing, analysis, and scoring, for a single
+request or fanned out as one JD against many resumes (and vice versa). Every
+entry point has a coroutine form (arun, arun_batch, ...) for the async
+serving path.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from prompts import prompt_templates
+from prompts.prompt_templates import (
+    SYSTEM_PROMPT,
+    ANALYSIS_PROMPT,
+    SCORING_PROMPT,
+    SUBJECTIVE_SCORING_PROMPT,
+    ANALYSIS_AND_SCORING_PROMPT,
+)
+from services.fallback import LocalFallback
+from services.fused_analyzer import FusedAnalyzer
+from utils.cache import TieredCache, fingerprint
+from utils.concurrency import ContextThreadPoolExecutor, get_executor
+from utils.keyword_scanner import KeywordScanner
+from utils.llm_client import LLMRateLimitError, LLMTimeoutError
+from utils.metrics import DEGRADED_RESULTS
+from utils.text_processing import clean_text
+from utils.timing import StageTimings
+
+
+logger = logging.getLogger(__name__)
+
+GENERIC_ITEM_ERROR = "Analysis failed for this item."
+
+# LLM failures meaning a stage cannot finish before the request's deadline
+OUT_OF_TIME_ERRORS = (LLMTimeoutError, LLMRateLimitError)
+
+# Response fields whose payload may come from the local fallback
+_DEGRADABLE_FIELDS = ("jd_summary", "resume_summary", "analysis", "score")
+
+# standard: separate analysis and scoring calls; fused: one combined call
+PIPELINE_MODES = ("standard", "fused")
+
+# Changes whenever an analysis or scoring prompt changes, invalidating reused results.
+ANALYSIS_PROMPT_VERSION = fingerprint(
+    SYSTEM_PROMPT, ANALYSIS_PROMPT, SCORING_PROMPT, SUBJECTIVE_SCORING_PROMPT, ANALYSIS_AND_SCORING_PROMPT
+)[:12]
+
+# Covers every prompt, extraction included, for reuse of complete responses.
+RESULT_PROMPT_VERSION = fingerprint(
+    *[value for name, value in sorted(vars(prompt_templates).items()) if name.endswith("_PROMPT")]
+)[:12]
+
+
+class _ItemTimedOut(Exception):
+    """A batch item ran past item_timeout on the async path."""
+
+
+class AnalysisPipeline:
+    """
+    Runs the four pipeline stages, parsing the JD and the resume concurrently
+    since neither depends on the other. In fused mode, analysis and scoring
+    share a single LLM call. When the structured JD and resume data match an
+    earlier run, the previous analysis and score are reused. Given a
+    deadline, a stage that cannot finish in time is answered by LocalFallback.
+    The whole resume is scanned for the JD's keywords (KeywordScanner), since
+    the resume parse only sees a truncated copy.
+    """
+
+    def __init__(self, jd_parser, resume_parser, analyzer, scorer, file_handler=None, executor=None,
+                 results: TieredCache = None):
+        self.jd_parser = jd_parser
+        self.resume_parser = resume_parser
+        self.analyzer = analyzer
+        self.scorer = scorer
+        self.fused = FusedAnalyzer(analyzer, scorer)
+        self.fallback = LocalFallback(scorer.local)
+        self.file_handler = file_handler
+        self.executor = executor
+        self.mode = os.getenv("PIPELINE_MODE", "standard").strip().lower()
+        self.results = results if results is not None else TieredCache.from_env(
+            "analysis", prefix="ANALYSIS_CACHE", max_entries=1024, ttl=3600
+        )
+
+    def result_key(self, jd_text: str, resume_text: str, scoring_mode: str = None,
+                   pipeline_mode: str = None) -> str:
+        """
+        Cache key for the complete result of run(): hashes of the normalized
+        JD and resume text, the resolved modes, the model, and the prompt
+        versions. Whitespace-only edits map to the same key.
+        """
+        return fingerprint(
+            clean_text(jd_text),
+            clean_text(resume_text),
+            pipeline_mode or self.mode,
+            (scoring_mode or self.scorer.mode).lower(),
+            getattr(self.resume_parser, "mode", None),
+            self.analyzer.llm.model,
+            RESULT_PROMPT_VERSION,
+        )
+
+    def parse_inputs(self, jd_text: str, resume_text: str, timings: StageTimings = None, on_stage=None,
+                     deadline_at: float = None) -> tuple:
+        """
+        Parse the job description and resume in parallel.
+
+        Args:
+            jd_text: Raw job description text.
+            resume_text: Raw resume text.
+            timings: Optional collector for per-stage timings.
+            on_stage: Optional callback(stage_name, payload), invoked from the
+                worker thread as soon as each parse finishes.
+            deadline_at: Optional time.monotonic() to finish by; a parse that
+                cannot is replaced by its LocalFallback result.
+
+        Returns:
+            tuple: (jd_data, resume_data)
+
+        Raises:
+            ValueError: If either input is insufficient; the JD error wins if both fail.
+        """
+        timings = timings or StageTimings()
+        executor = self.executor or get_executor()
+
+        def timed(name, event, fn, text):
+            with timings.stage(name):
+                result = self._within_deadline(name, deadline_at, lambda: fn(text, deadline_at=deadline_at))
+            if on_stage and result is not None:
+                on_stage(event, result)
+            return result
+
+        jd_future = executor.submit(timed, "jd_parse", "jd_summary", self.jd_parser.parse, jd_text)
+        resume_future = executor.submit(
+            timed, "resume_parse", "resume_summary", self.resume_parser.parse, resume_text
+        )
+        try:
+            jd_data = jd_future.result()
+        except Exception:
+            resume_future.cancel()
+            raise
+        return self._fill_parse_fallbacks(jd_text, resume_text, jd_data, resume_future.result(), on_stage)
+
+    def run(self, jd_text: str, resume_text: str, on_stage=None, scoring_mode: str = None,
+            pipeline_mode: str = None, on_field=None, deadline_at: float = None) -> dict:
+        """
+        Run the full pipeline and return the response payload.
+
+        Args:
+            jd_text: Raw job description text.
+            resume_text: Raw resume text.
+            on_stage: Optional callback(stage_name, payload) invoked as each of
+                jd_summary, resume_summary, analysis, and score becomes ready.
+            scoring_mode: Optional Scorer mode override (llm, hybrid, fast).
+            pipeline_mode: Optional override of PIPELINE_MODE (standard, fused).
+            on_field: Optional callback(stage, field, value). The analysis and
+                scoring replies are then streamed, and each top-level field
+                (e.g. analysis/strengths, score/overall_score) is reported,
+                unvalidated, as soon as it closes. The time to the first one
+                is recorded as the first_field timing.
+            deadline_at: Optional time.monotonic() the run must finish by.
+                Every LLM call is bounded by it, and a stage that cannot
+                finish in time (or is refused by the rate limiter) is answered
+                by LocalFallback: its payload carries "degraded": true and the
+                response lists it under "degraded". Without a deadline, LLM
+                errors propagate as before.
+
+        Returns:
+            dict: jd_summary, resume_summary, analysis, score, keyword_matches
+            (see _scan_keywords; also reported to on_stage once the inputs
+            are parsed), and per-stage timings in ms; plus degraded, when any
+            stage fell back.
+        """
+        timings = StageTimings()
+        if on_field is not None:
+            on_field = self._timed_fields(on_field, timings)
+        with timings.stage("total"):
+            with timings.stage("parse_inputs"):
+                jd_data, resume_data = self.parse_inputs(jd_text, resume_text, timings, on_stage, deadline_at)
+            resume_data, keyword_matches = self._scan_keywords(
+                KeywordScanner.for_jd(jd_data), resume_text, resume_data, timings, on_stage
+            )
+            result = self._analyze_and_score(
+                jd_data, resume_data, timings, on_stage, scoring_mode, pipeline_mode, on_field, deadline_at
+            )
+
+        return self._flag_degraded({
+            "jd_summary": jd_data, **result, "keyword_matches": keyword_matches, "timings": timings.as_dict()
+        })
+
+    async def aparse_inputs(self, jd_text: str, resume_text: str, timings: StageTimings = None,
+                            on_stage=None, deadline_at: float = None) -> tuple:
+        """Coroutine form of parse_inputs(): both parses run as concurrent tasks on the event loop."""
+        timings = timings or StageTimings()
+
+        async def timed(name, event, parse, text):
+            with timings.stage(name):
+                result = await self._awithin_deadline(name, deadline_at, lambda: parse(text, deadline_at=deadline_at))
+            if on_stage and result is not None:
+                on_stage(event, result)
+            return result
+
+        jd_task = asyncio.ensure_future(timed("jd_parse", "jd_summary", self.jd_parser.aparse, jd_text))
+        resume_task = asyncio.ensure_future(
+            timed("resume_parse", "resume_summary", self.resume_parser.aparse, resume_text)
+        )
+        try:
+            jd_data = await jd_task
+        except BaseException:
+            resume_task.cancel()
+            raise
+        return self._fill_parse_fallbacks(jd_text, resume_text, jd_data, await resume_task, on_stage)
+
+    async def arun(self, jd_text: str, resume_text: str, on_stage=None, scoring_mode: str = None,
+                   pipeline_mode: str = None, deadline_at: float = None) -> dict:
+        """Coroutine form of run(), for the async serving path."""
+        timings = StageTimings()
+        with timings.stage("total"):
+            with timings.stage("parse_inputs"):
+                jd_data, resume_data = await self.aparse_inputs(jd_text, resume_text, timings, on_stage, deadline_at)
+            resume_data, keyword_matches = self._scan_keywords(
+                KeywordScanner.for_jd(jd_data), resume_text, resume_data, timings, on_stage
+            )
+            result = await self._aanalyze_and_score(
+                jd_data, resume_data, timings, on_stage, scoring_mode, pipeline_mode, deadline_at
+            )
+
+        return self._flag_degraded({
+            "jd_summary": jd_data, **result, "keyword_matches": keyword_matches, "timings": timings.as_dict()
+        })
+
+    def run_for_resume(self, jd_data: dict, resume: dict, scoring_mode: str = None,
+                       pipeline_mode: str = None, scanner: KeywordScanner = None) -> dict:
+        """
+        Run resume extraction, analysis, and scoring against an already-parsed JD.
+
+        Args:
+            jd_data: Structured JD data from JDParser.
+            resume: {"text": ...} or {"file": FileStorage}.
+            scoring_mode: Optional Scorer mode override.
+            pipeline_mode: Optional pipeline mode override.
+            scanner: The JD's KeywordScanner, when the caller already has it.
+
+        Returns:
+            dict: resume_summary, analysis, score, keyword_matches, and timings.
+
+        Raises:
+            ValueError: If the resume cannot be read or is too short.
+        """
+        timings = StageTimings()
+        with timings.stage("total"):
+            resume_text = self._resolve_resume_text(resume, timings)
+            with timings.stage("resume_parse"):
+                resume_data = self.resume_parser.parse(resume_text)
+            resume_data, keyword_matches = self._scan_keywords(
+                scanner or KeywordScanner.for_jd(jd_data), resume_text, resume_data, timings
+            )
+            result = self._analyze_and_score(
+                jd_data, resume_data, timings, scoring_mode=scoring_mode, pipeline_mode=pipeline_mode
+            )
+
+        return {**result, "keyword_matches": keyword_matches, "timings": timings.as_dict()}
+
+    async def arun_for_resume(self, jd_data: dict, resume: dict, scoring_mode: str = None,
+                              pipeline_mode: str = None, scanner: KeywordScanner = None) -> dict:
+        """Coroutine form of run_for_resume(); uploaded files are extracted on a worker thread."""
+        timings = StageTimings()
+        with timings.stage("total"):
+            if resume.get("file") is not None:
+                resume_text = await asyncio.to_thread(self._resolve_resume_text, resume, timings)
+            else:
+                resume_text = self._resolve_resume_text(resume, timings)
+            with timings.stage("resume_parse"):
+                resume_data = await self.resume_parser.aparse(resume_text)
+            resume_data, keyword_matches = self._scan_keywords(
+                scanner or KeywordScanner.for_jd(jd_data), resume_text, resume_data, timings
+            )
+            result = await self._aanalyze_and_score(
+                jd_data, resume_data, timings, scoring_mode=scoring_mode, pipeline_mode=pipeline_mode
+            )
+
+        return {**result, "keyword_matches": keyword_matches, "timings": timings.as_dict()}
+
+    def run_for_job(self, resume_data: dict, job: dict, scoring_mode: str = None,
+                    pipeline_mode: str = None) -> dict:
+        """
+        Run JD extraction (served from the JD cache when possible), analysis,
+        and scoring for an already-parsed resume.
+
+        Args:
+            resume_data: Structured resume data from ResumeParser.
+            job: {"text": ...} or {"jd_summary": {...}} with a previously parsed JD.
+            scoring_mode: Optional Scorer mode override.
+            pipeline_mode: Optional pipeline mode override.
+
+        Returns:
+            dict: jd_summary, analysis, score, and timings.
+
+        Raises:
+            ValueError: If the job description is too short.
+        """
+        timings = StageTimings()
+        with timings.stage("total"):
+            with timings.stage("jd_parse"):
+                if isinstance(job.get("jd_summary"), dict):
+                    jd_data = self.jd_parser._validate_and_normalize(dict(job["jd_summary"]))
+                else:
+                    jd_data = self.jd_parser.parse(job.get("text") or "")
+            result = self._analyze_and_score(
+                jd_data, resume_data, timings, scoring_mode=scoring_mode, pipeline_mode=pipeline_mode
+            )
+
+        result.pop("resume_summary")
+        return {"jd_summary": jd_data, **result, "timings": timings.as_dict()}
+
+    async def arun_for_job(self, resume_data: dict, job: dict, scoring_mode: str = None,
+                           pipeline_mode: str = None) -> dict:
+        """Coroutine form of run_for_job()."""
+        timings = StageTimings()
+        with timings.stage("total"):
+            with timings.stage("jd_parse"):
+                if isinstance(job.get("jd_summary"), dict):
+                    jd_data = self.jd_parser._validate_and_normalize(dict(job["jd_summary"]))
+                else:
+                    jd_data = await self.jd_parser.aparse(job.get("text") or "")
+            result = await self._aanalyze_and_score(
+                jd_data, resume_data, timings, scoring_mode=scoring_mode, pipeline_mode=pipeline_mode
+            )
+
+        result.pop("resume_summary")
+        return {"jd_summary": jd_data, **result, "timings": timings.as_dict()}
+
+    def run_batch(self, jd_data: dict, resumes: list, concurrency: int = 4, item_timeout: float = None,
+                  scoring_mode: str = None, pipeline_mode: str = None):
+        """
+        Fan a list of resumes out against one parsed JD, yielding each result
+        as soon as it finishes rather than in submission order.
+
+        Args:
+            jd_data: Structured JD data, parsed once for the whole batch; its
+                KeywordScanner is likewise built once and shared by every item.
+            resumes: List of {"name": ..., "text": ...} or {"name": ..., "file": ...}.
+            concurrency: Maximum number of resumes processed at once.
+            item_timeout: Seconds a started resume may run before it is reported
+                as timed out so the batch can finish without it.
+            scoring_mode: Optional Scorer mode override for every item.
+            pipeline_mode: Optional pipeline mode override for every item.
+
+        Yields:
+            dict: One record per resume with index, name, success, and either
+            the result fields or an error message.
+        """
+        scanner = KeywordScanner.for_jd(jd_data)
+        return self._fan_out(
+            lambda resume: self.run_for_resume(jd_data, resume, scoring_mode, pipeline_mode, scanner),
+            resumes, concurrency, item_timeout,
+        )
+
+    def run_job_batch(self, resume_data: dict, jobs: list, concurrency: int = 4, item_timeout: float = None,
+                      scoring_mode: str = None, pipeline_mode: str = None):
+        """
+        Mirror of run_batch: compare one parsed resume against many job
+        descriptions, yielding each result as soon as it finishes.
+
+        Args:
+            resume_data: Structured resume data, parsed once for the whole batch.
+            jobs: List of {"name": ..., "text": ...} or {"name": ..., "jd_summary": {...}}.
+            concurrency: Maximum number of job descriptions processed at once.
+            item_timeout: Seconds a started item may run before it is reported as timed out.
+            scoring_mode: Optional Scorer mode override for every item.
+            pipeline_mode: Optional pipeline mode override for every item.
+
+        Yields:
+            dict: One record per job description, as in run_batch.
+        """
+        return self._fan_out(
+            lambda job: self.run_for_job(resume_data, job, scoring_mode, pipeline_mode),
+            jobs, concurrency, item_timeout,
+        )
+
+    def arun_batch(self, jd_data: dict, resumes: list, concurrency: int = 4, item_timeout: float = None,
+                   scoring_mode: str = None, pipeline_mode: str = None):
+        """
+        Async-generator form of run_batch(): at most `concurrency` resumes are
+        in flight as tasks on the event loop, and records are yielded as each
+        finishes.
+        """
+        scanner = KeywordScanner.for_jd(jd_data)
+        return self._afan_out(
+            lambda resume: self.arun_for_resume(jd_data, resume, scoring_mode, pipeline_mode, scanner),
+            resumes, concurrency, item_timeout,
+        )
+
+    def arun_job_batch(self, resume_data: dict, jobs: list, concurrency: int = 4, item_timeout: float = None,
+                       scoring_mode: str = None, pipeline_mode: str = None):
+        """Async-generator form of run_job_batch()."""
+        return self._afan_out(
+            lambda job: self.arun_for_job(resume_data, job, scoring_mode, pipeline_mode),
+            jobs, concurrency, item_timeout,
+        )
+
+    def _fan_out(self, process_item, items: list, concurrency: int, item_timeout: float):
+        pool = ContextThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch-item")
+        started = {}
+
+        def process(index, item):
+            started[index] = time.monotonic()
+            return process_item(item)
+
+        futures = {
+            pool.submit(process, index, item): index
+            for index, item in enumerate(items)
+        }
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    yield self._batch_record(index, items[index], future)
+
+                if item_timeout is None:
+                    continue
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] > item_timeout:
+                        pending.discard(future)
+                        future.cancel()
+                        yield self._batch_error(
+                            index, items[index], f"Timed out after {item_timeout:g} seconds."
+                        )
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _afan_out(self, process_item, items: list, concurrency: int, item_timeout: float):
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def process(item):
+            async with semaphore:
+                # As in _fan_out, the timeout only starts once the item is running. asyncio.wait (not
+                # wait_for) keeps a TimeoutError raised by the item itself distinct from running out of time
+                task = asyncio.ensure_future(process_item(item))
+                try:
+                    done, _ = await asyncio.wait({task}, timeout=item_timeout)
+                except BaseException:
+                    task.cancel()
+                    raise
+                if not done:
+                    task.cancel()
+                    raise _ItemTimedOut()
+                return task.result()
+
+        tasks = {asyncio.ensure_future(process(item)): index for index, item in enumerate(items)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = tasks[task]
+                    if isinstance(task.exception(), _ItemTimedOut):
+                        yield self._batch_error(index, items[index], f"Timed out after {item_timeout:g} seconds.")
+                    else:
+                        yield self._batch_record(index, items[index], task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _analyze_and_score(self, jd_data: dict, resume_data: dict, timings: StageTimings, on_stage=None,
+                           scoring_mode: str = None, pipeline_mode: str = None, on_field=None,
+                           deadline_at: float = None) -> dict:
+        mode, scoring_mode, key = self._analysis_key(jd_data, resume_data, scoring_mode, pipeline_mode)
+        computed = []
+
+        def compute():
+            computed.append(True)
+            analysis, score_data = self._run_analysis_stages(
+                jd_data, resume_data, timings, on_stage, mode, scoring_mode, on_field, deadline_at
+            )
+            return {"analysis": analysis, "score": score_data}
+
+        result = self.results.get_or_compute(key, compute, cacheable=self._reusable(jd_data, resume_data))
+        if not computed:
+            self._reused(result, on_stage)
+        return {"resume_summary": resume_data, **result}
+
+    async def _aanalyze_and_score(self, jd_data: dict, resume_data: dict, timings: StageTimings, on_stage=None,
+                                  scoring_mode: str = None, pipeline_mode: str = None,
+                                  deadline_at: float = None) -> dict:
+        mode, scoring_mode, key = self._analysis_key(jd_data, resume_data, scoring_mode, pipeline_mode)
+        computed = []
+
+        async def compute():
+            computed.append(True)
+            analysis, score_data = await self._arun_analysis_stages(
+                jd_data, resume_data, timings, on_stage, mode, scoring_mode, deadline_at
+            )
+            return {"analysis": analysis, "score": score_data}
+
+        result = await self.results.aget_or_compute(key, compute, cacheable=self._reusable(jd_data, resume_data))
+        if not computed:
+            self._reused(result, on_stage)
+        return {"resume_summary": resume_data, **result}
+
+    @staticmethod
+    def _reusable(jd_data: dict, resume_data: dict):
+        # Fallback results stand in for one late request; they must never be reused in place of a real analysis
+        def cacheable(result: dict) -> bool:
+            payloads = (jd_data, resume_data, result["analysis"], result["score"])
+            return not any(payload.get("degraded") for payload in payloads)
+        return cacheable
+
+    @staticmethod
+    def _reused(result: dict, on_stage) -> None:
+        logger.info("Structured inputs unchanged; reusing the previous analysis and score")
+        if on_stage:
+            on_stage("analysis", result["analysis"])
+            on_stage("score", result["score"])
+
+    def _analysis_key(self, jd_data: dict, resume_data: dict, scoring_mode: str, pipeline_mode: str) -> tuple:
+        # Resolve the modes and key an analysis by the structured inputs it was computed from
+        mode = pipeline_mode or self.mode
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{mode}'. Choose one of: {', '.join(PIPELINE_MODES)}.")
+        scoring_mode = (scoring_mode or self.scorer.mode).lower()
+        # The fused call scores in hybrid fashion; fast makes no scoring call and llm scores every
+        # dimension itself, so both run the standard stages rather than answer in a different mode
+        if scoring_mode != "hybrid":
+            mode = "standard"
+
+        # An edited resume whose extracted data did not change needs no new analysis
+        key = fingerprint(jd_data, resume_data, mode, scoring_mode, self.analyzer.llm.model, ANALYSIS_PROMPT_VERSION)
+        return mode, scoring_mode, key
+
+    def _run_analysis_stages(self, jd_data: dict, resume_data: dict, timings: StageTimings, on_stage,
+                             mode: str, scoring_mode: str, on_field=None, deadline_at: float = None) -> tuple:
+        if mode == "fused":
+            with timings.stage("analyze_and_score"):
+                fused = self._within_deadline("analyze_and_score", deadline_at, lambda: self.fused.analyze_and_score(
+                    jd_data, resume_data, on_field=self._field_callback(on_field), deadline_at=deadline_at
+                ))
+                if fused is None:
+                    fused = self._fallback_analysis_and_score(jd_data, resume_data)
+                analysis, score_data = fused
+            if on_stage:
+                on_stage("analysis", analysis)
+                on_stage("score", score_data)
+            return analysis, score_data
+
+        with timings.stage("analyze"):
+            analysis = self._within_deadline("analyze", deadline_at, lambda: self.analyzer.analyze(
+                jd_data, resume_data, on_field=self._field_callback(on_field, "analysis"), deadline_at=deadline_at
+            ))
+            if analysis is None:
+                analysis = self._fallback("analyze", self.fallback.analysis, jd_data, resume_data)
+        if on_stage:
+            on_stage("analysis", analysis)
+
+        with timings.stage("score"):
+            score_data = self._within_deadline("score", deadline_at, lambda: self.scorer.score(
+                analysis, jd_data, resume_data, mode=scoring_mode, on_field=self._field_callback(on_field, "score"),
+                deadline_at=deadline_at,
+            ))
+            if score_data is None:
+                score_data = self._fallback("score", self.fallback.score, analysis, jd_data, resume_data)
+        if on_stage:
+            on_stage("score", score_data)
+        return analysis, score_data
+
+    async def _arun_analysis_stages(self, jd_data: dict, resume_data: dict, timings: StageTimings, on_stage,
+                                    mode: str, scoring_mode: str, deadline_at: float = None) -> tuple:
+        if mode == "fused":
+            with timings.stage("analyze_and_score"):
+                fused = await self._awithin_deadline(
+                    "analyze_and_score", deadline_at,
+                    lambda: self.fused.aanalyze_and_score(jd_data, resume_data, deadline_at=deadline_at),
+                )
+                if fused is None:
+                    fused = self._fallback_analysis_and_score(jd_data, resume_data)
+                analysis, score_data = fused
+            if on_stage:
+                on_stage("analysis", analysis)
+                on_stage("score", score_data)
+            return analysis, score_data
+
+        with timings.stage("analyze"):
+            analysis = await self._awithin_deadline(
+                "analyze", deadline_at, lambda: self.analyzer.aanalyze(jd_data, resume_data, deadline_at=deadline_at)
+            )
+            if analysis is None:
+                analysis = self._fallback("analyze", self.fallback.analysis, jd_data, resume_data)
+        if on_stage:
+            on_stage("analysis", analysis)
+
+        with timings.stage("score"):
+            score_data = await self._awithin_deadline("score", deadline_at, lambda: self.scorer.ascore(
+                analysis, jd_data, resume_data, mode=scoring_mode, deadline_at=deadline_at
+            ))
+            if score_data is None:
+                score_data = self._fallback("score", self.fallback.score, analysis, jd_data, resume_data)
+        if on_stage:
+            on_stage("score", score_data)
+        return analysis, score_data
+
+    @staticmethod
+    def _within_deadline(stage: str, deadline_at: float, run):
+        # Run one LLM stage; with a deadline, None stands for "ran out of time" and the caller falls back
+        try:
+            return run()
+        except OUT_OF_TIME_ERRORS as e:
+            if deadline_at is None:
+                raise
+            logger.warning(f"{stage} could not finish before the request deadline; using the local fallback ({e})")
+            return None
+
+    @staticmethod
+    async def _awithin_deadline(stage: str, deadline_at: float, run):
+        try:
+            return await run()
+        except OUT_OF_TIME_ERRORS as e:
+            if deadline_at is None:
+                raise
+            logger.warning(f"{stage} could not finish before the request deadline; using the local fallback ({e})")
+            return None
+
+    @staticmethod
+    def _fallback(stage: str, compute, *args) -> dict:
+        DEGRADED_RESULTS.inc(stage=stage)
+        return compute(*args)
+
+    def _fill_parse_fallbacks(self, jd_text: str, resume_text: str, jd_data: dict, resume_data: dict,
+                              on_stage) -> tuple:
+        # Replace a parse that ran out of time; the resume scan looks for the JD's skills, so the JD goes first
+        if jd_data is None:
+            jd_data = self._fallback("jd_parse", self.fallback.jd, jd_text)
+            if on_stage:
+                on_stage("jd_summary", jd_data)
+        if resume_data is None:
+            resume_data = self._fallback("resume_parse", self.fallback.resume, resume_text, jd_data)
+            if on_stage:
+                on_stage("resume_summary", resume_data)
+        return jd_data, resume_data
+
+    def _fallback_analysis_and_score(self, jd_data: dict, resume_data: dict) -> tuple:
+        analysis = self._fallback("analyze", self.fallback.analysis, jd_data, resume_data)
+        return analysis, self._fallback("score", self.fallback.score, analysis, jd_data, resume_data)
+
+    @staticmethod
+    def _flag_degraded(response: dict) -> dict:
+        degraded = [field for field in _DEGRADABLE_FIELDS if response.get(field, {}).get("degraded")]
+        if degraded:
+            response["degraded"] = degraded
+        return response
+
+    @staticmethod
+    def _scan_keywords(scanner: KeywordScanner, resume_text: str, resume_data: dict, timings: StageTimings,
+                       on_stage=None) -> tuple:
+        """
+        Scan the whole cleaned resume for the JD's keywords and skills, and
+        record the keywords found as the resume's scanned_keywords, kept apart
+        from the parse's keywords_present, so scoring and analysis also see
+        the ones the parse missed (e.g. past its truncation).
+
+        Returns:
+            tuple: (resume_data, keyword_matches), where keyword_matches is
+            KeywordScanner.report() of clean_text(resume_text): found, with
+            counts and character offsets into that text, and missing.
+        """
+        with timings.stage("keyword_scan"):
+            keyword_matches = scanner.report(clean_text(resume_text))
+        resume_data = {**resume_data, "scanned_keywords": [item["keyword"] for item in keyword_matches["found"]]}
+        if on_stage:
+            on_stage("keyword_matches", keyword_matches)
+        return resume_data, keyword_matches
+
+    @staticmethod
+    def _timed_fields(on_field, timings: StageTimings):
+        # Record when the first streamed field reaches the caller, relative to the start of the run
+        started = time.perf_counter()
+        seen = []
+
+        def forward(stage, field, value):
+            if not seen:
+                seen.append(True)
+                timings.record("first_field", (time.perf_counter() - started) * 1000)
+            on_field(stage, field, value)
+        return forward
+
+    @staticmethod
+    def _field_callback(on_field, stage: str = None):
+        # Adapt on_field(stage, field, value) to LLMClient's (path, value); a fused reply nests each stage's fields
+        if on_field is None:
+            return None
+
+        def forward(path, value):
+            if stage is not None:
+                on_field(stage, path[0], value)
+            elif len(path) == 2:
+                on_field(path[0], path[1], value)
+        return forward
+
+    def _resolve_resume_text(self, resume: dict, timings: StageTimings) -> str:
+        if resume.get("file") is not None:
+            if self.file_handler is None:
+                raise ValueError("File uploads are not supported by this pipeline.")
+            with timings.stage("extract_text"):
+                extracted = self.file_handler.extract_text(resume["file"])
+            if extracted.get("error"):
+                raise ValueError(extracted["error"])
+            return extracted["text"]
+        return (resume.get("text") or "").strip()
+
+    def _batch_record(self, index: int, item: dict, future) -> dict:
+        try:
+            result = future.result()
+        except ValueError as ve:
+            return self._batch_error(index, item, str(ve))
+        except Exception as e:
+            logger.error(f"Batch item {index} failed: {e}", exc_info=True)
+            return self._batch_error(index, item, GENERIC_ITEM_ERROR)
+        return {"type": "result", "index": index, "name": item.get("name"), "success": True, **result}
+
+    def _batch_error(self, index: int, item: dict, message: str) -> dict:
+        return {"type": "result", "index": index, "name": item.get("name"), "success": False, "error": message}
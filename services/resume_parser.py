@@ -1,11 +1,44 @@
 """
 CVAlign Lens — Resume Parser Service
-Extracts structured candidate intelligence from raw resume text.
+Extracts structured candidate intelligence from raw resume text, either in
+one call for the whole document or section by section, so that an edited
+resume only re-extracts the sections that changed.
 """
 
-from prompts.prompt_templates import SYSTEM_PROMPT, RESUME_EXTRACTION_PROMPT
-from utils.text_processing import clean_text, truncate_text, is_meaningful_text
-from utils.llm_client import LLMClient
+import asyncio
+import logging
+import os
+
+from prompts.prompt_templates import SYSTEM_PROMPT, RESUME_EXTRACTION_PROMPT, RESUME_SECTION_EXTRACTION_PROMPT
+from services.local_scorer import EXPECTED_SECTIONS
+from utils.cache import TieredCache, fingerprint
+from utils.concurrency import get_executor
+from utils.text_processing import clean_text, is_meaningful_text
+from utils.llm_client import get_llm_client
+from utils.prompt_builder import PromptBuilder
+from utils.resume_sections import segment_resume, HEADER_SECTION, SECTION_TITLES
+
+
+logger = logging.getLogger(__name__)
+
+# document — one extraction call for the whole resume (original behaviour)
+# sections — one cached call per section; only changed sections are re-extracted
+RESUME_PARSE_MODES = ("document", "sections")
+
+# Changes whenever the section prompt changes, invalidating cached sections.
+SECTION_PROMPT_VERSION = fingerprint(SYSTEM_PROMPT, RESUME_SECTION_EXTRACTION_PROMPT)[:12]
+
+_LIST_FIELDS = (
+    "technical_skills", "soft_skills", "domain_experience", "education",
+    "notable_achievements", "keywords_present",
+)
+# Sections to take each single-valued field from, most trusted first
+_SCALAR_SOURCES = {
+    "candidate_name": (HEADER_SECTION, "summary"),
+    "inferred_title": ("summary", "experience", HEADER_SECTION),
+    "years_of_experience": ("experience", "summary", HEADER_SECTION),
+}
+_EMPTY_SCALARS = {"", "unknown", "null", "none", "n/a"}
 
 
 class ResumeParser:
@@ -13,24 +46,69 @@ class ResumeParser:
     Parses a raw resume into structured data for downstream analysis.
     """
 
-    def __init__(self):
-        self.llm = LLMClient()
+    def __init__(self, section_cache: TieredCache = None):
+        self.llm = get_llm_client()
+        self.prompts = PromptBuilder()
+        self.mode = os.getenv("RESUME_PARSE_MODE", "document").strip().lower()
+        if self.mode not in RESUME_PARSE_MODES:
+            raise ValueError(
+                f"Unknown RESUME_PARSE_MODE '{self.mode}'. Choose one of: {', '.join(RESUME_PARSE_MODES)}."
+            )
+        self.section_cache = section_cache if section_cache is not None else TieredCache.from_env(
+            "resume_sections", prefix="RESUME_SECTION_CACHE", max_entries=2048, ttl=24 * 3600
+        )
 
-    def parse(self, raw_resume: str) -> dict:
+    def parse(self, raw_resume: str, deadline_at: float = None) -> dict:
         """
         Parse resume text and return structured candidate intelligence.
 
         Args:
             raw_resume: Raw resume text.
+            deadline_at: Optional time.monotonic() the request must finish by
+                (see LLMClient.call).
 
         Returns:
             dict: Structured resume data.
 
         Raises:
             ValueError: If the input is insufficient for meaningful parsing.
+            LLMTimeoutError: If the extraction cannot finish before deadline_at.
+        """
+        prompt, sections = self._prepare(raw_resume)
+        if sections:
+            return self._parse_sections(sections, deadline_at)
+
+        result = self.llm.call(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+
+        return self._validate_and_normalize(result)
+
+    async def aparse(self, raw_resume: str, deadline_at: float = None) -> dict:
+        """Coroutine form of parse(); sections are extracted concurrently and share the section cache."""
+        prompt, sections = self._prepare(raw_resume)
+        if sections:
+            return await self._aparse_sections(sections, deadline_at)
+
+        result = await self.llm.acall(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+        return self._validate_and_normalize(result)
+
+    def _prepare(self, raw_resume: str) -> tuple:
+        """
+        Build the whole-document prompt and, in sections mode, segment the
+        resume.
+
+        Returns:
+            tuple: (prompt, sections), where sections is None unless the
+            resume should be parsed section by section.
         """
         cleaned = clean_text(raw_resume)
-        truncated = truncate_text(cleaned, max_chars=7000)
+        prompt = self.prompts.build("resume_extraction", RESUME_EXTRACTION_PROMPT, texts={"resume_text": cleaned})
+        truncated = prompt.values["resume_text"]
 
         if not is_meaningful_text(truncated, min_words=50):
             raise ValueError(
@@ -38,10 +116,114 @@ class ResumeParser:
                 "Please provide more complete resume content."
             )
 
-        prompt = RESUME_EXTRACTION_PROMPT.format(resume_text=truncated)
-        result = self.llm.call(system_prompt=SYSTEM_PROMPT, user_prompt=prompt)
+        if self.mode == "sections":
+            sections = segment_resume(truncated)
+            # Unstructured text (fewer than two headings) is parsed as one document
+            if sum(1 for section in sections if section.name != HEADER_SECTION) >= 2:
+                return prompt, sections
+        return prompt, None
 
-        return self._validate_and_normalize(result)
+    def _parse_sections(self, sections: list, deadline_at: float = None) -> dict:
+        """
+        Extract every section (from the section cache when its text is
+        unchanged) and merge the results into one resume_data dict.
+        """
+        extracted_names = []
+
+        def extract(section):
+            extracted_names.append(section.name)
+            return self._extract_section(section, deadline_at)
+
+        executor = get_executor("resume-section")
+        futures = [
+            executor.submit(
+                self.section_cache.get_or_compute,
+                fingerprint(section.digest, self.llm.model, SECTION_PROMPT_VERSION),
+                lambda s=section: extract(s),
+            )
+            for section in sections
+        ]
+        extracted = [future.result() for future in futures]
+        logger.info(
+            f"Resume parsed by section: {len(sections)} sections, "
+            f"re-extracted {', '.join(extracted_names) or 'none'}"
+        )
+        return self._validate_and_normalize(self._merge_sections(sections, extracted))
+
+    async def _aparse_sections(self, sections: list, deadline_at: float = None) -> dict:
+        extracted_names = []
+
+        async def extract(section):
+            extracted_names.append(section.name)
+            return await self._aextract_section(section, deadline_at)
+
+        extracted = await asyncio.gather(*[
+            self.section_cache.aget_or_compute(
+                fingerprint(section.digest, self.llm.model, SECTION_PROMPT_VERSION),
+                lambda s=section: extract(s),
+            )
+            for section in sections
+        ])
+        logger.info(
+            f"Resume parsed by section: {len(sections)} sections, "
+            f"re-extracted {', '.join(extracted_names) or 'none'}"
+        )
+        return self._validate_and_normalize(self._merge_sections(sections, extracted))
+
+    def _extract_section(self, section, deadline_at: float = None) -> dict:
+        prompt = self._section_prompt(section)
+        result = self.llm.call(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+        return result if isinstance(result, dict) else {}
+
+    async def _aextract_section(self, section, deadline_at: float = None) -> dict:
+        prompt = self._section_prompt(section)
+        result = await self.llm.acall(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            deadline_at=deadline_at,
+        )
+        return result if isinstance(result, dict) else {}
+
+    def _section_prompt(self, section):
+        return self.prompts.build(
+            "resume_section_extraction", RESUME_SECTION_EXTRACTION_PROMPT,
+            texts={"section_text": section.text}, fixed={"section_name": section.title},
+        )
+
+    def _merge_sections(self, sections: list, extracted: list) -> dict:
+        by_section = {section.name: data for section, data in zip(sections, extracted)}
+        merged = {}
+
+        for field in _LIST_FIELDS:
+            seen = set()
+            merged[field] = []
+            for data in extracted:
+                values = data.get(field)
+                for value in values if isinstance(values, list) else []:
+                    marker = str(value).strip().lower()
+                    if marker and marker not in seen:
+                        seen.add(marker)
+                        merged[field].append(value)
+
+        for field, preferred in _SCALAR_SOURCES.items():
+            order = [name for name in preferred if name in by_section]
+            order += [section.name for section in sections if section.name not in order]
+            merged[field] = next(
+                (
+                    by_section[name][field] for name in order
+                    if isinstance(by_section[name].get(field), str)
+                    and by_section[name][field].strip().lower() not in _EMPTY_SCALARS
+                ),
+                None,
+            )
+
+        # Section presence comes straight from the segmenter, not the model
+        present = [section.name for section in sections if section.name != HEADER_SECTION]
+        merged["resume_sections_present"] = [SECTION_TITLES[name] for name in present]
+        merged["missing_sections"] = [SECTION_TITLES[name] for name in EXPECTED_SECTIONS if name not in present]
+        return merged
 
     def _validate_and_normalize(self, data: dict) -> dict:
         """
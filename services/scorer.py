@@ -3,9 +3,17 @@ CVAlign Lens — Scorer Service
 Generates a precise role alignment score and dimensional breakdown.
 """
 
-import json
-from prompts.prompt_templates import SYSTEM_PROMPT, SCORING_PROMPT
-from utils.llm_client import LLMClient
+import os
+from prompts.prompt_templates import SYSTEM_PROMPT, SCORING_PROMPT, SUBJECTIVE_SCORING_PROMPT
+from services.local_scorer import LocalScorer, DIMENSION_WEIGHTS
+from utils.llm_client import get_llm_client
+from utils.prompt_builder import PromptBuilder
+
+
+# llm    — the LLM scores every dimension (original behaviour)
+# hybrid — skill/keyword coverage is computed locally; the LLM scores the rest
+# fast   — everything is computed locally; no LLM call
+SCORING_MODES = ("llm", "hybrid", "fast")
 
 
 class Scorer:
@@ -14,9 +22,13 @@ class Scorer:
     """
 
     def __init__(self):
-        self.llm = LLMClient()
+        self.llm = get_llm_client()
+        self.prompts = PromptBuilder()
+        self.local = LocalScorer()
+        self.mode = os.getenv("SCORING_MODE", "hybrid")
 
-    def score(self, analysis: dict, jd_data: dict = None, resume_data: dict = None) -> dict:
+    def score(self, analysis: dict, jd_data: dict = None, resume_data: dict = None, mode: str = None,
+              on_field=None, deadline_at: float = None) -> dict:
         """
         Generate an alignment score from analysis data.
 
@@ -24,18 +36,125 @@ class Scorer:
             analysis: Full analysis result from Analyzer.
             jd_data: Optional JD data for deeper scoring context.
             resume_data: Optional resume data for deeper scoring context.
+            mode: One of SCORING_MODES; defaults to SCORING_MODE. The hybrid and
+                fast modes need jd_data and resume_data and fall back to llm without them.
+            on_field: Optional callback(path, value); the scoring reply is
+                streamed and each field reported as it closes (see LLMClient.call).
+            deadline_at: Optional time.monotonic() the request must finish by.
 
         Returns:
             dict: Score data with overall score, dimension breakdown, and recommendations.
+
+        Raises:
+            ValueError: If the scoring mode is unknown.
+            LLMTimeoutError: If the scoring call cannot finish before deadline_at.
         """
-        prompt = SCORING_PROMPT.format(
-            analysis_data=json.dumps(analysis, indent=2),
-            jd_data=json.dumps(jd_data or {}, indent=2),
-            resume_data=json.dumps(resume_data or {}, indent=2),
+        mode = self._resolve_mode(mode, jd_data, resume_data)
+
+        if mode == "fast":
+            result = self.local.fast_score(analysis, jd_data, resume_data)
+        elif mode == "hybrid":
+            result = self._hybrid_score(analysis, jd_data, resume_data, on_field, deadline_at)
+        else:
+            prompt = self._llm_prompt(analysis, jd_data, resume_data)
+            result = self.llm.call(
+                system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+                on_field=on_field, deadline_at=deadline_at,
+            )
+
+        result = self._validate_and_normalize(result)
+        result["scoring_mode"] = mode
+        return result
+
+    async def ascore(self, analysis: dict, jd_data: dict = None, resume_data: dict = None, mode: str = None,
+                     deadline_at: float = None) -> dict:
+        """Coroutine form of score()."""
+        mode = self._resolve_mode(mode, jd_data, resume_data)
+
+        if mode == "fast":
+            result = self.local.fast_score(analysis, jd_data, resume_data)
+        elif mode == "hybrid":
+            objective, prompt = self._hybrid_prompt(analysis, jd_data, resume_data)
+            result = await self.llm.acall(
+                system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+                deadline_at=deadline_at,
+            )
+            result = self.merge_objective(result, objective)
+        else:
+            prompt = self._llm_prompt(analysis, jd_data, resume_data)
+            result = await self.llm.acall(
+                system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+                deadline_at=deadline_at,
+            )
+
+        result = self._validate_and_normalize(result)
+        result["scoring_mode"] = mode
+        return result
+
+    def _resolve_mode(self, mode: str, jd_data: dict, resume_data: dict) -> str:
+        mode = (mode or self.mode).lower()
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}'. Choose one of: {', '.join(SCORING_MODES)}.")
+        if mode != "llm" and not (jd_data and resume_data):
+            mode = "llm"
+        return mode
+
+    def _llm_prompt(self, analysis: dict, jd_data: dict, resume_data: dict):
+        return self.prompts.build("scoring", SCORING_PROMPT, data={
+            "analysis_data": analysis,
+            "jd_data": jd_data or {},
+            "resume_data": resume_data or {},
+        })
+
+    def _hybrid_score(self, analysis: dict, jd_data: dict, resume_data: dict, on_field=None,
+                      deadline_at: float = None) -> dict:
+        """
+        Ask the LLM only for the subjective dimensions, then merge in the
+        deterministic skill and keyword coverage.
+        """
+        objective, prompt = self._hybrid_prompt(analysis, jd_data, resume_data)
+        result = self.llm.call(
+            system_prompt=SYSTEM_PROMPT, user_prompt=prompt.text, stage=prompt.stage, budget=prompt.budget,
+            on_field=on_field, deadline_at=deadline_at,
         )
+        return self.merge_objective(result, objective)
+
+    def _hybrid_prompt(self, analysis: dict, jd_data: dict, resume_data: dict) -> tuple:
+        objective = self.local.objective_scores(jd_data, resume_data)
+        role_profile, candidate_profile = self._profiles(jd_data, resume_data)
+        prompt = self.prompts.build("subjective_scoring", SUBJECTIVE_SCORING_PROMPT, data={
+            "objective_scores": objective["dimension_scores"],
+            "analysis_data": analysis,
+            "role_profile": role_profile,
+            "candidate_profile": candidate_profile,
+        })
+        return objective, prompt
 
-        result = self.llm.call(system_prompt=SYSTEM_PROMPT, user_prompt=prompt)
-        return self._validate_and_normalize(result)
+    def merge_objective(self, result: dict, objective: dict) -> dict:
+        """
+        Combine LLM-scored subjective dimensions with locally computed
+        objective ones (from LocalScorer.objective_scores).
+        """
+        subjective = result.get("dimension_scores")
+        subjective = subjective if isinstance(subjective, dict) else {}
+        dims = {**subjective, **objective["dimension_scores"]}
+        result["dimension_scores"] = {key: dims.get(key, 0) for key in DIMENSION_WEIGHTS}
+        result["skill_match"] = objective["skill_match"]
+        return result
+
+    def _profiles(self, jd_data: dict, resume_data: dict) -> tuple:
+        role_profile = {
+            key: jd_data.get(key)
+            for key in ("role_title", "seniority_level", "key_responsibilities", "domain_knowledge")
+        }
+        candidate_profile = {
+            key: resume_data.get(key)
+            for key in (
+                "inferred_title", "years_of_experience", "domain_experience",
+                "notable_achievements", "resume_sections_present", "missing_sections",
+            )
+        }
+        return role_profile, candidate_profile
 
     def _validate_and_normalize(self, data: dict) -> dict:
         """
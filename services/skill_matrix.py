@@ -0,0 +1,173 @@
+"""
+CVAlign Lens — Batch Skill Similarity Engine
+Scores many parsed resumes against many parsed job descriptions at once.
+Each skill list becomes a sparse hashed-feature vector, and the full
+resume × JD cosine-similarity matrix is computed with one matrix product
+per block of resumes. Requires NumPy, which is imported on first use.
+"""
+
+import os
+import zlib
+from functools import lru_cache
+
+from utils.skills import canonical_skill
+
+
+# Resume and JD fields that feed the vectors, with per-field weights
+RESUME_FIELD_WEIGHTS = {"technical_skills": 1.0, "keywords_present": 0.5}
+JD_FIELD_WEIGHTS = {"core_technical_skills": 2.0, "keywords_for_ats": 1.0}
+
+# Words of a multi-word skill also count, at this fraction of the skill's
+# weight, so "AWS Lambda" partly matches "AWS" (as skill_overlap's partial match)
+WORD_WEIGHT = 0.5
+
+DEFAULT_FEATURES = 1 << 20
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError("Batch similarity scoring requires NumPy. Install it with 'pip install numpy'.") from e
+    return numpy
+
+
+@lru_cache(maxsize=65536)
+def _skill_features(skill: str, mask: int) -> tuple:
+    # Hashed (feature, relative weight) pairs for one raw skill string
+    canonical = canonical_skill(skill)
+    if not canonical:
+        return ()
+    features = [(zlib.crc32(b"s:" + canonical.encode("utf-8")) & mask, 1.0)]
+    words = canonical.split()
+    if len(words) > 1:
+        features += [(zlib.crc32(b"w:" + word.encode("utf-8")) & mask, WORD_WEIGHT) for word in words]
+    return tuple(features)
+
+
+class SkillMatrix:
+    """
+    Hashed skill-vector cosine similarity between lists of resume and JD
+    dicts, as produced by ResumeParser and JDParser.
+    """
+
+    def __init__(self, n_features: int = None, chunk_size: int = None):
+        n_features = n_features or int(os.getenv("SKILL_MATRIX_FEATURES", DEFAULT_FEATURES))
+        if n_features & (n_features - 1):
+            raise ValueError("SKILL_MATRIX_FEATURES must be a power of two.")
+        self.mask = n_features - 1
+        self.chunk_size = chunk_size or int(os.getenv("SKILL_MATRIX_CHUNK", 2048))
+
+    def vectorize(self, items: list, field_weights: dict) -> tuple:
+        """
+        Turn parsed dicts into a sparse matrix in coordinate form.
+
+        Returns:
+            tuple: (rows, cols, values) NumPy arrays; one row per item, each
+            (row, col) pair at most once.
+        """
+        np = _numpy()
+        rows, cols, values = [], [], []
+        mask = self.mask
+        for row, item in enumerate(items):
+            features = {}
+            for field, field_weight in field_weights.items():
+                skills = item.get(field) if isinstance(item, dict) else None
+                if not isinstance(skills, list):
+                    continue
+                for skill in skills:
+                    if not isinstance(skill, str):
+                        continue
+                    for feature, weight in _skill_features(skill, mask):
+                        weight *= field_weight
+                        if weight > features.get(feature, 0.0):
+                            features[feature] = weight
+            rows.extend([row] * len(features))
+            cols.extend(features)
+            values.extend(features.values())
+        return (
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(cols, dtype=np.int64),
+            np.asarray(values, dtype=np.float32),
+        )
+
+    def similarity(self, resumes: list, jds: list):
+        """
+        Compute the full similarity matrix in one call.
+
+        Returns:
+            numpy.ndarray: float32 array of shape (len(resumes), len(jds)) with
+            cosine similarities in [0, 1]; 0 where either side has no skills.
+        """
+        np = _numpy()
+        matrix = np.zeros((len(resumes), len(jds)), dtype=np.float32)
+        for start, block in self.iter_similarity(resumes, jds):
+            matrix[start:start + len(block)] = block
+        return matrix
+
+    def iter_similarity(self, resumes: list, jds: list, chunk_size: int = None):
+        """
+        Chunked mode: yield the similarity matrix one block of resume rows at
+        a time, so memory stays bounded by chunk_size × len(jds) no matter how
+        many resumes there are.
+
+        Yields:
+            tuple: (first resume index, float32 block of shape (rows, len(jds))).
+        """
+        np = _numpy()
+        chunk_size = chunk_size or self.chunk_size
+        jd_rows, jd_cols, jd_values = self.vectorize(jds, JD_FIELD_WEIGHTS)
+        # Only features some JD uses can contribute to a dot product, so the
+        # dense blocks span that vocabulary, not the whole hash space
+        vocabulary, jd_dense_cols = np.unique(jd_cols, return_inverse=True)
+        jd_matrix = np.zeros((len(jds), len(vocabulary)), dtype=np.float32)
+        jd_matrix[jd_rows, jd_dense_cols] = jd_values
+        jd_norms = np.sqrt(np.bincount(jd_rows, weights=jd_values ** 2, minlength=len(jds))).astype(np.float32)
+        jd_scale = np.divide(1.0, jd_norms, out=np.zeros_like(jd_norms), where=jd_norms > 0)
+        jd_matrix_t = np.ascontiguousarray((jd_matrix * jd_scale[:, None]).T)
+
+        for start in range(0, len(resumes), chunk_size):
+            chunk = resumes[start:start + chunk_size]
+            rows, cols, values = self.vectorize(chunk, RESUME_FIELD_WEIGHTS)
+            norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=len(chunk))).astype(np.float32)
+            scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+
+            positions = np.searchsorted(vocabulary, cols)
+            positions[positions == len(vocabulary)] = 0
+            shared = vocabulary[positions] == cols if len(vocabulary) else np.zeros(len(cols), dtype=bool)
+            block = np.zeros((len(chunk), len(vocabulary)), dtype=np.float32)
+            block[rows[shared], positions[shared]] = values[shared]
+            block *= scale[:, None]
+            yield start, block @ jd_matrix_t
+
+    def top_matches(self, resumes: list, jds: list, k: int, chunk_size: int = None) -> list:
+        """
+        Best k resumes for every JD, computed chunk by chunk so the full
+        matrix is never held in memory.
+
+        Returns:
+            list: One list per JD of (resume index, similarity) pairs, best first.
+        """
+        np = _numpy()
+        k = max(0, min(k, len(resumes)))
+        best_index = np.zeros((len(jds), 0), dtype=np.int64)
+        best_score = np.zeros((len(jds), 0), dtype=np.float32)
+        for start, block in self.iter_similarity(resumes, jds, chunk_size):
+            # Merge this block's candidates into the running top-k per JD
+            scores = np.concatenate([best_score, block.T], axis=1)
+            indexes = np.concatenate(
+                [best_index, np.broadcast_to(np.arange(start, start + len(block)), (len(jds), len(block)))], axis=1
+            )
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k else np.zeros((len(jds), 0), dtype=np.int64)
+                scores = np.take_along_axis(scores, keep, axis=1)
+                indexes = np.take_along_axis(indexes, keep, axis=1)
+            best_score, best_index = scores, indexes
+
+        order = np.argsort(-best_score, axis=1, kind="stable")
+        best_score = np.take_along_axis(best_score, order, axis=1)
+        best_index = np.take_along_axis(best_index, order, axis=1)
+        return [
+            [(int(i), round(float(s), 4)) for i, s in zip(index_row, score_row)]
+            for index_row, score_row in zip(best_index, best_score)
+        ]
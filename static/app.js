@@ -7,7 +7,6 @@
 
 // ---- State ----
 let currentStep = 0;
-let loadingInterval = null;
 
 // ---- DOM References ----
 const form = document.getElementById('analyzeForm');
@@ -102,24 +101,91 @@ form.addEventListener('submit', async (e) => {
   showLoading();
 
   try {
-    const response = await fetch('/api/analyze', {
+    const response = await fetch('/api/analyze/stream', {
       method: 'POST',
       body: formData,
     });
 
-    const data = await response.json();
-
-    if (!response.ok || !data.success) {
+    // Validation failures come back as plain JSON before any stream starts
+    if (!response.ok || !response.body) {
+      const data = await response.json().catch(() => ({}));
       throw new Error(data.error || 'Analysis failed. Please try again.');
     }
 
-    showResults(data);
+    await consumeEventStream(response.body, handleStageEvent);
 
   } catch (err) {
     showError(err.message || 'An unexpected error occurred.');
   }
 });
 
+// ---- Streaming (Server-Sent Events over fetch) ----
+async function consumeEventStream(body, onEvent) {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      const dataLines = [];
+      frame.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+      });
+      if (dataLines.length === 0) continue; // keep-alive comment
+
+      const finished = onEvent(event, JSON.parse(dataLines.join('\n')));
+      if (finished) {
+        reader.cancel();
+        return;
+      }
+    }
+  }
+  throw new Error('The analysis stream ended unexpectedly. Please try again.');
+}
+
+function handleStageEvent(event, data) {
+  switch (event) {
+    case 'jd_summary':
+      markStepDone(0);
+      return false;
+    case 'resume_summary':
+      markStepDone(1);
+      return false;
+    case 'partial':
+      renderPartialField(data);
+      return false;
+    case 'keyword_matches':
+      renderKeywordMatches(data);
+      return false;
+    case 'analysis':
+      markStepDone(2);
+      showPartialResults(data);
+      return false;
+    case 'score':
+      markStepDone(3);
+      markStepDone(4);
+      renderScore(data);
+      renderTopActions(data.top_3_actions);
+      return false;
+    case 'done':
+      return true;
+    case 'error':
+      throw new Error(data.error || 'Analysis failed. Please try again.');
+    default:
+      return false;
+  }
+}
+
 // ---- State Transitions ----
 function showLoading() {
   hideAll();
@@ -131,7 +197,6 @@ function showLoading() {
 }
 
 function showError(message) {
-  stopLoadingSteps();
   hideAll();
   form.style.display = 'block';
   analyzeBtn.disabled = false;
@@ -139,14 +204,39 @@ function showError(message) {
   document.getElementById('errorMessage').textContent = message;
 }
 
-function showResults(data) {
-  stopLoadingSteps();
+// Analysis is ready but the score is still being computed
+function showPartialResults(analysis) {
   hideAll();
   resultsSection.style.display = 'flex';
-  renderResults(data);
+  renderPendingScore();
+  renderAnalysis(analysis);
   resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
 }
 
+// Analysis fields streamed before the stage completes; the validated analysis event re-renders them all
+const PARTIAL_ANALYSIS_RENDERERS = {
+  overall_assessment: value => renderAssessment(typeof value === 'string' ? value : ''),
+  strengths: value => renderStrengths(Array.isArray(value) ? value : []),
+  weaknesses: value => renderWeaknesses(Array.isArray(value) ? value : []),
+  missing_keywords: value => renderKeywords(Array.isArray(value) ? value : []),
+  skill_gaps: value => renderSkillGaps(Array.isArray(value) ? value : []),
+  section_improvements: value => renderSectionImprovements(Array.isArray(value) ? value : []),
+  bullet_optimizations: value => renderBulletOptimizations(Array.isArray(value) ? value : []),
+};
+
+function renderPartialField({ stage, field, value }) {
+  if (stage === 'score' && field === 'overall_score' && Number.isFinite(Number(value))) {
+    document.getElementById('scoreNumber').textContent = Math.max(0, Math.min(100, Math.round(Number(value))));
+    return;
+  }
+  const render = stage === 'analysis' && PARTIAL_ANALYSIS_RENDERERS[field];
+  if (!render) return;
+  if (resultsSection.style.display !== 'flex') {
+    showPartialResults({});
+  }
+  render(value);
+}
+
 function hideAll() {
   loadingPanel.style.display = 'none';
   errorPanel.style.display = 'none';
@@ -158,44 +248,36 @@ function resetForm() {
   form.style.display = 'block';
   analyzeBtn.disabled = false;
   currentStep = 0;
-  stopLoadingSteps();
   window.scrollTo({ top: 0, behavior: 'smooth' });
 }
 
 // ---- Loading Steps ----
+// Steps advance as stage events arrive; JD and resume parsing run in parallel.
 function startLoadingSteps() {
   const steps = document.querySelectorAll('.loading-step');
   steps.forEach(s => {
     s.classList.remove('active', 'done');
   });
   steps[0].classList.add('active');
+  steps[1].classList.add('active');
   currentStep = 0;
-
-  loadingInterval = setInterval(() => {
-    const steps = document.querySelectorAll('.loading-step');
-    if (currentStep < steps.length - 1) {
-      steps[currentStep].classList.remove('active');
-      steps[currentStep].classList.add('done');
-      currentStep++;
-      steps[currentStep].classList.add('active');
-    }
-  }, 5500);
 }
 
-function stopLoadingSteps() {
-  if (loadingInterval) {
-    clearInterval(loadingInterval);
-    loadingInterval = null;
-  }
+function markStepDone(index) {
+  const steps = document.querySelectorAll('.loading-step');
+  if (!steps[index]) return;
+  steps[index].classList.remove('active');
+  steps[index].classList.add('done');
+
+  // Activate the first step that is not finished yet
+  currentStep = Array.from(steps).findIndex(s => !s.classList.contains('done'));
+  if (currentStep !== -1) steps[currentStep].classList.add('active');
 }
 
-// ---- Results Rendering ----
-function renderResults(data) {
-  const { analysis, score } = data;
 
-  renderScore(score);
+// ---- Results Rendering ----
+function renderAnalysis(analysis) {
   renderAssessment(analysis.overall_assessment);
-  renderTopActions(score.top_3_actions);
   renderStrengths(analysis.strengths);
   renderWeaknesses(analysis.weaknesses);
   renderKeywords(analysis.missing_keywords);
@@ -204,6 +286,17 @@ function renderResults(data) {
   renderBulletOptimizations(analysis.bullet_optimizations);
 }
 
+function renderPendingScore() {
+  document.getElementById('scoreNumber').textContent = '—';
+  const badge = document.getElementById('scoreBadge');
+  badge.textContent = 'Scoring…';
+  badge.className = 'score-badge';
+  document.getElementById('scoreRationale').textContent = '';
+  document.getElementById('dimensionsGrid').innerHTML = '';
+  document.getElementById('hiringRec').innerHTML = '';
+  document.getElementById('topActionsSection').style.display = 'none';
+}
+
 function renderScore(score) {
   // Animate score number
   animateNumber(
@@ -215,7 +308,8 @@ function renderScore(score) {
 
   // Badge
   const badge = document.getElementById('scoreBadge');
-  badge.textContent = score.score_label;
+  // Local fallback scores (the request ran out of time) are labelled as estimates
+  badge.textContent = score.degraded ? `${score.score_label} (estimate)` : score.score_label;
   badge.className = 'score-badge ' + getScoreClass(score.overall_score);
 
   // Rationale
@@ -275,6 +369,7 @@ function renderAssessment(text) {
 function renderTopActions(actions) {
   const section = document.getElementById('topActionsSection');
   if (!actions || actions.length === 0) { section.style.display = 'none'; return; }
+  section.style.display = '';
   section.innerHTML = `
     <div class="top-actions-title">Priority Actions</div>
     <div class="top-actions-list">
@@ -333,6 +428,26 @@ function renderKeywords(items) {
   `).join('');
 }
 
+// Every hit comes from scanning the whole resume; hovering a found keyword shows where it first appears
+function renderKeywordMatches(matches) {
+  const el = document.getElementById('keywordMatchesList');
+  const section = document.getElementById('keywordMatchesSection');
+  const found = (matches && matches.found) || [];
+  const missing = (matches && matches.missing) || [];
+  if (found.length === 0 && missing.length === 0) { section.style.display = 'none'; return; }
+  section.style.display = '';
+  el.innerHTML = found.map(item => `
+    <div class="keyword-chip found" title="…${esc(item.context)}…">
+      <span class="keyword-name">${esc(item.keyword)}</span>
+      <span class="keyword-importance">×${esc(item.count)}</span>
+    </div>
+  `).join('') + missing.map(keyword => `
+    <div class="keyword-chip absent" title="Not found anywhere in the resume">
+      <span class="keyword-name">${esc(keyword)}</span>
+    </div>
+  `).join('');
+}
+
 function renderSkillGaps(items) {
   const el = document.getElementById('skillGapsList');
   const section = document.getElementById('skillGapsSection');
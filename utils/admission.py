@@ -0,0 +1,317 @@
+"""
+CVAlign Lens — Admission Control
+Adaptive concurrency limit in front of the analysis pipeline. The limit
+follows AIMD on LLM call latency and rate limits: it grows by one per
+limit's worth of healthy calls and shrinks multiplicatively when calls slow
+down or the provider returns 429s. Requests over the limit wait in a bounded
+queue that is served round-robin across clients; those that cannot be
+started within their wait budget are rejected at once with a Retry-After.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+
+from utils.metrics import ADMISSION_DECISIONS
+from utils.timing import LatencyWindow
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(RuntimeError):
+    """
+    Raised when a request is shed instead of admitted. status is 429 when the
+    client already has its fair share queued, 503 when the server is saturated.
+    """
+
+    def __init__(self, message: str, status: int, retry_after: float):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    # One queued request; granted and shed are only changed under the controller lock
+    __slots__ = ("client", "deadline", "granted", "shed", "event", "loop", "future")
+
+    def __init__(self, client: str, deadline: float, loop=None):
+        self.client = client
+        self.deadline = deadline
+        self.granted = False
+        self.shed = False
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """
+    Concurrency limit, wait queue, and load shedding shared by every request
+    thread and the event loop of one worker process.
+    """
+
+    def __init__(self, initial_limit: float = 16, min_limit: int = 1, max_limit: int = 64, queue_size: int = 128,
+                 client_queue_size: int = 16, max_wait: float = 30, latency_target: float = 0,
+                 latency_tolerance: float = 2.0, backoff: float = 0.7, backoff_interval: float = 1.0,
+                 min_samples: int = 20):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.queue_size = queue_size
+        self.client_queue_size = client_queue_size
+        self.max_wait = max_wait
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.backoff_interval = backoff_interval
+        self.min_samples = min_samples
+
+        self.in_flight = 0
+        self._queues = OrderedDict()  # client -> deque of waiting tickets, in round-robin order
+        self._queued = 0
+        self._service_seconds = None  # moving average of how long an admitted request holds its slot
+        self._latency = {}
+        self._backoff_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Build a controller from the ADMISSION_* environment variables."""
+        return cls(
+            initial_limit=float(os.getenv("ADMISSION_INITIAL_LIMIT", 16)),
+            min_limit=int(os.getenv("ADMISSION_MIN_LIMIT", 1)),
+            max_limit=int(os.getenv("ADMISSION_MAX_LIMIT", 64)),
+            queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", 128)),
+            client_queue_size=int(os.getenv("ADMISSION_CLIENT_QUEUE_SIZE", 16)),
+            max_wait=float(os.getenv("ADMISSION_MAX_WAIT", 30)),
+            latency_target=float(os.getenv("ADMISSION_LATENCY_TARGET", 0)),
+            latency_tolerance=float(os.getenv("ADMISSION_LATENCY_TOLERANCE", 2.0)),
+            backoff=float(os.getenv("ADMISSION_BACKOFF", 0.7)),
+            backoff_interval=float(os.getenv("ADMISSION_BACKOFF_INTERVAL", 1.0)),
+        )
+
+    @contextmanager
+    def admit(self, client: str, max_wait: float = None):
+        """
+        Hold one concurrency slot for the with-block, waiting in the client's
+        queue if the limit is reached.
+
+        Args:
+            client: Fair-queuing key, e.g. a client id header or remote address.
+            max_wait: Seconds the request may wait to start (default: max_wait).
+
+        Raises:
+            AdmissionRejected: If the request is shed, either up front or after
+                waiting max_wait without getting a slot.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        ticket = self._enqueue(client, max_wait, None)
+        if ticket is not None:
+            ticket.event.wait(max_wait)
+            self._settle(ticket, max_wait)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    @asynccontextmanager
+    async def aadmit(self, client: str, max_wait: float = None):
+        """Async form of admit(): queued coroutines wait in the event loop instead of holding a thread."""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        ticket = self._enqueue(client, max_wait, asyncio.get_running_loop())
+        if ticket is not None:
+            try:
+                await asyncio.wait_for(ticket.future, max_wait)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # The client went away while queued; give back the slot if it was granted meanwhile
+                if self._withdraw(ticket):
+                    self._release(None)
+                raise
+            self._settle(ticket, max_wait)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def observe(self, stage: str, seconds: float = None, rate_limited: bool = False) -> None:
+        """
+        Feed one LLM call outcome into the limit (an LLMClient listener).
+        A 429, or a call slower than the stage's latency target, shrinks the
+        limit at most once per backoff interval, and queued requests that can
+        no longer start in time are shed; any other completed call grows the
+        limit by 1/limit while the limit is actually in use.
+        """
+        with self._lock:
+            congested = rate_limited
+            if seconds is not None:
+                window = self._latency.get(stage)
+                if window is None:
+                    window = self._latency[stage] = LatencyWindow(200)
+                target = self._latency_target(window)
+                congested = congested or (target is not None and seconds > target)
+                window.add(seconds)
+
+            now = time.monotonic()
+            if congested:
+                if now >= self._backoff_until:
+                    previous = self.limit
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self._backoff_until = now + self.backoff_interval
+                    self._shed_hopeless(now)
+                    logger.info(
+                        f"Admission limit {previous:.1f} -> {self.limit:.1f} "
+                        f"({'rate limited' if rate_limited else f'{stage} took {seconds:.2f}s'})"
+                    )
+            elif seconds is not None and self.in_flight >= int(self.limit) / 2:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                self._dispatch()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": self._queued,
+                "queued_clients": len(self._queues),
+                "service_ms": round(self._service_seconds * 1000, 2) if self._service_seconds else None,
+            }
+
+    def _latency_target(self, window: LatencyWindow) -> float:
+        # Absolute target if configured, else a multiple of the stage's median latency
+        if self.latency_target > 0:
+            return self.latency_target
+        if len(window) < self.min_samples:
+            return None
+        return self.latency_tolerance * window.percentile(50)
+
+    def _enqueue(self, client: str, max_wait: float, loop) -> _Ticket:
+        # Take a free slot (returns None) or queue a ticket; raise if the request should be shed
+        with self._lock:
+            if not self._queued and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                ADMISSION_DECISIONS.inc(outcome="admitted")
+                return None
+
+            waiting = self._queues.get(client)
+            ahead = self._ahead(len(waiting) if waiting else 0)
+            if waiting is not None and len(waiting) >= self.client_queue_size:
+                ADMISSION_DECISIONS.inc(outcome="rejected_client")
+                raise AdmissionRejected(
+                    "Too many analyses queued for this client. Please retry shortly.",
+                    429, self._retry_after(ahead),
+                )
+            if self._queued >= self.queue_size:
+                ADMISSION_DECISIONS.inc(outcome="rejected_queue")
+                raise AdmissionRejected(
+                    "The analysis service is at capacity. Please try again shortly.", 503, self._retry_after(ahead)
+                )
+            estimate = self._estimated_wait(ahead)
+            if estimate is not None and estimate > max_wait:
+                ADMISSION_DECISIONS.inc(outcome="rejected_deadline")
+                raise AdmissionRejected(
+                    "The analysis service is at capacity. Please try again shortly.", 503, estimate
+                )
+
+            ticket = _Ticket(client, time.monotonic() + max_wait, loop)
+            if waiting is None:
+                waiting = self._queues[client] = deque()
+            waiting.append(ticket)
+            self._queued += 1
+            ADMISSION_DECISIONS.inc(outcome="queued")
+            return ticket
+
+    def _settle(self, ticket: _Ticket, max_wait: float) -> None:
+        # The wait ended: proceed if a slot was granted, else the request is shed
+        if self._withdraw(ticket):
+            return
+        if not ticket.shed:
+            ADMISSION_DECISIONS.inc(outcome="timed_out")
+        raise AdmissionRejected(
+            f"The analysis could not start within {max_wait:g}s. Please try again shortly.",
+            503, self._retry_after(self._queued),
+        )
+
+    def _withdraw(self, ticket: _Ticket) -> bool:
+        # Remove a still-waiting ticket from its queue; True if it had already been granted a slot
+        with self._lock:
+            if ticket.granted:
+                return True
+            if ticket.shed:
+                return False
+            waiting = self._queues.get(ticket.client)
+            if waiting is not None:
+                waiting.remove(ticket)
+                self._queued -= 1
+                if not waiting:
+                    del self._queues[ticket.client]
+            return False
+
+    def _release(self, held: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if held is not None:
+                self._service_seconds = held if self._service_seconds is None else (
+                    0.9 * self._service_seconds + 0.1 * held
+                )
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Hand free slots to waiters, one client at a time in round-robin order (lock held)
+        while self._queues and self.in_flight < int(self.limit):
+            client, waiting = next(iter(self._queues.items()))
+            ticket = waiting.popleft()
+            if waiting:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+            self._queued -= 1
+            self.in_flight += 1
+            ticket.granted = True
+            ticket.wake()
+
+    def _shed_hopeless(self, now: float) -> None:
+        # After the limit drops, wake and reject waiters whose estimated start is past their deadline (lock held)
+        for client, waiting in list(self._queues.items()):
+            for position, ticket in enumerate(list(waiting)):
+                estimate = self._estimated_wait(self._ahead(position) - 1)
+                if estimate is None or now + estimate <= ticket.deadline:
+                    continue
+                waiting.remove(ticket)
+                self._queued -= 1
+                ticket.shed = True
+                ticket.wake()
+                ADMISSION_DECISIONS.inc(outcome="rejected_deadline")
+            if not waiting:
+                del self._queues[client]
+
+    def _ahead(self, own: int) -> int:
+        # Waiters served before a new ticket at position own in its client's queue (lock held)
+        return sum(min(len(waiting), own + 1) for waiting in self._queues.values())
+
+    def _estimated_wait(self, ahead: int) -> float:
+        if self._service_seconds is None:
+            return None
+        return (ahead + 1) / max(1, int(self.limit)) * self._service_seconds
+
+    def _retry_after(self, ahead: int) -> float:
+        estimate = self._estimated_wait(ahead)
+        return max(1.0, estimate) if estimate is not None else 1.0
@@ -0,0 +1,355 @@
+"""
+CVAlign Lens — Caching Utilities
+Content-addressed caching for expensive, deterministic pipeline stages:
+an in-memory LRU/TTL tier, an optional SQLite disk tier that survives
+restarts, and single-flight coalescing of concurrent misses, for both
+threaded and coroutine callers.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.metrics import CACHE_REQUESTS
+
+
+_MISSING = object()
+
+
+def fingerprint(*parts) -> str:
+    """
+    Build a stable SHA-256 hex digest from an ordered sequence of parts.
+
+    Strings and bytes are hashed as-is; anything else is serialized as
+    canonical JSON first. Each part is length-prefixed so that
+    ("ab", "c") and ("a", "bc") never collide.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            data = part.encode("utf-8")
+        elif isinstance(part, bytes):
+            data = part
+        else:
+            data = json.dumps(part, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    SQLite-backed JSON key/value store shared across processes and restarts.
+    Several caches can share one database file; each uses its own namespace.
+    """
+
+    def __init__(self, path: str, namespace: str, ttl: float = None):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None:
+            return default
+        value, stored_at = row
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            self.delete(key)
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, value) -> None:
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.namespace, key, payload, time.time()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def prune(self) -> int:
+        """Remove expired entries for this namespace. Returns the number removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND stored_at < ?",
+                (self.namespace, time.time() - self.ttl),
+            )
+        return cursor.rowcount
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+    The first caller runs the function; everyone else arriving before it
+    finishes waits for and shares its result (or its exception).
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.value = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        """
+        Run fn() once per key among concurrent callers.
+
+        Returns:
+            tuple: (value, shared) where shared is True if this caller
+            reused another caller's in-flight execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines: concurrent awaiters of the same key share
+    one in-flight task. Used from a single event loop.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: str, fn):
+        """
+        Await fn() once per key among concurrent callers.
+
+        Returns:
+            tuple: (value, shared), as SingleFlight.do.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            # shield: one waiter being cancelled must not cancel the shared load
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        try:
+            return await asyncio.shield(task), False
+        finally:
+            if task.done():
+                self._calls.pop(key, None)
+            else:
+                task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+
+class TieredCache:
+    """
+    Memory LRU in front of an optional disk tier, with single-flight loading
+    and hit/miss/coalesce counters. Values must be JSON-serializable; callers
+    always receive their own deep copy.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, ttl: float = None, disk_path: str = None):
+        self.name = name
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.disk = DiskCache(disk_path, namespace=name, ttl=ttl) if disk_path else None
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        self._stats_lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, max_entries: int = 256, ttl: float = None):
+        """
+        Build a cache configured by <PREFIX>_SIZE, <PREFIX>_TTL and <PREFIX>_PATH,
+        falling back to CACHE_DB_PATH for the disk tier.
+        """
+        size = int(os.getenv(f"{prefix}_SIZE", max_entries))
+        ttl_env = os.getenv(f"{prefix}_TTL")
+        if ttl_env:
+            ttl = float(ttl_env) if float(ttl_env) > 0 else None
+        disk_path = os.getenv(f"{prefix}_PATH") or os.getenv("CACHE_DB_PATH") or None
+        return cls(name, max_entries=size, ttl=ttl, disk_path=disk_path)
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count("hits")
+            return copy.deepcopy(value)
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                self._count("disk_hits")
+                return copy.deepcopy(value)
+        return default
+
+    def set(self, key: str, value) -> None:
+        value = copy.deepcopy(value)
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def get_or_compute(self, key: str, compute, cacheable=None):
+        """
+        Return the cached value for key, computing it at most once across
+        concurrent callers on a miss. Exceptions are not cached, nor are
+        values for which the optional cacheable(value) predicate is false.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def load():
+            # Another flight may have populated the cache while we queued.
+            cached = self.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+            self._count("misses")
+            try:
+                result = compute()
+            except Exception:
+                self._count("errors")
+                raise
+            if cacheable is None or cacheable(result):
+                self.set(key, result)
+            return result
+
+        value, shared = self._flight.do(key, load)
+        if shared:
+            self._count("coalesced")
+        return copy.deepcopy(value)
+
+    async def aget_or_compute(self, key: str, compute, cacheable=None):
+        """
+        Coroutine form of get_or_compute(): compute is an async callable, and
+        concurrent awaiters of one missing key share a single computation.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        async def load():
+            cached = self.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+            self._count("misses")
+            try:
+                result = await compute()
+            except Exception:
+                self._count("errors")
+                raise
+            if cacheable is None or cacheable(result):
+                self.set(key, result)
+            return result
+
+        value, shared = await self._async_flight.do(key, load)
+        if shared:
+            self._count("coalesced")
+        return copy.deepcopy(value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"] + stats["coalesced"]
+        served = lookups - stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 4) if lookups else 0.0
+        stats["size"] = len(self.memory)
+        stats["max_entries"] = self.memory.max_entries
+        stats["ttl"] = self.memory.ttl
+        stats["disk"] = self.disk.path if self.disk else None
+        return stats
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            self._counters[counter] += 1
+        CACHE_REQUESTS.inc(cache=self.name, result=counter)
@@ -0,0 +1,92 @@
+"""
+CVAlign Lens — Concurrency Utilities
+Process-wide bounded thread pool for running independent pipeline stages in
+parallel, and a process pool for CPU-bound work such as file text extraction.
+"""
+
+import contextvars
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+# Pool name -> (size env var, default size). Work that waits on a pool must
+# never run on that same pool, so nested fan-out gets its own.
+_POOL_SIZES = {
+    "pipeline-stage": ("PIPELINE_WORKERS", 8),
+    "resume-section": ("RESUME_SECTION_WORKERS", 4),
+    "llm-request": ("LLM_REQUEST_WORKERS", 32),
+}
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool that runs each task in a copy of the submitting thread's context (request trace)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def get_executor(name: str = "pipeline-stage") -> ContextThreadPoolExecutor:
+    """
+    Return a shared, named thread pool, creating it on first use.
+    The stage pool is bounded by PIPELINE_WORKERS (default 8) so a burst of
+    requests cannot open an unbounded number of concurrent LLM calls; the
+    resume-section pool used by section-wise resume parsing by
+    RESUME_SECTION_WORKERS (default 4); the llm-request pool that runs
+    deadline-bound and hedged LLM requests by LLM_REQUEST_WORKERS (default 32).
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                env_var, default = _POOL_SIZES[name]
+                executor = ContextThreadPoolExecutor(
+                    max_workers=int(os.getenv(env_var, default)), thread_name_prefix=name
+                )
+                _executors[name] = executor
+    return executor
+
+
+_process_pool = None
+_process_pool_pid = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, creating it on first use in this process
+    (a pool inherited across a fork is never reused). Its size is set by
+    EXTRACTION_WORKERS (default 2); workers are spawned rather than forked so
+    they never inherit the threads and locks of a running server.
+    """
+    global _process_pool, _process_pool_pid
+    if _process_pool is None or _process_pool_pid != os.getpid():
+        with _process_pool_lock:
+            if _process_pool is None or _process_pool_pid != os.getpid():
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=max(1, int(os.getenv("EXTRACTION_WORKERS", 2))),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                _process_pool_pid = os.getpid()
+    return _process_pool
+
+
+def reset_process_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Kill the worker processes of a pool with a stuck task and discard it;
+    the next get_process_pool() call starts a fresh one. Work still running
+    in the old pool fails with BrokenProcessPool.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    # ProcessPoolExecutor has no public way to stop a running task
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
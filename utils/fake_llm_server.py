@@ -0,0 +1,158 @@
+"""
+CVAlign Lens — Fake LLM Server
+A local stand-in that speaks the OpenAI/Groq chat-completions wire format and
+answers with the offline stub's schema-valid JSON after a simulated delay.
+
+Run it, then point the Groq backend at it:
+
+    python -m utils.fake_llm_server --port 8008 --latency lognormal:0.8:0.4
+    GROQ_BASE_URL=http://127.0.0.1:8008 GROQ_API_KEY=fake python app.py
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.llm_backends import stream_chunks
+from utils.llm_stub import LatencyModel, StubResponder
+
+
+CHAT_COMPLETION_PATHS = {"/openai/v1/chat/completions", "/v1/chat/completions"}
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the latency model and responder shared by handlers."""
+
+    daemon_threads = True
+    # Load tests open hundreds of connections at once; the default backlog is 5
+    request_queue_size = 1024
+
+    def __init__(self, address, latency: LatencyModel, responder: StubResponder = None, error_rate: float = 0.0):
+        super().__init__(address, ChatCompletionsHandler)
+        self.latency = latency
+        self.responder = responder or StubResponder()
+        self.error_rate = error_rate
+        self.requests_served = 0
+        self._counter_lock = threading.Lock()
+
+    def next_request_number(self) -> int:
+        with self._counter_lock:
+            self.requests_served += 1
+            return self.requests_served
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path not in CHAT_COMPLETION_PATHS:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Request body is not valid JSON."}})
+            return
+
+        number = self.server.next_request_number()
+        if self.server.error_rate and (number * 0.6180339887) % 1 < self.server.error_rate:
+            self._send_json(429, {"error": {"message": "Simulated rate limit."}}, {"Retry-After": "1"})
+            return
+
+        messages = body.get("messages") or []
+        system_prompt = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user_prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+
+        delay = self.server.latency.sample()
+        text = self.server.responder.respond(system_prompt, user_prompt)
+        prompt_tokens = (len(system_prompt) + len(user_prompt)) // 4
+        completion_tokens = len(text) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if body.get("stream"):
+            self._send_stream(body.get("model", "fake-model"), text, delay, usage)
+            return
+
+        time.sleep(delay)
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _send_stream(self, model: str, text: str, delay: float, usage: dict):
+        # Server-sent chat.completion.chunk events, the delay spread over the chunks
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = stream_chunks(text)
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": model}
+        for number, piece in enumerate(chunks, 1):
+            time.sleep(delay / len(chunks))
+            finish = "stop" if number == len(chunks) else None
+            event = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": finish}]}
+            if finish:
+                event["x_groq"] = {"usage": usage}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI/Groq-compatible fake LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:S | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of calls sent to the slow tail")
+    parser.add_argument("--slow-seconds", type=float, default=20.0, help="Latency of slow-tail calls")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    latency = LatencyModel(args.latency, args.slow_rate, args.slow_seconds, args.seed)
+    server = FakeLLMServer((args.host, args.port), latency, error_rate=args.error_rate)
+    print(f"Fake LLM server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
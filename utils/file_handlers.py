@@ -1,20 +1,49 @@
 """
 CVAlign Lens — File Handler Utility
 Handles file upload validation and text extraction from supported formats.
+Extraction runs in a separate process with a per-file timeout, and results
+are cached by file content so a re-uploaded resume is not parsed twice.
 """
 
+import hashlib
 import io
+import logging
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
 from werkzeug.datastructures import FileStorage
 
+from utils.cache import TieredCache
+from utils.concurrency import get_process_pool, reset_process_pool
+from utils.metrics import FILE_EXTRACTION_SECONDS
+
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_EXTENSIONS = {"pdf", "txt", "doc", "docx"}
 MAX_TEXT_LENGTH = 15000  # ~3000 words, sufficient for any resume
 
+# pdfplumber (default) keeps the closest reading order; pdfium is several times faster
+PDF_ENGINES = ("pdfplumber", "pdfium")
+
 # Note: For PDF and DOCX processing, ensure the required libraries (pdfplumber, python-docx) are installed in your environment.
 
 class FileHandler:
     """Handles uploaded resume file validation and text extraction."""
 
+    def __init__(self, cache: TieredCache = None):
+        self.cache = cache if cache is not None else TieredCache.from_env(
+            "file_text", prefix="FILE_CACHE", max_entries=256, ttl=24 * 3600
+        )
+        # 0 extracts on the calling thread (no process pool, no timeout)
+        self.workers = int(os.getenv("EXTRACTION_WORKERS", 2))
+        self.timeout = float(os.getenv("EXTRACTION_TIMEOUT", 20))
+        self.pdf_engine = os.getenv("PDF_TEXT_ENGINE", "pdfplumber").strip().lower()
+        if self.pdf_engine not in PDF_ENGINES:
+            raise ValueError(f"Unknown PDF_TEXT_ENGINE '{self.pdf_engine}'. Choose one of: {', '.join(PDF_ENGINES)}.")
+
     def extract_text(self, file: FileStorage) -> dict:
         """ Extract text content from an uploaded file.
         Args:
@@ -36,50 +65,145 @@ class FileHandler:
         if len(file_bytes) == 0:
             return {"error": "Uploaded file is empty."}
 
-        if extension == "pdf":
-            return self._extract_from_pdf(file_bytes)
-        elif extension == "txt":
-            return self._extract_from_txt(file_bytes)
-        elif extension in {"doc", "docx"}:
-            return self._extract_from_docx(file_bytes)
+        started = time.perf_counter()
+        engine = self.pdf_engine if extension == "pdf" else ""
+        key = f"{hashlib.sha256(file_bytes).hexdigest()}:{extension}:{engine}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            FILE_EXTRACTION_SECONDS.observe(time.perf_counter() - started, extension=extension, outcome="cached")
+            return cached
 
-        return {"error": "Could not process file."}
+        result = self._run_extraction(extension, file_bytes)
+        # Only successes are cached; errors may be transient (timeouts)
+        if "text" in result:
+            self.cache.set(key, result)
+        FILE_EXTRACTION_SECONDS.observe(
+            time.perf_counter() - started, extension=extension, outcome="ok" if "text" in result else "error"
+        )
+        return result
 
-    def _extract_from_pdf(self, file_bytes: bytes) -> dict:
-        try:
-            import pdfplumber
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                pages = [page.extract_text() or "" for page in pdf.pages]
-                text = "\n".join(pages).strip()
-            if not text:
-                return {"error": "PDF appears to be image-based or empty. Please paste your resume text instead."}
-            return {"text": text[:MAX_TEXT_LENGTH]}
-        except ImportError:
-            return {"error": "PDF processing library not available. Please paste your resume text instead."}
-        except Exception as e:
-            return {"error": f"Could not read PDF: {str(e)}"}
-
-    def _extract_from_txt(self, file_bytes: bytes) -> dict:
-        try:
-            text = file_bytes.decode("utf-8", errors="ignore").strip()
-            if not text:
-                return {"error": "Text file is empty."}
-            return {"text": text[:MAX_TEXT_LENGTH]}
-        except Exception as e:
-            return {"error": f"Could not read text file: {str(e)}"}
-
-    def _extract_from_docx(self, file_bytes: bytes) -> dict:
-        try:
-            import docx
-            document = docx.Document(io.BytesIO(file_bytes))
-            text = "\n".join([p.text for p in document.paragraphs]).strip()
-            if not text:
-                return {"error": "DOCX file appears to be empty."}
-            return {"text": text[:MAX_TEXT_LENGTH]}
-        except ImportError:
-            return {"error": "DOCX processing library not available. Please paste your resume text instead."}
-        except Exception as e:
-            return {"error": f"Could not read DOCX file: {str(e)}"}
+    def _run_extraction(self, extension: str, file_bytes: bytes) -> dict:
+        if self.workers <= 0:
+            return _extract_bytes(extension, file_bytes, self.pdf_engine)
+
+        for attempt in range(2):
+            pool = get_process_pool()
+            try:
+                future = pool.submit(_extract_bytes, extension, file_bytes, self.pdf_engine)
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                logger.warning(f"Text extraction of a .{extension} file timed out after {self.timeout:g}s")
+                reset_process_pool(pool)
+                return {"error": "File took too long to process. Please paste your resume text instead."}
+            except BrokenProcessPool:
+                # Another request's timeout killed this pool; retry once on a fresh one
+                reset_process_pool(pool)
+                if attempt:
+                    return {"error": "Could not process file."}
+        return {"error": "Could not process file."}
 
     def _get_extension(self, filename: str) -> str:
         return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+def _extract_bytes(extension: str, file_bytes: bytes, pdf_engine: str = "pdfplumber") -> dict:
+    """Extraction entry point; runs inside a process-pool worker."""
+    if extension == "pdf":
+        if pdf_engine == "pdfium":
+            return _extract_from_pdf_pdfium(file_bytes)
+        return _extract_from_pdf(file_bytes)
+    elif extension == "txt":
+        return _extract_from_txt(file_bytes)
+    elif extension in {"doc", "docx"}:
+        return _extract_from_docx(file_bytes)
+    return {"error": "Could not process file."}
+
+
+def _collect(parts) -> str:
+    """
+    Join text parts with newlines, stopping as soon as the result is certain
+    to exceed MAX_TEXT_LENGTH. Gives the same output as joining every part,
+    stripping, and slicing.
+    """
+    collected = []
+    size = 0
+    for part in parts:
+        collected.append(part)
+        size += len(part) + 1
+        if size > MAX_TEXT_LENGTH and len("\n".join(collected).strip()) > MAX_TEXT_LENGTH:
+            break
+    return "\n".join(collected).strip()[:MAX_TEXT_LENGTH]
+
+
+def _extract_from_pdf(file_bytes: bytes) -> dict:
+    try:
+        import pdfplumber
+
+        def page_texts(pdf):
+            for page in pdf.pages:
+                text = page.extract_text() or ""
+                page.close()  # release the page's parsed objects
+                yield text
+
+        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+            text = _collect(page_texts(pdf))
+        if not text:
+            return {"error": "PDF appears to be image-based or empty. Please paste your resume text instead."}
+        return {"text": text}
+    except ImportError:
+        return {"error": "PDF processing library not available. Please paste your resume text instead."}
+    except Exception as e:
+        return {"error": f"Could not read PDF: {str(e)}"}
+
+
+def _extract_from_pdf_pdfium(file_bytes: bytes) -> dict:
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        return _extract_from_pdf(file_bytes)
+
+    try:
+        def page_texts(pdf):
+            for index in range(len(pdf)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range().replace("\r\n", "\n")
+                finally:
+                    textpage.close()
+                    page.close()
+
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            text = _collect(page_texts(pdf))
+        finally:
+            pdf.close()
+        if not text:
+            return {"error": "PDF appears to be image-based or empty. Please paste your resume text instead."}
+        return {"text": text}
+    except Exception as e:
+        return {"error": f"Could not read PDF: {str(e)}"}
+
+
+def _extract_from_txt(file_bytes: bytes) -> dict:
+    try:
+        text = file_bytes.decode("utf-8", errors="ignore").strip()
+        if not text:
+            return {"error": "Text file is empty."}
+        return {"text": text[:MAX_TEXT_LENGTH]}
+    except Exception as e:
+        return {"error": f"Could not read text file: {str(e)}"}
+
+
+def _extract_from_docx(file_bytes: bytes) -> dict:
+    try:
+        import docx
+        document = docx.Document(io.BytesIO(file_bytes))
+        text = _collect(p.text for p in document.paragraphs)
+        if not text:
+            return {"error": "DOCX file appears to be empty."}
+        return {"text": text}
+    except ImportError:
+        return {"error": "DOCX processing library not available. Please paste your resume text instead."}
+    except Exception as e:
+        return {"error": f"Could not read DOCX file: {str(e)}"}
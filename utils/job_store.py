@@ -0,0 +1,249 @@
+"""
+CVAlign Lens — Job Store
+SQLite-backed persistence for asynchronous analysis jobs. Shared by every
+worker process and durable across restarts.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class IdempotencyConflict(Exception):
+    """Raised when an idempotency key is reused with different inputs."""
+
+
+class JobStore:
+    """
+    Persists job inputs, status, per-stage progress, and results.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " idempotency_key TEXT UNIQUE,"
+                " input_hash TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " jd_text TEXT NOT NULL,"
+                " resume_text TEXT NOT NULL,"
+                " scoring_mode TEXT,"
+                " pipeline_mode TEXT,"
+                " progress TEXT NOT NULL DEFAULT '{}',"
+                " result TEXT,"
+                " error TEXT,"
+                " error_status INTEGER,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " worker TEXT,"
+                " run_after REAL NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._add_columns({
+                "worker": "TEXT", "run_after": "REAL NOT NULL DEFAULT 0",
+                "scoring_mode": "TEXT", "pipeline_mode": "TEXT",
+            })
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+
+    def create(self, jd_text: str, resume_text: str, input_hash: str, idempotency_key: str = None,
+               scoring_mode: str = None, pipeline_mode: str = None) -> tuple:
+        """
+        Insert a new queued job, or return the existing one for a reused idempotency key.
+        The mode overrides are stored with the inputs; None runs the server default.
+
+        Returns:
+            tuple: (job dict, created) where created is False for a reused job.
+
+        Raises:
+            IdempotencyConflict: If the key was already used for different inputs.
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            # One statement, so two processes submitting the same key cannot both insert
+            created = self._conn.execute(
+                "INSERT INTO jobs (id, idempotency_key, input_hash, status, jd_text, resume_text, scoring_mode,"
+                " pipeline_mode, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (idempotency_key) DO NOTHING",
+                (
+                    job_id, idempotency_key, input_hash, JOB_QUEUED, jd_text, resume_text, scoring_mode,
+                    pipeline_mode, now, now,
+                ),
+            ).rowcount == 1
+            if not created:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+        if created:
+            return self.get(job_id), True
+        if row["input_hash"] != input_hash:
+            raise IdempotencyConflict("This idempotency key was already used for a different analysis request.")
+        return self._to_dict(row), False
+
+    def get(self, job_id: str, include_inputs: bool = False) -> dict:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row, include_inputs) if row is not None else None
+
+    def claim(self, job_id: str, worker: str = None) -> dict:
+        """
+        Atomically move a queued job to running, recording the worker process
+        that runs it. Returns the job with its inputs, or None if another
+        worker already claimed it or it is deferred to a later time.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, updated_at = ?"
+                " WHERE id = ? AND status = ? AND run_after <= ?",
+                (JOB_RUNNING, worker, now, job_id, JOB_QUEUED, now),
+            )
+        if cursor.rowcount != 1:
+            return None
+        return self.get(job_id, include_inputs=True)
+
+    def record_stage(self, job_id: str, stage: str) -> None:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            progress = json.loads(row["progress"])
+            progress[stage] = round(time.time(), 3)
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id),
+            )
+
+    def complete(self, job_id: str, result: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?",
+                (JOB_SUCCEEDED, json.dumps(result), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str, error_status: int = 500) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, error_status = ?, updated_at = ? WHERE id = ?",
+                (JOB_FAILED, error, error_status, time.time(), job_id),
+            )
+
+    def defer(self, job_id: str, delay: float) -> None:
+        """Return a running job to the queue, not to be claimed for another delay seconds."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, run_after = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (JOB_QUEUED, now + delay, now, job_id, JOB_RUNNING),
+            )
+
+    def running(self) -> list:
+        """(job id, worker, updated_at) of every running job."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, worker, updated_at FROM jobs WHERE status = ?", (JOB_RUNNING,)
+            ).fetchall()
+        return [(row["id"], row["worker"], row["updated_at"]) for row in rows]
+
+    def requeue(self, claims: list, max_attempts: int = None) -> tuple:
+        """
+        Return orphaned running jobs (their worker died mid-flight) to the
+        queue. A job that has already been claimed max_attempts times keeps
+        crashing its worker, so it is failed instead.
+
+        Args:
+            claims: (job id, worker) pairs from running(); a job finished or
+                reclaimed by another worker since is left alone.
+            max_attempts: Optional cap on claims per job.
+
+        Returns:
+            tuple: (number requeued, number failed)
+        """
+        requeued = failed = 0
+        with self._lock, self._conn:
+            for job_id, worker in claims:
+                now = time.time()
+                if max_attempts and self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, error_status = ?, updated_at = ?"
+                    " WHERE id = ? AND status = ? AND worker IS ? AND attempts >= ?",
+                    (
+                        JOB_FAILED, f"Analysis did not complete after {max_attempts} attempts.", 500,
+                        now, job_id, JOB_RUNNING, worker, max_attempts,
+                    ),
+                ).rowcount:
+                    failed += 1
+                    continue
+                requeued += self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, updated_at = ?"
+                    " WHERE id = ? AND status = ? AND worker IS ?",
+                    (JOB_QUEUED, now, job_id, JOB_RUNNING, worker),
+                ).rowcount
+        return requeued, failed
+
+    def prune(self, older_than: float) -> int:
+        """
+        Delete finished jobs (inputs and results included) last updated more
+        than older_than seconds ago. Returns the number deleted.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_SUCCEEDED, JOB_FAILED, time.time() - older_than),
+            )
+        return cursor.rowcount
+
+    def queued_ids(self) -> list:
+        """Ids of the queued jobs that may be claimed now, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND run_after <= ? ORDER BY created_at",
+                (JOB_QUEUED, time.time()),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def _add_columns(self, columns: dict) -> None:
+        # Bring a job database created by an older version up to the current schema
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for name, definition in columns.items():
+            if name in existing:
+                continue
+            try:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+            except sqlite3.OperationalError as e:
+                # Another process added it first
+                if "duplicate column" not in str(e):
+                    raise
+
+    def _to_dict(self, row, include_inputs: bool = False) -> dict:
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "progress": json.loads(row["progress"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "error_status": row["error_status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        if include_inputs:
+            job["jd_text"] = row["jd_text"]
+            job["resume_text"] = row["resume_text"]
+            job["scoring_mode"] = row["scoring_mode"]
+            job["pipeline_mode"] = row["pipeline_mode"]
+        return job
@@ -0,0 +1,205 @@
+"""
+CVAlign Lens — Incremental JSON Parser
+Parses an LLM reply as it streams in and reports each member of the reply's
+object as soon as its value closes, instead of waiting for the whole
+completion. Text before the first "{" (a ```json fence, a preamble) and
+after the matching "}" (a closing fence, trailing prose) is skipped as it
+arrives, so every character is examined once.
+"""
+
+import json
+import re
+
+
+# Inside a string only a quote or a backslash can change the scanner state
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = " \t\r\n"
+
+# Scanner states of the innermost object being assembled
+_KEY_OR_END = "key_or_end"    # after "{" : a key or "}"
+_KEY = "key"                  # inside a key string
+_COLON = "colon"
+_VALUE = "value"              # after ":" : the start of a value
+_RAW = "raw"                  # inside a value decoded as a whole once it ends
+_COMMA_OR_END = "comma_or_end"
+
+
+class IncrementalJSONParser:
+    """
+    Feed it text chunks in order; it returns the (path, value) pairs completed
+    by each chunk. path is the tuple of keys leading to the value. Objects
+    nested less than max_depth levels deep are assembled member by member, so
+    with max_depth=2 both ("analysis", "strengths") and, once it closes,
+    ("analysis",) are reported. Anything deeper (and every array) is decoded
+    with json.loads once its closing character arrives.
+    """
+
+    def __init__(self, max_depth: int = 1):
+        self.max_depth = max_depth
+        self.started = False
+        self.done = False
+        self.root = None
+        self._stack = []        # [(object, path)] of objects still open, innermost last
+        self._state = None
+        self._key = None
+        self._partial = ""      # text of the key or raw value in progress from earlier chunks
+        self._depth = 0         # bracket depth inside a raw value
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> list:
+        """
+        Consume the next piece of text.
+
+        Returns:
+            list: (path, value) pairs for members whose value closed in this chunk.
+
+        Raises:
+            ValueError: If the text cannot be a JSON object.
+        """
+        fields = []
+        i = 0
+        n = len(chunk)
+        start = 0  # where the key or raw value in progress begins within this chunk
+
+        while i < n and not self.done:
+            if not self.started:
+                i = chunk.find("{", i)
+                if i == -1:
+                    return fields
+                self.started = True
+                self.root = {}
+                self._stack.append((self.root, ()))
+                self._state = _KEY_OR_END
+                i += 1
+                continue
+
+            state = self._state
+            if state == _RAW:
+                i, closed = self._scan_raw(chunk, i)
+                if closed:
+                    fields.append(self._complete(json.loads(self._partial + chunk[start:i])))
+                    self._partial = ""
+                continue
+
+            if state == _KEY:
+                i, closed = self._scan_string(chunk, i)
+                if closed:
+                    self._key = json.loads(self._partial + chunk[start:i])
+                    self._partial = ""
+                    self._state = _COLON
+                continue
+
+            char = chunk[i]
+            if char in _WHITESPACE:
+                i += 1
+            elif state == _KEY_OR_END and char == '"':
+                start = i
+                self._state = _KEY
+                self._in_string = True
+                self._escaped = False
+                i += 1
+            elif state in (_KEY_OR_END, _COMMA_OR_END) and char == "}":
+                fields.extend(self._close_object())
+                i += 1
+            elif state == _COMMA_OR_END and char == ",":
+                self._state = _KEY_OR_END
+                i += 1
+            elif state == _COLON and char == ":":
+                self._state = _VALUE
+                i += 1
+            elif state == _VALUE:
+                path = self._stack[-1][1] + (self._key,)
+                if char == "{" and len(path) < self.max_depth:
+                    nested = {}
+                    self._stack[-1][0][self._key] = nested
+                    self._stack.append((nested, path))
+                    self._state = _KEY_OR_END
+                    i += 1
+                else:
+                    start = i
+                    self._state = _RAW
+                    self._depth = 0
+                    self._in_string = False
+                    self._escaped = False
+            else:
+                raise ValueError(f"Unexpected {char!r} in streamed JSON ({state}).")
+
+        if self._state in (_RAW, _KEY) and not self.done:
+            self._partial += chunk[start:]
+        return fields
+
+    def close(self) -> dict:
+        """
+        The complete object once the stream has ended.
+
+        Raises:
+            ValueError: If no object was found or it never closed.
+        """
+        if not self.done:
+            raise ValueError("Streamed JSON ended before the object closed." if self.started
+                             else "No JSON object found in the streamed reply.")
+        return self.root
+
+    def _scan_string(self, chunk: str, i: int) -> tuple:
+        # Advance through string content; returns (index after the closing quote, True) or (len, False)
+        while True:
+            if self._escaped:
+                self._escaped = False
+                i += 1
+                if i >= len(chunk):
+                    return len(chunk), False
+            match = _STRING_SPECIAL.search(chunk, i)
+            if match is None:
+                return len(chunk), False
+            i = match.end()
+            if match.group() == "\\":
+                self._escaped = True
+                if i >= len(chunk):
+                    return len(chunk), False
+                continue
+            self._in_string = False
+            return i, True
+
+    def _scan_raw(self, chunk: str, i: int) -> tuple:
+        # Advance through a value decoded as a whole; returns (end index, closed)
+        n = len(chunk)
+        while i < n:
+            if self._in_string:
+                i, closed = self._scan_string(chunk, i)
+                if closed and self._depth == 0:
+                    return i, True
+                continue
+            char = chunk[i]
+            if char == '"':
+                self._in_string = True
+                i += 1
+            elif char in "{[":
+                self._depth += 1
+                i += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    return i, True  # end of a scalar; the bracket belongs to the enclosing object
+                self._depth -= 1
+                i += 1
+                if self._depth == 0:
+                    return i, True
+            elif self._depth == 0 and (char == "," or char in _WHITESPACE):
+                return i, True
+            else:
+                i += 1
+        return n, False
+
+    def _complete(self, value) -> tuple:
+        target, path = self._stack[-1]
+        target[self._key] = value
+        self._state = _COMMA_OR_END
+        return path + (self._key,), value
+
+    def _close_object(self) -> list:
+        obj, path = self._stack.pop()
+        if not self._stack:
+            self.done = True
+            return []
+        self._state = _COMMA_OR_END
+        return [(path, obj)]
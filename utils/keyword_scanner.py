@@ -0,0 +1,178 @@
+"""
+CVAlign Lens — ATS Keyword Scanner
+Aho-Corasick matcher over every spelling of a set of keywords and skills.
+Built once per job description (its ATS keywords and core technical skills,
+with their unambiguous aliases), it finds every whole-word occurrence of all of them in
+one linear pass over a resume's cleaned text, however long, with character
+offsets for highlighting.
+"""
+
+from functools import lru_cache
+
+from utils.skills import canonical_skill, is_ambiguous_spelling, skill_variants
+
+
+# Characters of a snippet around a hit, on each side
+CONTEXT_CHARS = 40
+
+
+def _is_word_char(char: str) -> bool:
+    # A hit must not continue a word on either side: "java" in "javascript", "c" in "c++"
+    return char.isalnum() or char in "_+#"
+
+
+class KeywordScanner:
+    """
+    Multi-pattern whole-word matcher. Terms with the same canonical form
+    ("JS", "JavaScript") are one term, reported under the first spelling
+    given. The automaton is read-only once built, so one scanner can serve
+    any number of threads and resumes.
+
+    Args:
+        terms: Keywords or skills to look for, in the order they are reported.
+        skip_ambiguous: Ignore spellings that mostly occur as ordinary words
+            (one- and two-letter words like "cv", and AMBIGUOUS_SKILL_WORDS like
+            "go" or "rest"). A term itself written that way with a capital
+            ("Go", "AI") is still matched, case-sensitively, as written.
+    """
+
+    def __init__(self, terms: list, skip_ambiguous: bool = False):
+        self.terms = []
+        self._delta = [{}]      # state -> {char: next state}, fail transitions folded in once built
+        self._output = [()]     # state -> ((term index, pattern length, exact text or None), ...) ending there
+        seen = set()
+        for term in terms or []:
+            if not isinstance(term, str):
+                continue
+            canonical = canonical_skill(term)
+            if not canonical or canonical in seen:
+                continue
+            seen.add(canonical)
+            index = len(self.terms)
+            self.terms.append(term)
+            # The literal spelling too, for terms whose punctuation normalization drops ("R&D")
+            literal = " ".join(term.split())
+            patterns = {}
+            for pattern in skill_variants(term) + [literal.lower()]:
+                pattern = " ".join(pattern.split())
+                if not (skip_ambiguous and is_ambiguous_spelling(pattern)):
+                    patterns[pattern] = None
+            if skip_ambiguous and is_ambiguous_spelling(literal) and literal != literal.lower():
+                patterns.setdefault(literal.lower(), literal)
+            for pattern, exact in patterns.items():
+                self._add(pattern, index, exact)
+        self._build()
+
+    @classmethod
+    def for_jd(cls, jd_data: dict) -> "KeywordScanner":
+        """
+        The scanner for a parsed JD's keywords_for_ats and core_technical_skills,
+        shared per term list. Ambiguous spellings are skipped, so "go further"
+        or "the rest of the team" never count as the JD's Go or REST.
+        """
+        terms = [
+            term for field in ("keywords_for_ats", "core_technical_skills")
+            for term in (jd_data.get(field) if isinstance(jd_data.get(field), list) else [])
+            if isinstance(term, str)
+        ]
+        return _jd_scanner(tuple(terms))
+
+    def scan(self, text: str) -> dict:
+        """
+        Find every whole-word, case-insensitive occurrence of the terms in one
+        pass over the text.
+
+        Returns:
+            dict: term -> list of (start, end) offsets into text, for each term
+            found, in the order the terms were given. Where two spellings of a
+            term overlap ("rest" and "rest api"), the longer one is kept.
+        """
+        text = text or ""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two ("İ"); keep one per character so offsets line up
+            lowered = "".join(char.lower()[0] for char in text)
+        # Newlines and tabs as spaces, so "Node\nJS" matches "node js"
+        lowered = lowered.replace("\n", " ").replace("\t", " ")
+        step, output, accepting = self._step, self._output, self._accepting
+        n = len(lowered)
+        hits = {}
+        state = end = 0
+        for char in lowered:
+            end += 1
+            state = step[state](char, 0)
+            if state not in accepting:
+                continue
+            for index, length, exact in output[state]:
+                start = end - length
+                if (start and _is_word_char(lowered[start - 1])) or (end < n and _is_word_char(lowered[end])):
+                    continue
+                if exact is not None and " ".join(text[start:end].split()) != exact:
+                    continue
+                hits.setdefault(index, []).append((start, end))
+        return {self.terms[index]: _longest_spans(hits[index]) for index in sorted(hits)}
+
+    def report(self, text: str) -> dict:
+        """
+        scan() as a JSON-ready summary.
+
+        Returns:
+            dict: found, a list of {keyword, count, offsets, context} (context
+            is the text around the first hit), and missing, the terms not found.
+        """
+        matches = self.scan(text)
+        found = []
+        for term, spans in matches.items():
+            start, end = spans[0]
+            found.append({
+                "keyword": term,
+                "count": len(spans),
+                "offsets": [[start, end] for start, end in spans],
+                "context": text[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS].strip(),
+            })
+        return {"found": found, "missing": [term for term in self.terms if term not in matches]}
+
+    def _add(self, pattern: str, index: int, exact: str = None) -> None:
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            following = self._delta[state].get(char)
+            if following is None:
+                following = len(self._delta)
+                self._delta[state][char] = following
+                self._delta.append({})
+                self._output.append(())
+            state = following
+        if all(existing != index for existing, _, _ in self._output[state]):
+            self._output[state] += ((index, len(pattern), exact),)
+
+    def _build(self) -> None:
+        # Breadth-first over the trie: each state's fail link is the longest proper suffix that is also a
+        # prefix; its transitions and outputs are inherited so scanning never follows a fail link
+        trie = [dict(edges) for edges in self._delta]
+        fail = [0] * len(trie)
+        queue = list(trie[0].values())
+        for state in queue:
+            queue.extend(trie[state].values())
+            for char, following in trie[state].items():
+                fail[following] = self._delta[fail[state]].get(char, 0)
+            self._delta[state] = {**self._delta[fail[state]], **trie[state]}
+            self._output[state] += self._output[fail[state]]
+        # Bound lookups keep the per-character work of scan() to one call and one set test
+        self._step = [edges.get for edges in self._delta]
+        self._accepting = frozenset(state for state, found in enumerate(self._output) if found)
+
+
+def _longest_spans(spans: list) -> list:
+    # Hits of one term in text order, dropping any that overlap an earlier or longer hit
+    kept = []
+    for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if not kept or start >= kept[-1][1]:
+            kept.append((start, end))
+    return kept
+
+
+@lru_cache(maxsize=256)
+def _jd_scanner(terms: tuple) -> KeywordScanner:
+    return KeywordScanner(list(terms), skip_ambiguous=True)
@@ -0,0 +1,288 @@
+"""
+CVAlign Lens — LLM Backends
+Provider adapters behind LLMClient, selected with LLM_BACKEND:
+
+    groq  — Groq chat completions (default). GROQ_BASE_URL can point it at
+            any compatible server, including utils/fake_llm_server.py.
+    stub  — In-process deterministic stub with simulated latency; no network
+            or API key needed.
+
+Each backend has a blocking complete(), a coroutine acomplete() for the
+async serving path, and stream() for incremental output.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+from groq import AsyncGroq, Groq
+
+from utils.llm_stub import LatencyModel, StubResponder
+from utils.prompt_builder import get_token_counter
+
+
+class LLMCompletion:
+    """Raw completion text plus token usage, as returned by a backend."""
+
+    def __init__(self, text: str, prompt_tokens: int = None, completion_tokens: int = None):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        if self.prompt_tokens is None or self.completion_tokens is None:
+            return None
+        return self.prompt_tokens + self.completion_tokens
+
+
+class LLMBackend:
+    """Interface every backend implements."""
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def complete(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int,
+                 timeout: float = None) -> LLMCompletion:
+        """
+        Run one completion. timeout, when given, bounds this request (seconds)
+        and overrides the backend's default.
+        """
+        raise NotImplementedError
+
+    async def acomplete(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int,
+                        timeout: float = None) -> LLMCompletion:
+        """
+        Coroutine form of complete(). Backends without non-blocking I/O fall
+        back to running complete() on a worker thread.
+        """
+        return await asyncio.to_thread(self.complete, system_prompt, user_prompt, temperature, max_tokens, timeout)
+
+    def stream(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int,
+               timeout: float = None):
+        """
+        Run one completion, yielding its text as it is generated: str deltas,
+        then a final LLMCompletion with the full text and token usage.
+        Backends without streaming yield the whole text at once.
+        """
+        completion = self.complete(system_prompt, user_prompt, temperature, max_tokens, timeout)
+        yield completion.text
+        yield completion
+
+
+class GroqBackend(LLMBackend):
+    """
+    Groq chat completions over pooled keep-alive HTTP clients: a blocking one
+    for complete() and an async one (LLM_ASYNC_MAX_CONNECTIONS) for acomplete().
+    """
+
+    name = "groq"
+
+    def __init__(self, model: str):
+        super().__init__(model)
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise EnvironmentError(
+                "GROQ_API_KEY environment variable is not set. "
+                "Get a free key at https://console.groq.com"
+            )
+
+        self.api_key = api_key
+        self.base_url = os.getenv("GROQ_BASE_URL") or None
+        self.timeout = float(os.getenv("LLM_TIMEOUT", 60))
+        max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", 32))
+        # Retries are handled by LLMClient so they share the rate budget.
+        self.client = Groq(
+            api_key=api_key,
+            base_url=self.base_url,
+            http_client=httpx.Client(
+                timeout=httpx.Timeout(self.timeout, connect=10.0), limits=self._limits(max_connections)
+            ),
+            max_retries=0,
+        )
+        self._async_client = None
+        self._async_loop = None
+        self._async_lock = threading.Lock()
+
+    def complete(self, system_prompt, user_prompt, temperature, max_tokens, timeout=None):
+        extra = {"timeout": timeout} if timeout is not None else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(system_prompt, user_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra,
+        )
+        return self._completion(response)
+
+    async def acomplete(self, system_prompt, user_prompt, temperature, max_tokens, timeout=None):
+        extra = {"timeout": timeout} if timeout is not None else {}
+        response = await self._get_async_client().chat.completions.create(
+            model=self.model,
+            messages=self._messages(system_prompt, user_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra,
+        )
+        return self._completion(response)
+
+    def stream(self, system_prompt, user_prompt, temperature, max_tokens, timeout=None):
+        extra = {"timeout": timeout} if timeout is not None else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(system_prompt, user_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **extra,
+        )
+        parts = []
+        usage = None
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+                # Groq reports usage on the final chunk, under x_groq
+                usage = chunk.usage or (chunk.x_groq.usage if chunk.x_groq else None) or usage
+        finally:
+            response.close()
+        yield LLMCompletion(
+            text="".join(parts),
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+        )
+
+    def _get_async_client(self) -> AsyncGroq:
+        # An async connection pool belongs to the event loop that opened it, so
+        # one is created per loop (in practice, once per server process)
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self._async_loop is not loop:
+                max_connections = int(os.getenv("LLM_ASYNC_MAX_CONNECTIONS", 256))
+                self._async_client = AsyncGroq(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=httpx.AsyncClient(
+                        timeout=httpx.Timeout(self.timeout, connect=10.0), limits=self._limits(max_connections)
+                    ),
+                    max_retries=0,
+                )
+                self._async_loop = loop
+            return self._async_client
+
+    @staticmethod
+    def _limits(max_connections: int) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60,
+        )
+
+    @staticmethod
+    def _messages(system_prompt: str, user_prompt: str) -> list:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    @staticmethod
+    def _completion(response) -> LLMCompletion:
+        usage = response.usage
+        return LLMCompletion(
+            text=response.choices[0].message.content or "",
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+        )
+
+
+class StubBackend(LLMBackend):
+    """
+    Offline backend returning canned, schema-valid JSON after a simulated delay.
+    Configured by LLM_STUB_LATENCY (see LatencyModel), LLM_STUB_SLOW_RATE,
+    LLM_STUB_SLOW_SECONDS and LLM_STUB_SEED.
+    """
+
+    name = "stub"
+
+    def __init__(self, model: str, latency: LatencyModel = None, responder: StubResponder = None):
+        super().__init__(model)
+        self.latency = latency or latency_model_from_env()
+        self.responder = responder or StubResponder()
+
+    def complete(self, system_prompt, user_prompt, temperature, max_tokens, timeout=None):
+        delay = self.latency.sample()
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Stub LLM request timed out after {timeout:g}s")
+        time.sleep(delay)
+        return self._respond(system_prompt, user_prompt)
+
+    async def acomplete(self, system_prompt, user_prompt, temperature, max_tokens, timeout=None):
+        delay = self.latency.sample()
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise TimeoutError(f"Stub LLM request timed out after {timeout:g}s")
+        await asyncio.sleep(delay)
+        return self._respond(system_prompt, user_prompt)
+
+    def stream(self, system_prompt, user_prompt, temperature, max_tokens, timeout=None):
+        # The sampled delay is spread over the chunks, as generation time is for a real model
+        delay = self.latency.sample()
+        completion = self._respond(system_prompt, user_prompt)
+        chunks = stream_chunks(completion.text)
+        started = time.monotonic()
+        for number, chunk in enumerate(chunks, 1):
+            due = started + delay * number / len(chunks)
+            if timeout is not None and due - started > timeout:
+                time.sleep(max(0.0, started + timeout - time.monotonic()))
+                raise TimeoutError(f"Stub LLM request timed out after {timeout:g}s")
+            time.sleep(max(0.0, due - time.monotonic()))
+            yield chunk
+        yield completion
+
+    def _respond(self, system_prompt: str, user_prompt: str) -> LLMCompletion:
+        text = self.responder.respond(system_prompt, user_prompt)
+        counter = get_token_counter()
+        return LLMCompletion(
+            text=text,
+            prompt_tokens=counter.count(system_prompt) + counter.count(user_prompt),
+            completion_tokens=counter.count(text),
+        )
+
+
+def stream_chunks(text: str, count: int = 64) -> list:
+    """Split a reply into at most count pieces of at least 8 characters, standing in for streamed tokens."""
+    size = max(8, -(-len(text) // count))
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def latency_model_from_env() -> LatencyModel:
+    seed = os.getenv("LLM_STUB_SEED")
+    return LatencyModel(
+        os.getenv("LLM_STUB_LATENCY", "fixed:0"),
+        slow_rate=float(os.getenv("LLM_STUB_SLOW_RATE", 0)),
+        slow_seconds=float(os.getenv("LLM_STUB_SLOW_SECONDS", 20)),
+        seed=int(seed) if seed else None,
+    )
+
+
+BACKENDS = {
+    GroqBackend.name: GroqBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name: str = None, model: str = None) -> LLMBackend:
+    """Instantiate the backend named by LLM_BACKEND (default: groq)."""
+    name = (name or os.getenv("LLM_BACKEND", "groq")).lower()
+    if name not in BACKENDS:
+        raise EnvironmentError(
+            f"Unknown LLM_BACKEND '{name}'. Choose one of: {', '.join(sorted(BACKENDS))}."
+        )
+    model = model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    return BACKENDS[name](model)
@@ -1,57 +1,577 @@
 """
-CVAlign Lens — LLM Client (Groq)
-Uses Groq's free API tier for fast, cost-free LLM inference.
+CVAlign Lens — LLM Client
+Uses Groq's free API tier for fast, cost-free LLM inference by default; the
+provider is a pluggable backend (see utils/llm_backends.py). One client is
+shared by the whole process: retries with exponential backoff and jitter,
+a request/token budget, per-stage deadlines, and optional hedged requests
+that race a duplicate against a slow first attempt. call() blocks; acall()
+is the coroutine form used by the async serving path.
 """
 
+import asyncio
 import os
 import json
+import logging
+import random
 import re
-from groq import Groq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from email.utils import parsedate_to_datetime
 
+import groq
+
+from utils.concurrency import get_executor
+from utils.json_stream import IncrementalJSONParser
+from utils.llm_backends import LLMCompletion, create_backend
+from utils.metrics import (
+    JSON_EXTRACTION_SECONDS, JSON_EXTRACTIONS, LLM_DEADLINES_EXCEEDED, LLM_FIRST_FIELD_SECONDS, LLM_HEDGES,
+    LLM_REQUEST_SECONDS, LLM_TOKENS, current_trace,
+)
+from utils.prompt_builder import get_token_counter
+from utils.rate_limiter import HedgeBudget, RateLimiter, RateLimitExceeded
+from utils.timing import LatencyWindow
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTimeoutError(RuntimeError):
+    """Raised when a stage's LLM deadline passes before any request returns a valid reply."""
+
+
+class LLMRateLimitError(RuntimeError):
+    """Raised when the provider stays rate-limited after all retries, or the local budget queue is full."""
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
-class LLMClient:
-    def __init__(self):
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise EnvironmentError(
-                "GROQ_API_KEY environment variable is not set. "
-                "Get a free key at https://console.groq.com"
-            )
 
-        self.client = Groq(api_key=api_key)
+# Provider errors worth retrying: 429, 5xx, and connection failures (timeouts included)
+RETRYABLE_ERRORS = (groq.RateLimitError, groq.InternalServerError, groq.APIConnectionError)
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_llm_client() -> "LLMClient":
+    """Return the process-wide LLMClient, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = LLMClient()
+    return _shared_client
+
+
+class LLMClient:
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend()
 
         # ✅ DEFINE MODEL HERE
-        self.model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-
-    def call(self, system_prompt: str, user_prompt: str) -> dict:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            max_tokens=2048,  # safer limit than 4096
+        self.model = self.backend.model
+
+        self.max_tokens = 2048  # safer limit than 4096
+        self.expected_completion_tokens = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", 800))
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", 4))
+        self.backoff_base = float(os.getenv("LLM_BACKOFF_BASE", 0.5))
+        self.backoff_cap = float(os.getenv("LLM_BACKOFF_CAP", 20))
+
+        # Provider quotas only apply to the real API; offline backends run unthrottled by default
+        default_rpm, default_tpm = (30, 12000) if self.backend.name == "groq" else (0, 0)
+        self.limiter = RateLimiter(
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", default_rpm)),
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", default_tpm)),
+            max_wait=float(os.getenv("LLM_MAX_QUEUE_WAIT", 60)),
         )
 
-        raw_text = response.choices[0].message.content.strip()
-        return self._extract_json(raw_text)
+        # Whole-call deadlines and hedged (duplicate) requests; both off by default
+        self.default_deadline = float(os.getenv("LLM_DEADLINE", 0))
+        self.hedging = os.getenv("LLM_HEDGE", "false").lower() == "true"
+        self.hedge_delay_spec = os.getenv("LLM_HEDGE_DELAY", "p90").strip().lower()
+        self.hedge_fallback_delay = float(os.getenv("LLM_HEDGE_FALLBACK_DELAY", 5))
+        self.hedge_min_samples = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+        self.hedge_window = int(os.getenv("LLM_HEDGE_WINDOW", 200))
+        self.hedge_budget = HedgeBudget(float(os.getenv("LLM_HEDGE_BUDGET", 0.05)))
+        self._latency = {}
+        self._listeners = []
+
+        self._usage_lock = threading.Lock()
+        self._usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._stage_usage = {}
+        self.token_counter = get_token_counter()
+
+    def call(self, system_prompt: str, user_prompt: str, stage: str = None, budget: int = None,
+             on_field=None, field_depth: int = 1, deadline_at: float = None) -> dict:
+        """
+        Send one prompt and return the parsed JSON response.
+
+        Args:
+            system_prompt: System message.
+            user_prompt: User message.
+            stage: Optional pipeline stage name, for per-stage usage records,
+                deadlines, and hedging delays.
+            budget: Optional token budget the user prompt was built against.
+            on_field: Optional callback(path, value). When given, the reply is
+                streamed and each member of its JSON object (path is the
+                tuple of keys, nested up to field_depth) is reported as soon
+                as it closes, unvalidated. Streamed calls are not hedged; a
+                retried call may report a field again.
+            field_depth: Object nesting reported to on_field.
+            deadline_at: Optional time.monotonic() by which the caller's whole
+                request must finish. The call gets the earlier of this and the
+                stage's own deadline, and is not sent at all when less time
+                remains than the stage typically takes.
+
+        Returns:
+            dict: Parsed JSON from the model's reply.
+
+        Raises:
+            LLMTimeoutError: If the deadline passes before a valid reply, or
+                too little of deadline_at remains to start the call.
+        """
+        sent_tokens = self.token_counter.count(system_prompt) + self.token_counter.count(user_prompt)
+        estimated = sent_tokens + self.expected_completion_tokens
+        deadline_at = self._call_deadline(stage, deadline_at)
+        if self.hedging:
+            self.hedge_budget.earn()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.limiter.acquire(estimated, self._remaining(deadline_at))
+            except RateLimitExceeded as e:
+                self._notify(stage, rate_limited=True)
+                raise LLMRateLimitError(str(e), retry_after=e.retry_after) from e
+
+            try:
+                if on_field is not None:
+                    return self._stream_request(
+                        system_prompt, user_prompt, stage, budget, sent_tokens, estimated, deadline_at,
+                        on_field, field_depth,
+                    )
+                return self._request(system_prompt, user_prompt, stage, budget, sent_tokens, estimated, deadline_at)
+            except RETRYABLE_ERRORS as e:
+                time.sleep(self._retry_delay(e, attempt, stage, deadline_at))
+
+    async def acall(self, system_prompt: str, user_prompt: str, stage: str = None, budget: int = None,
+                    deadline_at: float = None) -> dict:
+        """
+        Coroutine form of call(), for the async serving path. Budget waits,
+        backoff, and provider I/O all yield to the event loop, and a losing
+        hedged request is cancelled outright.
+        """
+        sent_tokens = self.token_counter.count(system_prompt) + self.token_counter.count(user_prompt)
+        estimated = sent_tokens + self.expected_completion_tokens
+        deadline_at = self._call_deadline(stage, deadline_at)
+        if self.hedging:
+            self.hedge_budget.earn()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.limiter.aacquire(estimated, self._remaining(deadline_at))
+            except RateLimitExceeded as e:
+                self._notify(stage, rate_limited=True)
+                raise LLMRateLimitError(str(e), retry_after=e.retry_after) from e
+
+            try:
+                return await self._arequest(
+                    system_prompt, user_prompt, stage, budget, sent_tokens, estimated, deadline_at
+                )
+            except RETRYABLE_ERRORS as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, stage, deadline_at))
+
+    def _retry_delay(self, error: Exception, attempt: int, stage: str, deadline_at: float) -> float:
+        # Seconds to back off before retrying, or raise if this error ends the call
+        retry_after = self._retry_after(error)
+        if isinstance(error, groq.RateLimitError):
+            self._notify(stage, rate_limited=True)
+        if retry_after is not None:
+            self.limiter.pause(retry_after)
+        if attempt == self.max_retries:
+            if isinstance(error, groq.RateLimitError):
+                raise LLMRateLimitError(
+                    "LLM provider rate limit persisted after retries.", retry_after=retry_after
+                ) from error
+            raise error
+        delay = self._backoff_delay(attempt, retry_after)
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            raise self._deadline_error(stage) from error
+        return delay
+
+    def deadline(self, stage: str) -> float:
+        """
+        Seconds a call for this stage may take in total, retries included
+        (0 = no deadline): LLM_DEADLINE_<STAGE>, else LLM_DEADLINE.
+        """
+        if stage:
+            value = os.getenv(f"LLM_DEADLINE_{stage.upper()}")
+            if value:
+                return float(value)
+        return self.default_deadline
+
+    def typical_latency(self, stage: str) -> float:
+        """Median latency of this stage's recent calls, or None until LLM_HEDGE_MIN_SAMPLES have been seen."""
+        window = self._latency.get(stage or "unspecified")
+        if window is None or len(window) < self.hedge_min_samples:
+            return None
+        return window.percentile(50)
+
+    def _call_deadline(self, stage: str, request_deadline: float) -> float:
+        # The earlier of the stage's deadline and the caller's; refuse a call the caller's deadline cannot fit
+        now = time.monotonic()
+        deadline = self.deadline(stage)
+        deadline_at = now + deadline if deadline else None
+        if request_deadline is None:
+            return deadline_at
+        remaining = request_deadline - now
+        typical = self.typical_latency(stage)
+        if remaining <= 0 or (typical is not None and remaining < typical):
+            raise LLMTimeoutError(
+                f"LLM call for stage '{stage or 'unspecified'}' not sent: {max(0.0, remaining):.2f}s of the "
+                f"request's deadline left" + (f", typical call {typical:.2f}s." if typical is not None else ".")
+            )
+        return request_deadline if deadline_at is None else min(deadline_at, request_deadline)
+
+    @staticmethod
+    def _remaining(deadline_at: float) -> float:
+        return max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+
+    def hedge_delay(self, stage: str) -> float:
+        """
+        Seconds to wait for the first response before sending a duplicate:
+        a fixed LLM_HEDGE_DELAY, or an observed percentile of this stage's
+        latency ("p90") once enough calls have been seen.
+        """
+        if not self.hedge_delay_spec.startswith("p"):
+            return float(self.hedge_delay_spec)
+        window = self._latency.get(stage or "unspecified")
+        if window is None or len(window) < self.hedge_min_samples:
+            return self.hedge_fallback_delay
+        return window.percentile(float(self.hedge_delay_spec[1:]))
+
+    def _request(self, system_prompt: str, user_prompt: str, stage: str, budget: int, sent_tokens: int,
+                 estimated: int, deadline_at: float) -> dict:
+        # One attempt: a single provider request, or a hedged pair racing to the first valid JSON
+        if deadline_at is None and not self.hedging:
+            return self._send(system_prompt, user_prompt, stage, budget, sent_tokens, estimated, None)
+
+        label = stage or "unspecified"
+        executor = get_executor("llm-request")
+
+        def submit():
+            timeout = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+            return executor.submit(
+                self._send, system_prompt, user_prompt, stage, budget, sent_tokens, estimated, timeout
+            )
+
+        futures = [submit()]
+        if self.hedging:
+            delay = self.hedge_delay(stage)
+            if deadline_at is not None:
+                delay = min(delay, max(0.0, deadline_at - time.monotonic()))
+            done, _ = wait(futures, timeout=delay)
+            if not done and (deadline_at is None or time.monotonic() < deadline_at):
+                if self._reserve_hedge(estimated):
+                    futures.append(submit())
+                    LLM_HEDGES.inc(stage=label, event="sent")
+                else:
+                    LLM_HEDGES.inc(stage=label, event="skipped")
+
+        errors = []
+        pending = set(futures)
+        while pending:
+            timeout = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                # The loser is dropped: never sent if it had not started, else its reply is discarded
+                for other in pending:
+                    if other.cancel():
+                        self.limiter.settle(estimated, 0)
+                if len(futures) > 1:
+                    LLM_HEDGES.inc(stage=label, event="won" if future is futures[1] else "lost")
+                return result
+
+        for future in pending:
+            if future.cancel():
+                self.limiter.settle(estimated, 0)
+        if deadline_at is not None and time.monotonic() >= deadline_at:
+            raise self._deadline_error(stage) from (errors[0] if errors else None)
+        raise errors[0]
+
+    async def _arequest(self, system_prompt: str, user_prompt: str, stage: str, budget: int, sent_tokens: int,
+                        estimated: int, deadline_at: float) -> dict:
+        # Async counterpart of _request; losing or overdue requests are cancelled outright
+        if deadline_at is None and not self.hedging:
+            return await self._asend(system_prompt, user_prompt, stage, budget, sent_tokens, estimated, None)
+
+        label = stage or "unspecified"
+
+        def start():
+            timeout = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+            return asyncio.ensure_future(
+                self._asend(system_prompt, user_prompt, stage, budget, sent_tokens, estimated, timeout)
+            )
+
+        tasks = [start()]
+        errors = []
+        try:
+            if self.hedging:
+                delay = self.hedge_delay(stage)
+                if deadline_at is not None:
+                    delay = min(delay, max(0.0, deadline_at - time.monotonic()))
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and (deadline_at is None or time.monotonic() < deadline_at):
+                    if self._reserve_hedge(estimated):
+                        tasks.append(start())
+                        LLM_HEDGES.inc(stage=label, event="sent")
+                    else:
+                        LLM_HEDGES.inc(stage=label, event="skipped")
+
+            pending = set(tasks)
+            while pending:
+                timeout = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    if len(tasks) > 1:
+                        LLM_HEDGES.inc(stage=label, event="won" if task is tasks[1] else "lost")
+                    return task.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
-    def _extract_json(self, text: str) -> dict:
-        cleaned = re.sub(r"^```(?:json)?\s*", "", text.strip())
-        cleaned = re.sub(r"\s*```$", "", cleaned.strip())
+        if deadline_at is not None and time.monotonic() >= deadline_at:
+            raise self._deadline_error(stage) from (errors[0] if errors else None)
+        raise errors[0]
 
+    def _stream_request(self, system_prompt: str, user_prompt: str, stage: str, budget: int, sent_tokens: int,
+                        estimated: int, deadline_at: float, on_field, field_depth: int) -> dict:
+        # One streamed attempt, parsed incrementally; the deadline is checked between chunks
+        label = stage or "unspecified"
+        timeout = max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+        parser = IncrementalJSONParser(field_depth)
+        completion = None
+        first_field = True
+        started = time.perf_counter()
+        pieces = self.backend.stream(
+            system_prompt, user_prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout
+        )
         try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            match = re.search(r"\{.*\}", cleaned, re.DOTALL)
-            if match:
+            for piece in pieces:
+                if isinstance(piece, LLMCompletion):
+                    completion = piece
+                    continue
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    raise TimeoutError("Streamed LLM reply ran past its deadline.")
+                if parser is None or parser.done:
+                    continue
                 try:
-                    return json.loads(match.group())
-                except json.JSONDecodeError:
-                    pass
+                    fields = parser.feed(piece)
+                except ValueError as e:
+                    # Not streamable JSON; the full reply still gets the regular extraction
+                    logger.debug(f"Incremental JSON parse failed for stage={label}: {e}")
+                    parser = None
+                    continue
+                for path, value in fields:
+                    if first_field:
+                        first_field = False
+                        LLM_FIRST_FIELD_SECONDS.observe(time.perf_counter() - started, stage=label)
+                    on_field(path, value)
+        except Exception as e:
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, stage=label, model=self.model, outcome="error")
+            if deadline_at is not None and time.monotonic() >= deadline_at:
+                raise self._deadline_error(stage) from e
+            raise
+        finally:
+            pieces.close()
+
+        data = None
+        if parser is not None and parser.done:
+            data = parser.close()
+            JSON_EXTRACTIONS.inc(stage=label, result="streamed")
+        return self._accept(completion, stage, budget, sent_tokens, estimated, time.perf_counter() - started, data)
+
+    def _send(self, system_prompt: str, user_prompt: str, stage: str, budget: int, sent_tokens: int,
+              estimated: int, timeout: float) -> dict:
+        started = time.perf_counter()
+        try:
+            completion = self.backend.complete(
+                system_prompt, user_prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout
+            )
+        except Exception:
+            LLM_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, stage=stage or "unspecified", model=self.model, outcome="error"
+            )
+            raise
+        return self._accept(completion, stage, budget, sent_tokens, estimated, time.perf_counter() - started)
 
+    async def _asend(self, system_prompt: str, user_prompt: str, stage: str, budget: int, sent_tokens: int,
+                     estimated: int, timeout: float) -> dict:
+        started = time.perf_counter()
+        try:
+            completion = await self.backend.acomplete(
+                system_prompt, user_prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout
+            )
+        except Exception:
+            LLM_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, stage=stage or "unspecified", model=self.model, outcome="error"
+            )
+            raise
+        return self._accept(completion, stage, budget, sent_tokens, estimated, time.perf_counter() - started)
+
+    def _accept(self, completion, stage: str, budget: int, sent_tokens: int, estimated: int,
+                elapsed: float, data: dict = None) -> dict:
+        # Settle the budget, record usage and latency, and parse one provider reply (unless already parsed)
+        if completion.total_tokens is not None:
+            self.limiter.settle(estimated, completion.total_tokens)
+        self._record_usage(completion, stage, budget, sent_tokens, elapsed)
+        window = self._latency.get(stage or "unspecified")
+        if window is None:
+            window = self._latency.setdefault(stage or "unspecified", LatencyWindow(self.hedge_window))
+        window.add(elapsed)
+        self._notify(stage, seconds=elapsed)
+        if data is not None:
+            return data
+        return self._extract_json(completion.text.strip(), stage)
+
+    def _reserve_hedge(self, estimated: int) -> bool:
+        if not self.hedge_budget.try_spend():
+            return False
+        if not self.limiter.try_acquire(estimated):
+            self.hedge_budget.refund()
+            return False
+        return True
+
+    def _deadline_error(self, stage: str) -> "LLMTimeoutError":
+        LLM_DEADLINES_EXCEEDED.inc(stage=stage or "unspecified")
+        deadline = self.deadline(stage)
+        # Only a missed stage deadline says the provider is slow; a request's deadline may have been spent upstream
+        self._notify(stage, seconds=deadline or None)
+        missed = f"its {deadline:g}s deadline" if deadline else "its request's deadline"
+        return LLMTimeoutError(f"LLM call for stage '{stage or 'unspecified'}' missed {missed}.")
+
+    def add_listener(self, listener) -> None:
+        """
+        Register listener(stage, seconds=None, rate_limited=False), called
+        after every successful provider reply (with its latency), missed
+        deadline (with the deadline), and 429 or local budget rejection.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, stage: str, seconds: float = None, rate_limited: bool = False) -> None:
+        for listener in self._listeners:
+            try:
+                listener(stage or "unspecified", seconds=seconds, rate_limited=rate_limited)
+            except Exception as e:
+                logger.warning(f"LLM call listener failed: {e}")
+
+    def usage(self) -> dict:
+        """
+        Cumulative successful calls and token usage since start (or the last
+        reset), with a per-stage breakdown of calls, budgeted tokens, tokens
+        counted locally before sending, and provider-reported usage.
+        """
+        with self._usage_lock:
+            usage = dict(self._usage)
+            usage["stages"] = {stage: dict(entry) for stage, entry in self._stage_usage.items()}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return usage
+
+    def reset_usage(self) -> None:
+        with self._usage_lock:
+            for key in self._usage:
+                self._usage[key] = 0
+            self._stage_usage.clear()
+
+    def _record_usage(self, completion, stage: str, budget: int, sent_tokens: int, elapsed: float) -> None:
+        logger.debug(
+            f"LLM call stage={stage} budget={budget} sent_tokens={sent_tokens} "
+            f"prompt_tokens={completion.prompt_tokens} completion_tokens={completion.completion_tokens} "
+            f"elapsed_ms={elapsed * 1000:.1f}"
+        )
+        label = stage or "unspecified"
+        LLM_REQUEST_SECONDS.observe(elapsed, stage=label, model=self.model, outcome="ok")
+        if completion.prompt_tokens is not None:
+            LLM_TOKENS.observe(completion.prompt_tokens, stage=label, model=self.model, kind="prompt")
+        if completion.completion_tokens is not None:
+            LLM_TOKENS.observe(completion.completion_tokens, stage=label, model=self.model, kind="completion")
+        trace = current_trace()
+        if trace is not None:
+            trace.add_llm_call(elapsed, completion.prompt_tokens, completion.completion_tokens)
+
+        with self._usage_lock:
+            self._usage["calls"] += 1
+            self._usage["prompt_tokens"] += completion.prompt_tokens or 0
+            self._usage["completion_tokens"] += completion.completion_tokens or 0
+
+            entry = self._stage_usage.setdefault(stage or "unspecified", {
+                "calls": 0, "budget_tokens": 0, "sent_tokens": 0, "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            entry["calls"] += 1
+            entry["budget_tokens"] += budget or 0
+            entry["sent_tokens"] += sent_tokens
+            entry["prompt_tokens"] += completion.prompt_tokens or 0
+            entry["completion_tokens"] += completion.completion_tokens or 0
+
+    def _backoff_delay(self, attempt: int, retry_after: float = None) -> float:
+        # Full jitter, but never earlier than the provider asked for
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _retry_after(self, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _extract_json(self, text: str, stage: str = None) -> dict:
+        label = stage or "unspecified"
+        with JSON_EXTRACTION_SECONDS.time(stage=label):
+            cleaned = re.sub(r"^```(?:json)?\s*", "", text.strip())
+            cleaned = re.sub(r"\s*```$", "", cleaned.strip())
+
+            try:
+                data = json.loads(cleaned)
+                JSON_EXTRACTIONS.inc(stage=label, result="direct")
+                return data
+            except json.JSONDecodeError as e:
+                error = e
+                match = re.search(r"\{.*\}", cleaned, re.DOTALL)
+                if match:
+                    try:
+                        data = json.loads(match.group())
+                        JSON_EXTRACTIONS.inc(stage=label, result="fallback")
+                        return data
+                    except json.JSONDecodeError:
+                        pass
+
+            JSON_EXTRACTIONS.inc(stage=label, result="failed")
             raise ValueError(
                 f"LLM response could not be parsed as JSON. "
-                f"Raw response: {text[:300]}... Error: {e}"
-            )
\ No newline at end of file
+                f"Raw response: {text[:300]}... Error: {error}"
+            )
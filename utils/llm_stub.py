@@ -0,0 +1,229 @@
+"""
+CVAlign Lens — Offline LLM Stub
+Deterministic, schema-valid responses for every prompt type plus a
+configurable latency model. Used by the stub backend and the local
+chat-completions server for load testing and CI without a live API key.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+
+from prompts.prompt_templates import (
+    JD_EXTRACTION_PROMPT,
+    RESUME_EXTRACTION_PROMPT,
+    RESUME_SECTION_EXTRACTION_PROMPT,
+    ANALYSIS_PROMPT,
+    SCORING_PROMPT,
+    SUBJECTIVE_SCORING_PROMPT,
+    ANALYSIS_AND_SCORING_PROMPT,
+)
+
+
+# The first line of each template identifies the prompt type
+PROMPT_MARKERS = [
+    ("jd_extraction", JD_EXTRACTION_PROMPT.split("\n", 1)[0]),
+    ("resume_extraction", RESUME_EXTRACTION_PROMPT.split("\n", 1)[0]),
+    ("resume_section_extraction", RESUME_SECTION_EXTRACTION_PROMPT.split("\n", 1)[0]),
+    ("analysis", ANALYSIS_PROMPT.split("\n", 1)[0]),
+    ("scoring", SCORING_PROMPT.split("\n", 1)[0]),
+    ("subjective_scoring", SUBJECTIVE_SCORING_PROMPT.split("\n", 1)[0]),
+    ("analysis_and_scoring", ANALYSIS_AND_SCORING_PROMPT.split("\n", 1)[0]),
+]
+
+# Skills the stub "recognizes" in prompt text, so outputs vary with the input
+STUB_SKILL_VOCABULARY = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "SQL", "PostgreSQL",
+    "MySQL", "MongoDB", "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "GCP", "Azure",
+    "Terraform", "React", "Node.js", "Django", "Flask", "FastAPI", "Spark", "Airflow",
+    "TensorFlow", "PyTorch", "Machine Learning", "CI/CD", "Git", "Linux", "REST", "GraphQL",
+]
+
+
+def detect_prompt_type(user_prompt: str) -> str:
+    """Return the prompt type for a user prompt built from prompt_templates, or 'unknown'."""
+    for prompt_type, marker in PROMPT_MARKERS:
+        if user_prompt.startswith(marker):
+            return prompt_type
+    return "unknown"
+
+
+class LatencyModel:
+    """
+    Samples simulated LLM latencies from a spec string:
+
+        fixed:<seconds>
+        uniform:<low>:<high>
+        normal:<mean>:<stddev>
+        lognormal:<median>:<sigma>
+
+    An optional slow tail sends a fraction of calls to a fixed long delay,
+    e.g. to exercise hedging and deadlines.
+    """
+
+    def __init__(self, spec: str = "fixed:0", slow_rate: float = 0.0, slow_seconds: float = 20.0, seed: int = None):
+        parts = spec.split(":")
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if self.kind not in expected or len(self.params) != expected[self.kind]:
+            raise ValueError(f"Invalid latency spec '{spec}'")
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.slow_rate and self._rng.random() < self.slow_rate:
+                return self.slow_seconds
+            if self.kind == "fixed":
+                value = self.params[0]
+            elif self.kind == "uniform":
+                value = self._rng.uniform(*self.params)
+            elif self.kind == "normal":
+                value = self._rng.gauss(*self.params)
+            else:
+                median, sigma = self.params
+                value = self._rng.lognormvariate(math.log(median), sigma)
+        return max(0.0, value)
+
+
+class StubResponder:
+    """
+    Produces canned, schema-valid JSON for each prompt type. Output depends
+    only on the prompt text, so identical inputs always give identical results.
+    """
+
+    def respond(self, system_prompt: str, user_prompt: str) -> str:
+        prompt_type = detect_prompt_type(user_prompt)
+        seed = int(hashlib.sha256(user_prompt.encode("utf-8")).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        skills = self._find_skills(user_prompt)
+
+        builder = getattr(self, f"_{prompt_type}", self._unknown)
+        return json.dumps(builder(rng, skills))
+
+    def _find_skills(self, text: str) -> list:
+        lowered = text.lower()
+        return [
+            skill for skill in STUB_SKILL_VOCABULARY
+            if re.search(r"(?<![a-z0-9])" + re.escape(skill.lower()) + r"(?![a-z0-9])", lowered)
+        ]
+
+    def _jd_extraction(self, rng, skills):
+        core = skills[:8] or ["Python", "SQL"]
+        return {
+            "role_title": rng.choice(["Software Engineer", "Data Engineer", "Backend Engineer"]),
+            "seniority_level": rng.choice(["Mid-level", "Senior"]),
+            "core_technical_skills": core,
+            "soft_skills": ["Communication", "Collaboration"],
+            "domain_knowledge": ["SaaS"],
+            "key_responsibilities": [f"Build and operate services using {s}" for s in core[:4]],
+            "must_have_requirements": [f"Production experience with {s}" for s in core[:3]],
+            "nice_to_have_requirements": [f"Exposure to {s}" for s in skills[8:10]],
+            "keywords_for_ats": core + ["Microservices"],
+        }
+
+    def _resume_extraction(self, rng, skills):
+        return {
+            "candidate_name": rng.choice(["Alex Doe", "Sam Lee", None]),
+            "inferred_title": "Software Engineer",
+            "years_of_experience": rng.choice(["2–4 years", "5–7 years"]),
+            "technical_skills": skills or ["Python"],
+            "soft_skills": ["Ownership"],
+            "domain_experience": ["E-commerce"],
+            "education": ["B.S. Computer Science"],
+            "notable_achievements": ["Reduced p95 latency by 40%"],
+            "resume_sections_present": ["Summary", "Experience", "Education", "Skills"],
+            "missing_sections": ["Projects"],
+            "keywords_present": skills[:10],
+        }
+
+    def _resume_section_extraction(self, rng, skills):
+        result = self._resume_extraction(rng, skills)
+        for key in ("resume_sections_present", "missing_sections"):
+            del result[key]
+        result["technical_skills"] = skills
+        return result
+
+    def _analysis(self, rng, skills):
+        return {
+            "strengths": [
+                {"point": f"Hands-on {s} experience", "reasoning": "Matches a core requirement.", "confidence": "High"}
+                for s in skills[:3]
+            ],
+            "weaknesses": [
+                {"point": "Limited quantified impact", "reasoning": "Few metrics in experience bullets.", "confidence": "Medium"}
+            ],
+            "missing_keywords": [
+                {"keyword": "Kubernetes", "importance": "Important", "reasoning": "Listed in the JD."}
+            ],
+            "skill_gaps": [
+                {
+                    "skill": "Kubernetes",
+                    "gap_severity": "Moderate",
+                    "reasoning": "No orchestration experience shown.",
+                    "suggested_action": "Deploy a side project on a managed cluster.",
+                }
+            ],
+            "section_improvements": [
+                {
+                    "section": "Summary",
+                    "issue": "Generic summary.",
+                    "suggestion": "Lead with the target role and two headline results.",
+                    "reasoning": "Recruiters skim the first lines.",
+                }
+            ],
+            "bullet_optimizations": [
+                {
+                    "original_pattern": "Responsibility-only bullets",
+                    "improved_pattern": "Action + metric + outcome",
+                    "example_before": "Worked on APIs.",
+                    "example_after": "Built 12 REST APIs serving 2M requests/day.",
+                    "reasoning": "Quantified impact is more persuasive.",
+                }
+            ],
+            "overall_assessment": "A plausible match with some gaps in infrastructure tooling.",
+        }
+
+    def _scoring(self, rng, skills):
+        dims = {
+            "technical_skills_match": rng.randint(40, 95),
+            "experience_relevance": rng.randint(40, 95),
+            "keyword_coverage": rng.randint(40, 95),
+            "achievement_quality": rng.randint(30, 90),
+            "presentation_quality": rng.randint(50, 95),
+        }
+        overall = round(sum(dims.values()) / len(dims))
+        return {
+            "overall_score": overall,
+            "score_label": "Good Fit" if overall >= 65 else "Average",
+            "score_rationale": "Solid core skills; infrastructure depth is thinner.",
+            "dimension_scores": dims,
+            "hiring_recommendation": "Worth Interviewing" if overall >= 65 else "Possible with Development",
+            "confidence_in_assessment": "Medium",
+            "top_3_actions": [
+                "Quantify impact in every experience bullet",
+                "Add missing infrastructure keywords where truthful",
+                "Tighten the summary around the target role",
+            ],
+        }
+
+    def _subjective_scoring(self, rng, skills):
+        result = self._scoring(rng, skills)
+        for key in ("technical_skills_match", "keyword_coverage"):
+            del result["dimension_scores"][key]
+        return result
+
+    def _analysis_and_scoring(self, rng, skills):
+        return {
+            "analysis": self._analysis(rng, skills),
+            "score": self._subjective_scoring(rng, skills),
+        }
+
+    def _unknown(self, rng, skills):
+        return {"result": "ok"}
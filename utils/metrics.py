@@ -0,0 +1,299 @@
+"""
+CVAlign Lens — Metrics
+In-process counters and histograms for the hot paths (pipeline stages, LLM
+calls, JSON extraction, file extraction, caches), rendered in the Prometheus
+text exposition format, plus a per-request trace used for structured timing
+logs. Every worker process keeps its own registry.
+"""
+
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Seconds; spans a cache hit through a slow multi-retry LLM call
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+_INF_LABEL = 'le="+Inf"'
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return lines + self._samples()
+
+    def _samples(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def values(self) -> dict:
+        with self._lock:
+            return dict(self._series)
+
+    def _samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum, and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock seconds spent in the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> list:
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, _INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class GaugeFunction(_Metric):
+    """A gauge whose samples are computed at scrape time by a callback returning {label tuple: value}."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple, function):
+        super().__init__(name, documentation, labels)
+        self.function = function
+
+    def _samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}"
+            for key, value in sorted(self.function().items())
+        ]
+
+
+class MetricsRegistry:
+    """Named metrics of one process, rendered together for /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def counter(self, name: str, documentation: str, labels: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: tuple = (),
+                  buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def gauge_function(self, name: str, documentation: str, labels: tuple, function) -> GaugeFunction:
+        return self._register(GaugeFunction(name, documentation, labels, function))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric) -> _Metric:
+        # Re-registering a name returns the existing metric, so modules can
+        # declare the metrics they use without import-order concerns
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "cvalign_stage_duration_seconds", "Wall-clock time of each pipeline stage.", ("stage",)
+)
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "cvalign_llm_request_duration_seconds",
+    "Latency of each LLM provider request attempt.", ("stage", "model", "outcome"),
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "cvalign_llm_tokens", "Provider-reported tokens per LLM call.", ("stage", "model", "kind"), TOKEN_BUCKETS
+)
+LLM_HEDGES = REGISTRY.counter(
+    "cvalign_llm_hedges_total",
+    "Hedged LLM requests: sent, skipped (budget or rate limit), and whether the hedge won or lost.",
+    ("stage", "event"),
+)
+LLM_DEADLINES_EXCEEDED = REGISTRY.counter(
+    "cvalign_llm_deadline_exceeded_total", "LLM calls that missed their stage deadline.", ("stage",)
+)
+DEGRADED_RESULTS = REGISTRY.counter(
+    "cvalign_degraded_results_total",
+    "Pipeline stages answered by the local fallback because the request deadline left no time for the LLM.",
+    ("stage",),
+)
+LLM_FIRST_FIELD_SECONDS = REGISTRY.histogram(
+    "cvalign_llm_first_field_seconds", "Time from sending a streamed LLM request to its first complete field.",
+    ("stage",),
+)
+JSON_EXTRACTIONS = REGISTRY.counter(
+    "cvalign_llm_json_extractions_total",
+    "LLM replies parsed as JSON: streamed, direct, via the embedded-object fallback, or failed.", ("stage", "result"),
+)
+JSON_EXTRACTION_SECONDS = REGISTRY.histogram(
+    "cvalign_llm_json_extraction_seconds", "Time spent parsing LLM replies as JSON.", ("stage",)
+)
+FILE_EXTRACTION_SECONDS = REGISTRY.histogram(
+    "cvalign_file_extraction_seconds", "Time to extract text from an uploaded file.", ("extension", "outcome")
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cvalign_cache_requests_total",
+    "Cache lookups by result: hits, disk_hits, misses, coalesced, errors.", ("cache", "result"),
+)
+ADMISSION_DECISIONS = REGISTRY.counter(
+    "cvalign_admission_decisions_total",
+    "Admission outcomes: admitted, queued, rejected_client, rejected_queue, rejected_deadline, timed_out.",
+    ("outcome",),
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "cvalign_http_request_duration_seconds",
+    "Time to produce each HTTP response (streamed bodies excluded).", ("endpoint", "method", "status"),
+)
+
+
+def _cache_hit_ratios() -> dict:
+    totals = {}
+    for (cache, result), value in CACHE_REQUESTS.values().items():
+        served, lookups = totals.get(cache, (0, 0))
+        if result in ("hits", "disk_hits", "coalesced"):
+            served += value
+        if result in ("hits", "disk_hits", "coalesced", "misses"):
+            lookups += value
+        totals[cache] = (served, lookups)
+    return {(cache,): round(served / lookups, 4) for cache, (served, lookups) in totals.items() if lookups}
+
+
+REGISTRY.gauge_function(
+    "cvalign_cache_hit_ratio", "Share of cache lookups served without recomputing.", ("cache",), _cache_hit_ratios
+)
+
+
+class RequestTrace:
+    """Per-request totals of stage time and LLM usage, for structured timing logs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.llm = {"calls": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def add_stage(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(name, {"count": 0, "ms": 0.0})
+            entry["count"] += 1
+            entry["ms"] += elapsed_ms
+
+    def add_llm_call(self, seconds: float, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.llm["calls"] += 1
+            self.llm["seconds"] += seconds
+            self.llm["prompt_tokens"] += prompt_tokens or 0
+            self.llm["completion_tokens"] += completion_tokens or 0
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            stages = {name: {"count": e["count"], "ms": round(e["ms"], 2)} for name, e in self.stages.items()}
+            llm = dict(self.llm)
+        llm["ms"] = round(llm.pop("seconds") * 1000, 2)
+        return {"stages": stages, "llm": llm}
+
+
+_current_trace = contextvars.ContextVar("cvalign_request_trace", default=None)
+
+
+def start_trace() -> RequestTrace:
+    """Begin a trace for the current request; worker threads inherit it via ContextThreadPoolExecutor."""
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> RequestTrace:
+    return _current_trace.get()
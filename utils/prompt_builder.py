@@ -0,0 +1,250 @@
+"""
+CVAlign Lens — Token-Budgeted Prompt Builder
+Assembles LLM prompts against a per-stage token budget: embedded JSON is
+serialized compactly, low-value fields are trimmed first when a prompt runs
+over, and free text is truncated by tokens rather than characters.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+
+from utils.text_processing import truncate_text
+
+
+logger = logging.getLogger(__name__)
+
+# User-prompt token budget per stage; override with PROMPT_BUDGET_<STAGE>
+STAGE_BUDGETS = {
+    "jd_extraction": 2000,
+    "resume_extraction": 2400,
+    "resume_section_extraction": 1600,
+    "analysis": 3000,
+    "scoring": 3200,
+    "subjective_scoring": 2400,
+    "analysis_and_scoring": 3400,
+}
+
+# (placeholder, field) pairs dropped in this order when embedded JSON runs
+# over budget, least useful to the model first. Fields not listed here
+# (core_technical_skills, must_have_requirements, technical_skills,
+# strengths, weaknesses, ...) are only ever shortened, never dropped.
+TRIM_ORDER = [
+    ("jd_data", "soft_skills"),
+    ("resume_data", "soft_skills"),
+    ("analysis_data", "bullet_optimizations"),
+    ("resume_data", "education"),
+    ("resume_data", "resume_sections_present"),
+    ("resume_data", "missing_sections"),
+    ("candidate_profile", "resume_sections_present"),
+    ("candidate_profile", "missing_sections"),
+    ("jd_data", "nice_to_have_requirements"),
+    ("jd_data", "domain_knowledge"),
+    ("role_profile", "domain_knowledge"),
+    ("resume_data", "domain_experience"),
+    ("candidate_profile", "domain_experience"),
+    ("analysis_data", "section_improvements"),
+    ("resume_data", "keywords_present"),
+    ("jd_data", "keywords_for_ats"),
+    ("jd_data", "key_responsibilities"),
+    ("role_profile", "key_responsibilities"),
+    ("analysis_data", "missing_keywords"),
+    ("resume_data", "notable_achievements"),
+    ("candidate_profile", "notable_achievements"),
+]
+
+_PLACEHOLDER = re.compile(r"(?<!\{)\{(\w+)\}(?!\})")
+_WORD_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+def compact_json(value) -> str:
+    """Serialize embedded JSON without indentation or padding whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class TokenCounter:
+    """
+    Counts tokens with a Hugging Face `tokenizers` tokenizer when one is
+    available, or with a conservative heuristic (≈4 characters per token,
+    never fewer than one per word or symbol) when running offline.
+    """
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+
+    @property
+    def exact(self) -> bool:
+        return self.tokenizer is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+        return max(len(text) // 4, len(_WORD_PIECES.findall(text)))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut text to at most max_tokens, at a sentence boundary when one is
+        close to the limit (as truncate_text does for characters).
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.tokenizer is not None:
+            offsets = self.tokenizer.encode(text, add_special_tokens=False).offsets
+            if len(offsets) <= max_tokens:
+                return text
+            return truncate_text(text, max_chars=offsets[max_tokens - 1][1])
+
+        truncated = truncate_text(text, max_chars=max_tokens * 4)
+        while self.count(truncated) > max_tokens:
+            truncated = truncate_text(truncated, max_chars=int(len(truncated) * 0.9))
+        return truncated
+
+
+_shared_counter = None
+_shared_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Return the process-wide TokenCounter. LLM_TOKENIZER may name a local
+    tokenizer.json file or a Hugging Face Hub repository; without it, or if
+    loading fails, the heuristic counter is used.
+    """
+    global _shared_counter
+    if _shared_counter is None:
+        with _shared_counter_lock:
+            if _shared_counter is None:
+                _shared_counter = TokenCounter(_load_tokenizer(os.getenv("LLM_TOKENIZER", "").strip()))
+    return _shared_counter
+
+
+def _load_tokenizer(source: str):
+    if not source:
+        return None
+    try:
+        from tokenizers import Tokenizer
+
+        if os.path.isfile(source):
+            return Tokenizer.from_file(source)
+        return Tokenizer.from_pretrained(source)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer '{source}', using heuristic token counts: {e}")
+        return None
+
+
+class BuiltPrompt:
+    """A rendered user prompt with the budget it was built against."""
+
+    def __init__(self, stage: str, text: str, budget: int, tokens: int, values: dict, trimmed: list):
+        self.stage = stage
+        self.text = text
+        self.budget = budget
+        self.tokens = tokens
+        self.values = values
+        self.trimmed = trimmed
+
+
+class PromptBuilder:
+    """
+    Fills prompt templates so the rendered user prompt stays within its
+    stage's token budget.
+    """
+
+    def __init__(self, counter: TokenCounter = None):
+        self.counter = counter or get_token_counter()
+        self._overheads = {}
+
+    def budget(self, stage: str) -> int:
+        return int(os.getenv(f"PROMPT_BUDGET_{stage.upper()}", STAGE_BUDGETS[stage]))
+
+    def build(self, stage: str, template: str, texts: dict = None, data: dict = None,
+              fixed: dict = None) -> BuiltPrompt:
+        """
+        Render a template within the stage budget.
+
+        Args:
+            stage: Key into STAGE_BUDGETS.
+            template: A prompt template from prompt_templates.
+            texts: Placeholder -> free text, truncated by tokens to fit.
+            data: Placeholder -> JSON-serializable value, embedded compactly
+                and trimmed per TRIM_ORDER to fit.
+            fixed: Placeholder -> short string inserted verbatim (labels, names).
+
+        Returns:
+            BuiltPrompt: text, budget, token count, the fitted text values
+            (values), and the "placeholder.field" names dropped (trimmed).
+        """
+        texts = texts or {}
+        data = {name: self._copy(value) for name, value in (data or {}).items()}
+        budget = self.budget(stage)
+        fixed = fixed or {}
+        available = budget - self._overhead(template) - sum(self.counter.count(v) for v in fixed.values())
+
+        trimmed = self._fit_data(data, available)
+        rendered = {name: compact_json(value) for name, value in data.items()}
+        rendered.update(fixed)
+
+        values = {}
+        if texts:
+            remaining = available - sum(self.counter.count(rendered[name]) for name in data)
+            share = remaining // len(texts)
+            for name, text in texts.items():
+                values[name] = self.counter.truncate(text, share)
+                rendered[name] = values[name]
+
+        text = template.format(**rendered)
+        tokens = self.counter.count(text)
+        if trimmed:
+            logger.debug(f"Prompt '{stage}' trimmed to fit {budget} tokens: {', '.join(trimmed)}")
+        return BuiltPrompt(stage, text, budget, tokens, values, trimmed)
+
+    def _overhead(self, template: str) -> int:
+        # Tokens in the template itself, with every placeholder left empty
+        if template not in self._overheads:
+            self._overheads[template] = self.counter.count(
+                template.format(**{name: "" for name in _PLACEHOLDER.findall(template)})
+            )
+        return self._overheads[template]
+
+    def _fit_data(self, data: dict, available: int) -> list:
+        def total():
+            return sum(self.counter.count(compact_json(value)) for value in data.values())
+
+        trimmed = []
+        if total() <= available:
+            return trimmed
+
+        for name, field in TRIM_ORDER:
+            value = data.get(name)
+            if isinstance(value, dict) and field in value:
+                del value[field]
+                trimmed.append(f"{name}.{field}")
+                if total() <= available:
+                    return trimmed
+
+        # Still over: shorten the longest remaining list by a tenth at a time
+        while total() > available:
+            longest = None
+            for name, value in data.items():
+                if not isinstance(value, dict):
+                    continue
+                for field, items in value.items():
+                    if isinstance(items, list) and items and (longest is None or len(items) > len(longest[2])):
+                        longest = (name, field, items)
+            if longest is None:
+                break
+            name, field, items = longest
+            del items[-max(1, len(items) // 10):]
+            if f"{name}.{field}[]" not in trimmed:
+                trimmed.append(f"{name}.{field}[]")
+        return trimmed
+
+    def _copy(self, value):
+        # Trimming mutates dicts and lists, never the caller's objects
+        if isinstance(value, dict):
+            return {k: list(v) if isinstance(v, list) else v for k, v in value.items()}
+        return value
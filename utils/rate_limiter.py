@@ -0,0 +1,162 @@
+"""
+CVAlign Lens — Rate Limiter
+Token-bucket scheduler that budgets LLM requests per minute and tokens per
+minute, so bursts queue up locally instead of tripping provider 429s.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would have to wait longer than the configured maximum."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket. Reservations may drive the level below
+    zero; the deficit is exactly how long later callers must wait, which keeps
+    waiters in FIFO order without a separate queue.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        deficit = amount - self.level
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+class RateLimiter:
+    """
+    Combined requests-per-minute and tokens-per-minute budget shared by every
+    LLM call in the process. A rate of 0 disables that dimension.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0, max_wait: float = 60):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_wait = max_wait
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int, max_wait: float = None) -> float:
+        """
+        Reserve one request and the given number of tokens, sleeping until the
+        budget allows it.
+
+        Args:
+            tokens: Tokens to reserve.
+            max_wait: Optional tighter bound than self.max_wait for this call,
+                e.g. the time left before the caller's deadline.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait.
+        """
+        wait = self._reserve(tokens, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int, max_wait: float = None) -> float:
+        """Coroutine form of acquire(): the wait is spent in the event loop instead of blocking a thread."""
+        wait = self._reserve(tokens, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self, tokens: int, max_wait: float = None) -> float:
+        # Take the reservation now and return how long the caller must wait before using it
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is None:
+                    continue
+                bucket.refill(now)
+                # A single call larger than the bucket can never fit; cap it.
+                amount = min(amount, bucket.capacity)
+                wait = max(wait, bucket.wait_time(amount))
+            if wait > (self.max_wait if max_wait is None else min(self.max_wait, max_wait)):
+                raise RateLimitExceeded(
+                    f"LLM rate budget exhausted; next slot in {wait:.1f}s", retry_after=wait
+                )
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= min(tokens, self.tokens.capacity)
+        return wait
+
+    def try_acquire(self, tokens: int) -> bool:
+        """Reserve one request and the given tokens only if no wait is needed. Never sleeps."""
+        with self._lock:
+            now = time.monotonic()
+            if self._paused_until > now:
+                return False
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is None:
+                    continue
+                bucket.refill(now)
+                if bucket.wait_time(min(amount, bucket.capacity)) > 0:
+                    return False
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= min(tokens, self.tokens.capacity)
+        return True
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Refund (or charge) the difference between estimated and actual token usage."""
+        if self.tokens is None:
+            return
+        with self._lock:
+            self.tokens.refill(time.monotonic())
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + (estimated - actual))
+
+    def pause(self, seconds: float) -> None:
+        """Hold every new reservation for the given time, e.g. after a provider Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class HedgeBudget:
+    """
+    Caps duplicate (hedged) LLM requests at a fraction of primary requests.
+    Every primary call earns `ratio` credits, up to `burst`; a hedge spends one.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.credits = burst if ratio > 0 else 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self.credits = min(self.burst, self.credits + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.credits >= 1:
+                self.credits -= 1
+                return True
+            return False
+
+    def refund(self) -> None:
+        with self._lock:
+            self.credits = min(self.burst, self.credits + 1)
@@ -0,0 +1,136 @@
+"""
+CVAlign Lens — Resume Section Segmenter
+Splits resume text into its conventional sections (Summary, Experience,
+Education, Skills, Projects, ...) so each can be hashed and processed on its own.
+"""
+
+import re
+
+from utils.cache import fingerprint
+
+
+# canonical section -> heading spellings (compared after normalization)
+SECTION_HEADINGS = {
+    "summary": [
+        "summary", "professional summary", "career summary", "profile", "professional profile",
+        "objective", "career objective", "about", "about me", "overview",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history",
+    ],
+    "education": [
+        "education", "academic background", "education and training", "qualifications",
+        "academic qualifications",
+    ],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "skills and tools",
+        "core competencies", "competencies", "technologies", "tech stack", "tools",
+    ],
+    "projects": ["projects", "personal projects", "selected projects", "key projects", "side projects"],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses",
+    ],
+    "awards": ["awards", "honors", "honors and awards", "achievements", "accomplishments"],
+    "publications": ["publications", "papers", "research"],
+    "volunteering": ["volunteer", "volunteering", "volunteer experience", "community involvement"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies and interests"],
+}
+
+# Display names, as reported in resume_sections_present
+SECTION_TITLES = {
+    "summary": "Summary",
+    "experience": "Experience",
+    "education": "Education",
+    "skills": "Skills",
+    "projects": "Projects",
+    "certifications": "Certifications",
+    "awards": "Awards",
+    "publications": "Publications",
+    "volunteering": "Volunteering",
+    "languages": "Languages",
+    "interests": "Interests",
+}
+
+# Text before the first heading: name, contact details, headline
+HEADER_SECTION = "header"
+
+_HEADING_LOOKUP = {}
+_MAX_HEADING_LENGTH = 40
+_NON_ALPHA = re.compile(r"[^a-z ]+")
+_SPACES = re.compile(r"\s+")
+_INLINE_HEADING = re.compile(r"^([A-Za-z &/]{3,40}?)\s*[:\-–|]\s*(\S.*)$")
+
+
+class ResumeSection:
+    """One section of a resume: canonical name, heading as written, and body text."""
+
+    def __init__(self, name: str, heading: str, text: str):
+        self.name = name
+        self.heading = heading
+        self.text = text
+
+    @property
+    def title(self) -> str:
+        return SECTION_TITLES.get(self.name, self.name.title())
+
+    @property
+    def digest(self) -> str:
+        return fingerprint(self.name, self.text)
+
+
+def heading_name(line: str) -> str:
+    """Return the canonical section name if the line is a section heading, else None."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > _MAX_HEADING_LENGTH:
+        return None
+    normalized = _NON_ALPHA.sub(" ", stripped.lower().replace("&", " and "))
+    return _HEADING_LOOKUP.get(_SPACES.sub(" ", normalized).strip())
+
+
+def segment_resume(text: str) -> list:
+    """
+    Split resume text into sections at recognized heading lines ("EXPERIENCE",
+    "Work History:", "Skills: Python, SQL", ...). Text before the first
+    heading becomes the "header" section; repeated headings are merged.
+
+    Returns:
+        list: ResumeSection objects in document order (first appearance).
+    """
+    sections = {}
+    order = []
+    current, heading, lines = HEADER_SECTION, "", []
+
+    def flush():
+        body = "\n".join(lines).strip()
+        if not body:
+            return
+        if current in sections:
+            sections[current].text += "\n" + body
+        else:
+            sections[current] = ResumeSection(current, heading, body)
+            order.append(current)
+
+    for line in (text or "").split("\n"):
+        name = heading_name(line)
+        inline_body = None
+        if name is None:
+            match = _INLINE_HEADING.match(line)
+            if match and heading_name(match.group(1)):
+                name, inline_body = heading_name(match.group(1)), match.group(2)
+        if name is None:
+            lines.append(line)
+            continue
+        flush()
+        current, heading = name, line.strip()
+        lines = [inline_body] if inline_body else []
+    flush()
+
+    return [sections[name] for name in order]
+
+
+for _name, _headings in SECTION_HEADINGS.items():
+    for _heading in _headings:
+        _HEADING_LOOKUP[_heading] = _name
@@ -0,0 +1,295 @@
+"""
+CVAlign Lens — Resume Shortlist Index
+A local BM25 inverted index over normalized resume text. It ranks a large
+candidate pool against a parsed JD without any LLM calls, so that only the
+top-K resumes go through the full analysis pipeline. Pools are persisted in
+SQLite and grow incrementally; each process keeps an in-memory index that
+catches up on rows added by other workers.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from utils.skills import SKILL_ALIASES, canonical_skill, normalize_skill
+from utils.text_processing import clean_text
+
+
+logger = logging.getLogger(__name__)
+
+# JD fields the shortlist query is built from, and how much each one counts
+QUERY_FIELD_WEIGHTS = {
+    "core_technical_skills": 2.0,
+    "must_have_requirements": 1.5,
+    "keywords_for_ats": 1.0,
+}
+
+# Filler words in requirement sentences ("5+ years of experience with ...")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with"
+    " you your we our they their who which strong solid proven ability able working work knowledge"
+    " understanding experience experienced years year plus including such using use etc e.g i.e".split()
+)
+
+_TERM = re.compile(r"\.?[a-z0-9+#]+(?:[./][a-z0-9+#]+)*")
+
+
+def _build_term_aliases() -> dict:
+    # Single-word aliases -> the terms of their canonical skill ("k8s" -> kubernetes,
+    # "ml" -> machine, learning), so a resume and a JD spelling a skill
+    # differently still share index terms
+    aliases = {}
+    for canonical, spellings in SKILL_ALIASES.items():
+        target = tuple(_TERM.findall(normalize_skill(canonical)))
+        for spelling in spellings:
+            found = _TERM.findall(normalize_skill(spelling))
+            if len(found) == 1 and target and (found[0],) != target:
+                aliases.setdefault(found[0], target)
+    return aliases
+
+
+_TERM_ALIASES = _build_term_aliases()
+
+
+def tokenize(text: str) -> list:
+    """Split clean_text-normalized text into lowercase index terms, resolving skill aliases."""
+    terms = []
+    for term in _TERM.findall(text.lower()):
+        if term in STOPWORDS:
+            continue
+        alias = _TERM_ALIASES.get(term)
+        if alias:
+            terms.extend(alias)
+        else:
+            terms.append(term)
+    return terms
+
+
+def build_query(jd_data: dict) -> dict:
+    """
+    Turn a parsed JD into weighted BM25 query terms.
+
+    Returns:
+        dict: term -> weight, summed over QUERY_FIELD_WEIGHTS fields.
+    """
+    query = Counter()
+    for field, weight in QUERY_FIELD_WEIGHTS.items():
+        for phrase in jd_data.get(field) or []:
+            if not isinstance(phrase, str):
+                continue
+            for term in set(tokenize(canonical_skill(phrase) or phrase)):
+                query[term] += weight
+    return dict(query)
+
+
+class ShortlistIndex:
+    """In-memory BM25 inverted index over one pool of resumes."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> {slot: term frequency}
+        self.ids = []       # slot -> resume id (None once replaced)
+        self.names = []
+        self.lengths = []
+        self.slot_terms = []
+        self.slots = {}     # resume id -> current slot
+        self.total_length = 0
+        self.last_seq = 0   # highest stored row loaded into this index
+        self._norms = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, resume_id: str, name: str, terms: dict) -> None:
+        """
+        Insert a resume, replacing any earlier version with the same id.
+
+        Args:
+            resume_id: Caller-chosen unique id within the pool.
+            name: Display name returned with search results.
+            terms: term -> frequency, as produced by term_frequencies().
+        """
+        if resume_id in self.slots:
+            self._remove(resume_id)
+        slot = len(self.ids)
+        self.ids.append(resume_id)
+        self.names.append(name)
+        length = sum(terms.values())
+        self.lengths.append(length)
+        self.slot_terms.append(tuple(terms))
+        self.total_length += length
+        self.slots[resume_id] = slot
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[slot] = frequency
+        self._norms = None
+
+    def search(self, query: dict, top_k: int) -> list:
+        """
+        Rank the pool against weighted query terms.
+
+        Args:
+            query: term -> weight, e.g. from build_query().
+            top_k: Number of results to return.
+
+        Returns:
+            list: Up to top_k {"id", "name", "score", "matched_terms"} dicts,
+            best first. Resumes matching no query term are never returned.
+        """
+        count = len(self.slots)
+        if not count or not query or top_k <= 0:
+            return []
+        norms = self._length_norms()
+        k1_plus_one = self.k1 + 1
+        scores = {}
+        for term, weight in query.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            factor = weight * idf * k1_plus_one
+            get = scores.get
+            for slot, frequency in postings.items():
+                scores[slot] = get(slot, 0.0) + factor * frequency / (frequency + norms[slot])
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [
+            {
+                "id": self.ids[slot],
+                "name": self.names[slot],
+                "score": round(score, 4),
+                "matched_terms": sorted(t for t in query if slot in self.postings.get(t, ())),
+            }
+            for slot, score in best
+        ]
+
+    def _remove(self, resume_id: str) -> None:
+        slot = self.slots.pop(resume_id)
+        for term in self.slot_terms[slot]:
+            postings = self.postings[term]
+            del postings[slot]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.lengths[slot]
+        self.ids[slot] = None
+        self.slot_terms[slot] = ()
+        self._norms = None
+
+    def _length_norms(self) -> list:
+        # k1 * (1 - b + b * |d| / avgdl) per slot, recomputed after inserts
+        if self._norms is None:
+            average = self.total_length / len(self.slots) or 1.0
+            k1, b = self.k1, self.b
+            self._norms = [k1 * (1 - b + b * length / average) for length in self.lengths]
+        return self._norms
+
+
+def term_frequencies(text: str) -> dict:
+    """Index terms of a resume with their counts, after clean_text normalization."""
+    return dict(Counter(tokenize(clean_text(text))))
+
+
+class ShortlistStore:
+    """
+    SQLite-backed resume pools with a lazily refreshed ShortlistIndex per
+    pool. Term frequencies are stored alongside the text, so loading a pool
+    never re-tokenizes it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._indexes = {}
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS shortlist_resumes ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " pool TEXT NOT NULL,"
+                " resume_id TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " terms TEXT NOT NULL,"
+                " added_at REAL NOT NULL,"
+                " UNIQUE (pool, resume_id))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS shortlist_resumes_pool_seq ON shortlist_resumes (pool, seq)"
+            )
+
+    @classmethod
+    def from_env(cls):
+        """Build a store at SHORTLIST_DB_PATH (default shortlist.db)."""
+        return cls(os.getenv("SHORTLIST_DB_PATH", "shortlist.db"))
+
+    def add(self, pool: str, resumes: list) -> int:
+        """
+        Insert or replace resumes in a pool.
+
+        Args:
+            pool: Pool name.
+            resumes: List of {"id", "name", "text"}; an existing id is replaced.
+
+        Returns:
+            int: The pool size after the insert.
+        """
+        now = time.time()
+        rows = [
+            (pool, item["id"], item.get("name") or item["id"], item["text"],
+             json.dumps(term_frequencies(item["text"]), separators=(",", ":")), now)
+            for item in resumes
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO shortlist_resumes (pool, resume_id, name, text, terms, added_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            return len(self._refresh(pool))
+
+    def search(self, pool: str, jd_data: dict, top_k: int) -> list:
+        """Rank a pool against a parsed JD. See ShortlistIndex.search."""
+        query = build_query(jd_data)
+        with self._lock:
+            return self._refresh(pool).search(query, top_k)
+
+    def size(self, pool: str) -> int:
+        with self._lock:
+            return len(self._refresh(pool))
+
+    def texts(self, pool: str, resume_ids: list) -> dict:
+        """Return resume id -> stored text for the given ids."""
+        if not resume_ids:
+            return {}
+        placeholders = ",".join("?" * len(resume_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT resume_id, text FROM shortlist_resumes WHERE pool = ? AND resume_id IN ({placeholders})",
+                (pool, *resume_ids),
+            ).fetchall()
+        return dict(rows)
+
+    def _refresh(self, pool: str) -> ShortlistIndex:
+        # Load rows stored since the last call, including other workers' inserts.
+        # Callers hold self._lock, so searches never see a half-applied insert.
+        index = self._indexes.setdefault(pool, ShortlistIndex())
+        rows = self._conn.execute(
+            "SELECT seq, resume_id, name, terms FROM shortlist_resumes"
+            " WHERE pool = ? AND seq > ? ORDER BY seq",
+            (pool, index.last_seq),
+        ).fetchall()
+        for seq, resume_id, name, terms in rows:
+            index.add(resume_id, name, json.loads(terms))
+            index.last_seq = seq
+        if len(rows) > 1:
+            logger.debug(f"Shortlist pool '{pool}' loaded {len(rows)} new resumes ({len(index)} total)")
+        return index
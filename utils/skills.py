@@ -0,0 +1,164 @@
+"""
+CVAlign Lens — Skill Normalization Utilities
+Canonicalizes skill and keyword strings so that "JS", "javascript" and
+"JavaScript." compare equal, and measures set overlap between skill lists.
+"""
+
+import re
+import unicodedata
+
+
+# canonical form -> alternative spellings (all compared after normalization). Only true synonyms:
+# related tools ("github" for git), generic words ("containers"), and short forms that usually mean
+# something else ("cv" is a resume, "tf" is also Terraform) would match skills nobody listed.
+# Skills without synonyms stay listed as known skill names.
+SKILL_ALIASES = {
+    "javascript": ["js", "ecmascript", "es6", "java script"],
+    "typescript": [],
+    "node.js": ["nodejs", "node js"],
+    "react": ["react.js", "reactjs", "react js"],
+    "vue": ["vue.js", "vuejs"],
+    "angular": ["angular.js", "angularjs"],
+    "next.js": ["nextjs", "next js"],
+    "python": ["python3", "python 3"],
+    "go": ["golang"],
+    "c++": ["cpp", "c plus plus"],
+    "c#": ["csharp", "c sharp"],
+    ".net": ["dotnet", "dot net", ".net core", "asp.net"],
+    "postgresql": ["postgres", "postgre sql", "psql"],
+    "mysql": ["my sql"],
+    "mongodb": ["mongo", "mongo db"],
+    "sql server": ["mssql", "ms sql", "microsoft sql server"],
+    "kubernetes": ["k8s"],
+    "docker": [],
+    "aws": ["amazon web services", "amazon aws"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "ci/cd": ["cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "artificial intelligence": [],
+    "natural language processing": ["nlp"],
+    "large language models": ["llm", "llms"],
+    "computer vision": [],
+    "rest": ["rest api", "rest apis", "restful", "restful apis", "restful api"],
+    "graphql": ["graph ql"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "tensorflow": [],
+    "pytorch": [],
+    "apache spark": ["spark", "pyspark"],
+    "apache kafka": ["kafka"],
+    "apache airflow": ["airflow"],
+    "git": [],
+    "microservices": ["micro services", "microservice architecture", "microservice"],
+    "object-oriented programming": ["oop", "object oriented programming"],
+    "user experience": [],
+    "user interface": [],
+}
+
+# Skill names that are also everyday words ("go further", "the rest of the team"). In free text
+# they are only trusted written as the source term writes them ("Go", "REST"), never lowercased.
+AMBIGUOUS_SKILL_WORDS = frozenset({
+    "go", "rest", "react", "node", "spark", "swift", "rust", "express", "flask", "ruby",
+    "shell", "excel", "spring", "chef", "puppet", "julia", "dart", "hive", "pig", "ember",
+})
+
+_ALIAS_TO_CANONICAL = {}
+
+_PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+_PUNCTUATION = re.compile(r"[^\w\s+#./-]")
+_EDGE_PUNCTUATION = re.compile(r"^[\s./-]+|[\s./-]+$")
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"[a-z0-9+#.]+")
+
+
+def normalize_skill(value: str) -> str:
+    """
+    Lowercase, strip accents, parentheticals, and stray punctuation, and collapse whitespace,
+    keeping characters that carry meaning in skill names (c++, c#, .net, ci/cd).
+    """
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value)).encode("ascii", "ignore").decode("ascii")
+    # "Amazon Web Services (AWS)" -> "Amazon Web Services"
+    text = _PARENTHETICAL.sub("", text) or text
+    text = _PUNCTUATION.sub(" ", text.lower())
+    text = _WHITESPACE.sub(" ", text).strip()
+    # Keep a leading dot for ".net"; otherwise trim sentence punctuation at the edges
+    if text.startswith(".") and text[1:2].isalpha():
+        return "." + _EDGE_PUNCTUATION.sub("", text[1:])
+    return _EDGE_PUNCTUATION.sub("", text)
+
+
+def canonical_skill(value: str) -> str:
+    """Normalize a skill and map known aliases to their canonical name."""
+    normalized = normalize_skill(value)
+    return _ALIAS_TO_CANONICAL.get(normalized, normalized)
+
+
+def skill_variants(value: str) -> list:
+    """Every known spelling of a skill (canonical name first), for text scanning."""
+    canonical = canonical_skill(value)
+    variants = [canonical] + SKILL_ALIASES.get(canonical, [])
+    normalized = normalize_skill(value)
+    if normalized not in variants:
+        variants.append(normalized)
+    return [v for v in variants if v]
+
+
+def is_ambiguous_spelling(spelling: str) -> bool:
+    """True for spellings that mostly occur as ordinary words: one- and two-letter words ("ai", "cv") and
+    AMBIGUOUS_SKILL_WORDS."""
+    word = " ".join(str(spelling).lower().split())
+    return (len(word) <= 2 and word.isalpha()) or word in AMBIGUOUS_SKILL_WORDS
+
+
+def skill_tokens(value: str) -> set:
+    return set(_TOKEN.findall(canonical_skill(value)))
+
+
+def skill_overlap(required: list, candidate: list) -> dict:
+    """
+    Compare a list of required skills with a candidate's skills.
+
+    A required skill is matched when its canonical form appears among the
+    candidate's skills, and partially matched when every one of its words
+    appears somewhere in the candidate's skills (e.g. "AWS Lambda" against
+    "AWS" and "Lambda"). Partial matches count half.
+
+    Returns:
+        dict: matched, partial, and missing lists (original spellings) and a
+        0–100 coverage score, or None as the score when nothing is required.
+    """
+    candidate_canonical = {canonical_skill(s) for s in candidate or [] if isinstance(s, str)}
+    candidate_canonical.discard("")
+    candidate_tokens = set()
+    for skill in candidate_canonical:
+        candidate_tokens |= set(_TOKEN.findall(skill))
+
+    matched, partial, missing = [], [], []
+    seen = set()
+    for skill in required or []:
+        if not isinstance(skill, str):
+            continue
+        canonical = canonical_skill(skill)
+        if not canonical or canonical in seen:
+            continue
+        seen.add(canonical)
+        tokens = set(_TOKEN.findall(canonical))
+        if canonical in candidate_canonical:
+            matched.append(skill)
+        elif len(tokens) > 1 and tokens <= candidate_tokens:
+            partial.append(skill)
+        else:
+            missing.append(skill)
+
+    total = len(matched) + len(partial) + len(missing)
+    score = round(100 * (len(matched) + 0.5 * len(partial)) / total) if total else None
+    return {"matched": matched, "partial": partial, "missing": missing, "score": score}
+
+
+for _canonical, _aliases in SKILL_ALIASES.items():
+    _ALIAS_TO_CANONICAL[normalize_skill(_canonical)] = _canonical
+    for _alias in _aliases:
+        _ALIAS_TO_CANONICAL.setdefault(normalize_skill(_alias), _canonical)
@@ -3,10 +3,44 @@ CVAlign Lens — Text Processing Utilities
 Clean, normalize, and prepare text before feeding to the LLM.
 """
 
+import codecs
 import re
 import unicodedata
 
 
+# Control characters (everything below 0x20 except newline and tab, plus DEL)
+# become spaces; applied as a byte table, which is far cheaper than a regex
+_CONTROL_TO_SPACE = bytes(
+    0x20 if (code < 0x20 and code not in (0x09, 0x0A)) or code == 0x7F else code
+    for code in range(256)
+)
+# Non-ASCII characters left after NFKD become one space each
+_NON_ASCII_ERRORS = "cvalign.space"
+codecs.register_error(_NON_ASCII_ERRORS, lambda e: (" " * (e.end - e.start), e.end))
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SPACE_RUNS = re.compile(r" {2,}")
+_EDGE_WHITESPACE = " \n\t"
+
+
+def _to_printable(text: str) -> str:
+    # NFKD leaves ASCII unchanged, so pure-ASCII input skips normalization
+    if text.isascii():
+        data = text.encode("ascii")
+    else:
+        data = unicodedata.normalize("NFKD", text).encode("ascii", _NON_ASCII_ERRORS)
+    return data.translate(_CONTROL_TO_SPACE).decode("ascii")
+
+
+def _collapse(text: str) -> str:
+    # Substring checks are much cheaper than a regex scan that finds nothing
+    if "\n\n\n" in text:
+        text = _BLANK_LINES.sub("\n\n", text)
+    if "  " in text:
+        text = _SPACE_RUNS.sub(" ", text)
+    return text
+
+
 def clean_text(text: str) -> str:
     """
     Normalize and clean raw text input.
@@ -15,23 +49,40 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    # Normalize unicode characters
-    text = unicodedata.normalize("NFKD", text)
+    # Carriage returns are control characters, so "\r\n" becomes " \n" here,
+    # exactly as in the original multi-pass version
+    return _collapse(_to_printable(text)).strip()
 
-    # Remove non-printable characters except standard whitespace
-    text = re.sub(r"[^\x20-\x7E\n\t]", " ", text)
 
-    # Normalize line endings
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-
-    # Collapse excessive blank lines (more than 2 in a row)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-
-    # Collapse excessive spaces within lines
-    lines = [re.sub(r" {2,}", " ", line) for line in text.split("\n")]
-    text = "\n".join(lines)
-
-    return text.strip()
+def iter_clean_text(chunks):
+    """
+    Streaming clean_text: consume text in chunks (e.g. pages of an extracted
+    document) and yield cleaned pieces whose concatenation equals
+    clean_text("".join(chunks)), without building the raw text in memory.
+    """
+    carry = ""
+    started = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer = carry + _to_printable(chunk)
+        # Hold back trailing whitespace: it may continue into the next chunk
+        body = buffer.rstrip(_EDGE_WHITESPACE)
+        carry = buffer[len(body):]
+        if not started:
+            body = body.lstrip(_EDGE_WHITESPACE)
+            if not body:
+                continue
+            started = True
+        if body:
+            yield _collapse(body)
+
+
+def clean_text_chunked(text: str, chunk_size: int = 1 << 16) -> str:
+    """clean_text for very large inputs, processed chunk_size characters at a time."""
+    if not text:
+        return ""
+    return "".join(iter_clean_text(text[i:i + chunk_size] for i in range(0, len(text), chunk_size)))
 
 
 def truncate_text(text: str, max_chars: int = 8000) -> str:
@@ -0,0 +1,65 @@
+"""
+CVAlign Lens — Timing Utilities
+Lightweight per-stage wall-clock timers for the analysis pipeline. Every
+recorded stage also feeds the stage-duration metric and the request trace.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from utils.metrics import STAGE_SECONDS, current_trace
+
+
+class StageTimings:
+    """Collects elapsed milliseconds per named stage. Safe to share across threads."""
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._stages[name] = round(elapsed_ms, 2)
+        STAGE_SECONDS.observe(elapsed_ms / 1000, stage=name)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_stage(name, elapsed_ms)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return dict(self._stages)
+
+
+class LatencyWindow:
+    """Sliding window of recent latencies (seconds) for percentile estimates. Thread-safe."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (q in 0–100) of the window, or None when empty."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]